@@ -0,0 +1,53 @@
+"""create feedback table
+
+Revision ID: 9b2d7c41e0a3
+Revises: 4ef8ec06fe2b
+Create Date: 2026-10-18 09:12:40.214375
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b2d7c41e0a3'
+down_revision: Union[str, Sequence[str], None] = '4ef8ec06fe2b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # La table a pu être créée à la volée par l'ancien ensure_feedback_table()
+    if sa.inspect(op.get_bind()).has_table('feedback'):
+        return
+    op.create_table('feedback',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.String(), nullable=False),
+    sa.Column('item_id', sa.String(), nullable=False),
+    sa.Column('category', sa.String(), nullable=False),
+    sa.Column('city', sa.String(), nullable=False),
+    sa.Column('action', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'item_id', name='uq_feedback_user_item')
+    )
+    op.create_index(op.f('ix_feedback_category'), 'feedback', ['category'], unique=False)
+    op.create_index(op.f('ix_feedback_city'), 'feedback', ['city'], unique=False)
+    op.create_index(op.f('ix_feedback_id'), 'feedback', ['id'], unique=False)
+    op.create_index(op.f('ix_feedback_item_id'), 'feedback', ['item_id'], unique=False)
+    op.create_index(op.f('ix_feedback_user_id'), 'feedback', ['user_id'], unique=False)
+    op.create_index('ix_feedback_user_city_cat', 'feedback', ['user_id', 'city', 'category'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_feedback_user_city_cat', table_name='feedback')
+    op.drop_index(op.f('ix_feedback_user_id'), table_name='feedback')
+    op.drop_index(op.f('ix_feedback_item_id'), table_name='feedback')
+    op.drop_index(op.f('ix_feedback_id'), table_name='feedback')
+    op.drop_index(op.f('ix_feedback_city'), table_name='feedback')
+    op.drop_index(op.f('ix_feedback_category'), table_name='feedback')
+    op.drop_table('feedback')
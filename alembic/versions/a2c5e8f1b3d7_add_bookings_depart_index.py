@@ -0,0 +1,28 @@
+"""add bookings (depart_date, id) index
+
+Revision ID: a2c5e8f1b3d7
+Revises: f4b8d2e6a1c9
+Create Date: 2026-10-18 19:12:08.551740
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a2c5e8f1b3d7'
+down_revision: Union[str, Sequence[str], None] = 'f4b8d2e6a1c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_bookings_depart', 'bookings', ['depart_date', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_bookings_depart', table_name='bookings')
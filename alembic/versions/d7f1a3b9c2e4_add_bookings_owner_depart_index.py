@@ -0,0 +1,30 @@
+"""add bookings (owner_id, depart_date, id) index
+
+Revision ID: d7f1a3b9c2e4
+Revises: c4e8a2f5d6b1
+Create Date: 2026-10-18 14:02:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7f1a3b9c2e4'
+down_revision: Union[str, Sequence[str], None] = 'c4e8a2f5d6b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_bookings_owner_depart', 'bookings', ['owner_id', 'depart_date', 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_bookings_owner_depart', table_name='bookings')
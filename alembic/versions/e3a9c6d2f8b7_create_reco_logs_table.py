@@ -0,0 +1,43 @@
+"""create reco_logs table
+
+Revision ID: e3a9c6d2f8b7
+Revises: d7f1a3b9c2e4
+Create Date: 2026-10-18 16:27:09.842113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a9c6d2f8b7'
+down_revision: Union[str, Sequence[str], None] = 'd7f1a3b9c2e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('reco_logs',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('user_id', sa.String(length=120), nullable=False),
+    sa.Column('booking_id', sa.String(length=36), nullable=True),
+    sa.Column('surface', sa.String(length=20), nullable=False),
+    sa.Column('city', sa.String(length=80), nullable=True),
+    sa.Column('category', sa.String(length=20), nullable=True),
+    sa.Column('items', sa.JSON(), nullable=False),
+    sa.Column('latency_ms', sa.Float(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_reco_logs_created_at'), 'reco_logs', ['created_at'], unique=False)
+    op.create_index(op.f('ix_reco_logs_user_id'), 'reco_logs', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_reco_logs_user_id'), table_name='reco_logs')
+    op.drop_index(op.f('ix_reco_logs_created_at'), table_name='reco_logs')
+    op.drop_table('reco_logs')
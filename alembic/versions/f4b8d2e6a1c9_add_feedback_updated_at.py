@@ -0,0 +1,30 @@
+"""add feedback.updated_at
+
+Revision ID: f4b8d2e6a1c9
+Revises: e3a9c6d2f8b7
+Create Date: 2026-10-18 18:05:37.204918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4b8d2e6a1c9'
+down_revision: Union[str, Sequence[str], None] = 'e3a9c6d2f8b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('feedback', sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.execute("UPDATE feedback SET updated_at = created_at")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('feedback') as batch_op:
+        batch_op.drop_column('updated_at')
@@ -1,10 +1,12 @@
+import secrets
 from typing import Optional
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError
 
-from app.core.security import decode_token
+from app.core.config import settings
+from app.core.security import decode_token_cached
 
 bearer_scheme = HTTPBearer(auto_error=False)
 
@@ -26,7 +28,7 @@ def get_current_user(
 
     token = creds.credentials
     try:
-        payload = decode_token(token)
+        payload = decode_token_cached(token)
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -46,3 +48,24 @@ def get_current_user(
         "type": "guest" if sub.startswith("guest:") else "user",
         "claims": payload,
     }
+
+
+def require_crm_key(x_api_key: Optional[str] = Header(None)) -> None:
+    """
+    Accès service-à-service (CRM) : clé partagée dans X-API-Key.
+    Sans CRM_API_KEY configurée, les endpoints concernés sont désactivés.
+    """
+    if not settings.CRM_API_KEY:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Batch scoring disabled (CRM_API_KEY not set)",
+        )
+    # comparaison sur des octets (compare_digest refuse les str non ASCII) ;
+    # l'en-tête a été décodé en latin-1 : on retrouve ainsi les octets reçus
+    if x_api_key is None or not secrets.compare_digest(
+        x_api_key.encode("latin-1"), settings.CRM_API_KEY.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid API key",
+        )
@@ -1,10 +1,15 @@
 import secrets
 from uuid import uuid4
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import inspect
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
-from app.core.security import create_access_token, hash_password, verify_password
+from app.core.security import (
+    PasswordHasherBusy,
+    create_access_token,
+    hash_password_async,
+    verify_password_async,
+)
 from app.core.database import get_db
 from app.api.deps import get_current_user
 from app.models.user import User
@@ -12,10 +17,22 @@ from app.schemas.auth import TokenResponse, MeResponse, RegisterRequest, LoginRe
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
-def ensure_user_table(db: Session) -> None:
-    bind = db.get_bind()
-    if not inspect(bind).has_table(User.__tablename__):
-        User.__table__.create(bind=bind, checkfirst=True)
+
+def get_user_by_email(db: Session, email: str) -> User | None:
+    return db.query(User).filter(User.email == email).first()
+
+
+def save_user(db: Session, user: User) -> None:
+    db.add(user)
+    db.commit()
+
+
+def hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication service busy, retry shortly",
+        headers={"Retry-After": "1"},
+    )
 
 
 @router.post("/guest", response_model=TokenResponse)
@@ -28,31 +45,36 @@ def create_guest_token():
     token = create_access_token(subject=guest_id, payload={"role": "guest"})
     return TokenResponse(access_token=token)
 
+# Endpoints async : le hash (CPU) part dans le pool de process, les accès DB
+# (sync) dans le threadpool ; aucun thread n'est bloqué pendant le hash.
 @router.post("/register", response_model=TokenResponse)
-def register(
+async def register(
     payload: RegisterRequest,
     db: Session = Depends(get_db),
 ):
-    ensure_user_table(db)
     email = payload.email.strip().lower()
 
-    existing = db.query(User).filter(User.email == email).first()
+    existing = await run_in_threadpool(get_user_by_email, db, email)
     if existing:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Email already registered",
         )
 
+    try:
+        hashed_password = await hash_password_async(payload.password)
+    except PasswordHasherBusy:
+        raise hasher_busy()
+
     user_id = f"user:{uuid4()}"
     user = User(
         id=user_id,
         first_name=payload.first_name.strip(),
         last_name=payload.last_name.strip(),
         email=email,
-        hashed_password=hash_password(payload.password),
+        hashed_password=hashed_password,
     )
-    db.add(user)
-    db.commit()
+    await run_in_threadpool(save_user, db, user)
 
     token = create_access_token(
         subject=user.id,
@@ -67,19 +89,33 @@ def register(
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(
+async def login(
     payload: LoginRequest,
     db: Session = Depends(get_db),
 ):
-    ensure_user_table(db)
     email = payload.email.strip().lower()
-    user = db.query(User).filter(User.email == email).first()
-    if not user or not verify_password(payload.password, user.hashed_password):
+    user = await run_in_threadpool(get_user_by_email, db, email)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid credentials",
+        )
+
+    try:
+        ok, new_hash = await verify_password_async(payload.password, user.hashed_password)
+    except PasswordHasherBusy:
+        raise hasher_busy()
+    if not ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials",
         )
 
+    # Coût de hash modifié depuis l'inscription => rehash transparent
+    if new_hash:
+        user.hashed_password = new_hash
+        await run_in_threadpool(save_user, db, user)
+
     token = create_access_token(
         subject=user.id,
         payload={
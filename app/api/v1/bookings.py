@@ -1,18 +1,34 @@
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import StreamingResponse
+from datetime import date
+from typing import Any
+
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Response, status
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from io import BytesIO
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import cm
-from datetime import datetime
 
 from app.api.deps import get_current_user
+from app.core.config import settings
 from app.core.database import get_db
 from app.models.booking import Booking
 from app.models.consent import Consent
-from app.schemas.booking import BookingCreate, BookingOut
+from app.schemas.booking import (
+    BookingCreate,
+    BookingOut,
+    BulkBookingResult,
+    BulkRowError,
+    TicketExportRequest,
+)
+from app.services.booking_ingest import ingest_bookings
+from app.services.profile_service import invalidate_profile
+from app.services.ticket_jobs import artifact_path, discard_artifact, enqueue_ticket, ticket_jobs
+from app.services.ticket_service import (
+    get_ticket_pdf,
+    stream_tickets_zip,
+    ticket_cache,
+    ticket_fingerprint,
+    ticket_job,
+)
+from app.utils.http import etag_matches
 
 router = APIRouter(prefix="/bookings", tags=["bookings"])
 
@@ -60,9 +76,31 @@ def create_booking(
     
     db.commit()
     db.refresh(booking)
+    invalidate_profile(user["id"])
+    enqueue_ticket(booking)
     return booking
 
 
+@router.post("/bulk", response_model=BulkBookingResult)
+def create_bookings_bulk(
+    payload: list[Any] = Body(...),
+    user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Import groupé : chaque ligne est validée séparément, les erreurs sont renvoyées par index"""
+    if len(payload) > settings.BOOKING_BULK_MAX:
+        raise HTTPException(
+            status_code=413, detail=f"At most {settings.BOOKING_BULK_MAX} bookings per request"
+        )
+
+    result = ingest_bookings(db, ((user["id"], row) for row in payload))
+    return BulkBookingResult(
+        created=result.created,
+        ids=result.ids,
+        errors=[BulkRowError(index=i, detail=d) for i, d in result.errors],
+    )
+
+
 @router.put("/{booking_id}", response_model=BookingOut)
 def update_booking_info(
     booking_id: str,
@@ -78,6 +116,10 @@ def update_booking_info(
     if booking.owner_id != user["id"]:
         raise HTTPException(status_code=403, detail="Forbidden")
     
+    # Le billet en cache ne correspond plus : on libère l'entrée
+    old_fingerprint = ticket_fingerprint(booking)
+    ticket_cache.invalidate(old_fingerprint)
+
     # Mise à jour des informations personnelles
     booking.first_name = payload.first_name
     booking.last_name = payload.last_name
@@ -86,12 +128,16 @@ def update_booking_info(
     
     db.commit()
     db.refresh(booking)
+    if settings.TICKET_JOBS_ENABLED and ticket_fingerprint(booking) != old_fingerprint:
+        discard_artifact(old_fingerprint)
+    enqueue_ticket(booking)
     return booking
 
 
-@router.get("/{booking_id}/ticket", response_class=StreamingResponse)
+@router.get("/{booking_id}/ticket", response_class=Response)
 def download_ticket(
     booking_id: str,
+    if_none_match: str | None = Header(None),
     user: dict = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -103,72 +149,93 @@ def download_ticket(
     if booking.owner_id != user["id"]:
         raise HTTPException(status_code=403, detail="Forbidden")
     
-    # Créer le PDF
-    buffer = BytesIO()
-    p = canvas.Canvas(buffer, pagesize=A4)
-    width, height = A4
-    
-    # En-tête
-    p.setFillColorRGB(0.7, 0.1, 0.1)  # Rouge RAM
-    p.rect(0, height - 4*cm, width, 4*cm, fill=True)
-    
-    p.setFillColorRGB(1, 1, 1)  # Blanc
-    p.setFont("Helvetica-Bold", 24)
-    p.drawString(2*cm, height - 2.5*cm, "Royal Air Maroc")
-    p.setFont("Helvetica", 14)
-    p.drawString(2*cm, height - 3.2*cm, "E-Ticket / Billet Électronique")
-    
-    # Informations du passager
-    p.setFillColorRGB(0, 0, 0)
-    p.setFont("Helvetica-Bold", 12)
-    p.drawString(2*cm, height - 6*cm, "PASSAGER / PASSENGER")
-    
-    p.setFont("Helvetica", 10)
-    y_pos = height - 7*cm
-    if booking.first_name and booking.last_name:
-        p.drawString(2*cm, y_pos, f"Nom / Name: {booking.last_name.upper()} {booking.first_name}")
-        y_pos -= 0.6*cm
-    if booking.email:
-        p.drawString(2*cm, y_pos, f"Email: {booking.email}")
-        y_pos -= 0.6*cm
-    if booking.birth_date:
-        p.drawString(2*cm, y_pos, f"Date de naissance / Birth date: {booking.birth_date.strftime('%d/%m/%Y')}")
-        y_pos -= 1*cm
-    
-    # Détails du vol
-    p.setFont("Helvetica-Bold", 12)
-    p.drawString(2*cm, y_pos, "DÉTAILS DU VOL / FLIGHT DETAILS")
-    y_pos -= 0.8*cm
-    
-    p.setFont("Helvetica", 10)
-    p.drawString(2*cm, y_pos, f"Référence: {booking.id[:8].upper()}")
-    y_pos -= 0.6*cm
-    p.drawString(2*cm, y_pos, f"Trajet: {booking.origin} → {booking.destination}")
-    y_pos -= 0.6*cm
-    p.drawString(2*cm, y_pos, f"Date de départ: {booking.depart_date.strftime('%d/%m/%Y')}")
-    y_pos -= 0.6*cm
-    if booking.return_date:
-        p.drawString(2*cm, y_pos, f"Date de retour: {booking.return_date.strftime('%d/%m/%Y')}")
-        y_pos -= 0.6*cm
-    p.drawString(2*cm, y_pos, f"Classe: {booking.cabin.upper()}")
-    y_pos -= 0.6*cm
-    p.drawString(2*cm, y_pos, f"Type: {'Aller-Retour' if booking.trip_type == 'roundtrip' else 'Aller Simple'}")
-    
-    # Pied de page
-    p.setFont("Helvetica-Oblique", 8)
-    p.drawString(2*cm, 2*cm, f"Document généré le {datetime.now().strftime('%d/%m/%Y à %H:%M')}")
-    p.drawString(2*cm, 1.5*cm, "Veuillez présenter ce document à l'embarquement / Please present this document at boarding")
-    
-    p.showPage()
-    p.save()
-    
-    buffer.seek(0)
+    # Billet en cache (content-addressed) : l'ETag est l'empreinte des champs imprimés
+    fingerprint = ticket_fingerprint(booking)
+    etag = f'"{fingerprint}"'
+    if if_none_match and etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
     filename = f"ticket_RAM_{booking.id[:8]}.pdf"
-    
+    headers = {
+        "Content-Disposition": f"attachment; filename={filename}",
+        "ETag": etag,
+        "Cache-Control": "private, no-cache",
+    }
+
+    if settings.TICKET_JOBS_ENABLED:
+        # Fichier prérendu par le pool ; sinon on (re)lance le job et on fait patienter le client
+        path = artifact_path(fingerprint)
+        if path.exists():
+            return FileResponse(path, media_type="application/pdf", headers=headers)
+        if not ticket_jobs.is_pending(fingerprint):
+            enqueue_ticket(booking)
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content={"status": "pending", "retry_after_s": settings.TICKET_JOB_RETRY_AFTER_S},
+            headers={"Retry-After": str(settings.TICKET_JOB_RETRY_AFTER_S)},
+        )
+
+    pdf = get_ticket_pdf(booking, fingerprint)
+    return Response(content=pdf, media_type="application/pdf", headers=headers)
+
+
+@router.post("/tickets/export", response_class=StreamingResponse)
+def export_tickets(
+    payload: TicketExportRequest,
+    user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Exporter plusieurs billets PDF dans une archive ZIP (ids explicites ou filtres)"""
+    if payload.booking_ids:
+        ids = list(dict.fromkeys(payload.booking_ids))
+        if len(ids) > settings.TICKET_EXPORT_MAX:
+            raise HTTPException(
+                status_code=422, detail=f"At most {settings.TICKET_EXPORT_MAX} bookings per export"
+            )
+        found = {b.id: b for b in db.query(Booking).filter(Booking.id.in_(ids)).all()}
+        missing = [i for i in ids if i not in found]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Booking not found: {missing[0]}")
+        # Mêmes règles que download_ticket : tout ou rien
+        if any(b.owner_id != user["id"] for b in found.values()):
+            raise HTTPException(status_code=403, detail="Forbidden")
+        bookings = [found[i] for i in ids]
+    else:
+        query = db.query(Booking).filter(Booking.owner_id == user["id"])
+        if payload.depart_from:
+            query = query.filter(Booking.depart_date >= payload.depart_from)
+        if payload.depart_to:
+            query = query.filter(Booking.depart_date <= payload.depart_to)
+        if payload.destination:
+            query = query.filter(Booking.destination == payload.destination)
+        bookings = (
+            query.order_by(Booking.depart_date, Booking.id)
+            .limit(settings.TICKET_EXPORT_MAX + 1)
+            .all()
+        )
+        if len(bookings) > settings.TICKET_EXPORT_MAX:
+            raise HTTPException(
+                status_code=422,
+                detail=f"More than {settings.TICKET_EXPORT_MAX} bookings match, narrow the filter",
+            )
+
+    if not bookings:
+        raise HTTPException(status_code=404, detail="No bookings found")
+
+    # Champs copiés maintenant : la session est fermée pendant le streaming
+    jobs = []
+    names: set[str] = set()
+    for booking in bookings:
+        filename = f"ticket_RAM_{booking.id[:8]}.pdf"
+        if filename in names:
+            filename = f"ticket_RAM_{booking.id}.pdf"
+        names.add(filename)
+        jobs.append(ticket_job(booking, filename))
+
     return StreamingResponse(
-        buffer,
-        media_type="application/pdf",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
+        stream_tickets_zip(jobs),
+        media_type="application/zip",
+        headers={"Content-Disposition": f"attachment; filename=tickets_RAM_{date.today():%Y%m%d}.zip"},
     )
 
 
@@ -1,78 +1,131 @@
+import asyncio
+import logging
+import time
+
 from fastapi import APIRouter, Depends, Query
 from app.api.deps import get_current_user
+from app.core.config import settings
 from app.schemas.destination import DestinationRecoResponse
+from app.services.candidates import build_candidates, overfetch_limit
 from app.services.destination_service import get_destination_provider
-from sqlalchemy import inspect
-from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.models.consent import Consent
+from app.services.feedback_buffer import feedback_buffer
+from app.services.item_similarity import similar_items
+from app.services.profile_service import PersonalizationProfile, load_profile
+from app.services.ranking import city_popularity, default_weights, rank_groups, rank_items
+from app.services.reco_log_service import log_impressions
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
 from fastapi import HTTPException 
 from app.models.booking import Booking
-from app.models.preference import Preference
 from app.schemas.arrival import ArrivalResponse 
 from app.models.feedback import Feedback
+from app.providers.base import DestinationProvider, ProviderUnavailable
+from app.schemas.destination import DestinationItem
+from app.utils.responses import FastJSONResponse
 
-
-
-
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/destinations", tags=["destinations"])
 
 ALLOWED_CATEGORIES = {"transport", "hotel", "restaurant", "activity"}
 ALLOWED_BUDGETS = {"low", "mid", "high"}
+ARRIVAL_CATEGORIES = ["hotel", "restaurant", "transport", "activity"]
 
-def ensure_destination_consent(user_id: str, db: Session) -> None:
-    consent = db.query(Consent).filter(Consent.user_id == user_id).first()
-    if not consent:
-        consent = Consent(user_id=user_id, destination_recos_enabled=True)
-        db.add(consent)
-        db.commit()
-        db.refresh(consent)
-    if not consent.destination_recos_enabled:
+async def ensure_destination_consent(user_id: str, db: AsyncSession) -> PersonalizationProfile:
+    profile = await load_profile(db, user_id)
+    if not profile.destination_recos_enabled:
         raise HTTPException(
             status_code=403,
             detail="Destination recommendations disabled (consent required)",
         )
-
-def ensure_feedback_table(db: Session) -> None:
-    bind = db.get_bind()
-    if not inspect(bind).has_table(Feedback.__tablename__):
-        Feedback.__table__.create(bind=bind, checkfirst=True)
-
-
-@router.get("/recommendations", response_model=DestinationRecoResponse)
+    return profile
+
+
+async def search_categories(
+    provider: DestinationProvider,
+    city: str,
+    categories: list[str],
+    budget: str | None,
+    limit: int,
+    timeout: float,
+) -> dict[str, list[DestinationItem]]:
+    """
+    Lance provider.search pour chaque catégorie en parallèle, avec une deadline
+    commune. Une catégorie en échec ou hors délai renvoie une liste vide
+    (on préfère une section vide plutôt que casser tout l'écran d'arrivée).
+    """
+    tasks = {
+        cat: asyncio.create_task(
+            provider.search(city=city, category=cat, budget=budget, limit=limit)
+        )
+        for cat in categories
+    }
+    done, pending = await asyncio.wait(tasks.values(), timeout=timeout)
+    for task in pending:
+        task.cancel()
+
+    results: dict[str, list[DestinationItem]] = {}
+    for cat, task in tasks.items():
+        if task not in done:
+            logger.warning("provider.search timeout (city=%s, category=%s)", city, cat)
+            results[cat] = []
+        elif task.exception() is not None:
+            logger.warning(
+                "provider.search failed (city=%s, category=%s): %r", city, cat, task.exception()
+            )
+            results[cat] = []
+        else:
+            results[cat] = task.result()
+    return results
+
+
+def impressions(
+    items: list[DestinationItem],
+    scores: list[float],
+    category: str | None = None,
+) -> list[dict]:
+    rows = []
+    for rank, (x, score) in enumerate(zip(items, scores)):
+        row = {"id": x.id, "rank": rank, "score": round(score, 4)}
+        if category:
+            row["category"] = category
+        rows.append(row)
+    return rows
+
+
+@router.get(
+    "/recommendations", response_model=DestinationRecoResponse, response_class=FastJSONResponse
+)
 async def destination_recommendations(
     city: str = Query(..., min_length=2),
     category: str = Query(..., description="transport/hotel/restaurant/activity"),
     budget: str | None = Query(None, description="low/mid/high"),
     limit: int = Query(10, ge=1, le=20),
     user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
+    started_at = time.perf_counter()
     city_clean = city.strip()
     city_label = city_clean.title()
-    ensure_destination_consent(user["id"], db)
-
-    pref = db.query(Preference).filter(Preference.user_id == user["id"]).first()
-    interests = []
-    if pref and pref.interests:
-        interests = [x.strip().lower() for x in pref.interests.split(",") if x.strip()]
+    profile = await ensure_destination_consent(user["id"], db)
+    interests = list(profile.interests)
 
     # Si le client n'envoie pas budget => on applique celui des préférences
-    if budget is None and pref and pref.budget:
-        budget = pref.budget
+    if budget is None and profile.budget:
+        budget = profile.budget
 
     # Sécurité/robustesse : validation simple
     category = category.lower().strip()
     if category not in ALLOWED_CATEGORIES:
-        return {
+        return FastJSONResponse({
             "city": city,
             "category": category,
             "budget": budget,
             "limit": limit,
             "count": 0,
             "items": [],
-        }
+        })
 
     if budget is not None:
         budget = budget.lower().strip()
@@ -80,69 +133,80 @@ async def destination_recommendations(
             budget = None  # on ignore un budget invalide plutôt que casser l'expérience
 
     provider = get_destination_provider()
-    items = await provider.search(city=city, category=category, budget=budget, limit=limit)
-    
-    # ✅ ÉTAPE 1 : Tri "personnalisé" léger basé sur les intérêts (MVP)
-    # - food => restaurants prioritaires
-    # - culture/nature => activities prioritaires
-    boost_interests = False
-    if category == "restaurant" and "food" in interests:
-        boost_interests = True
-    if category == "activity" and ("culture" in interests or "nature" in interests):
-        boost_interests = True
-
-    if boost_interests:
-        items = sorted(items, key=lambda x: (-x.rating, x.distance_km))
+    search_started_at = time.perf_counter()
+    try:
+        # Sur-échantillonnage : de la marge pour la personnalisation avant le top `limit`
+        items = await provider.search(
+            city=city, category=category, budget=budget, limit=overfetch_limit(limit)
+        )
+    except ProviderUnavailable:
+        raise HTTPException(
+            status_code=503,
+            detail="Destination provider temporarily unavailable",
+        )
     
-    # ✅ ÉTAPE 2 : Appliquer feedback utilisateur (like/dislike) pour personnalisation fine
+    # Feedback utilisateur (like/dislike) pour personnalisation fine
     uid = user["id"]
-    ensure_feedback_table(db)
-
-    feedbacks = (
-        db.query(Feedback)
-        .filter(
-           Feedback.user_id == uid,
-           Feedback.city == city_clean.lower(),
-           Feedback.category == category,
-       )
-       .all()
-   )
-
-    fb_map = {f.item_id: f.action for f in feedbacks}
-
-    def score(x):
-        fb = fb_map.get(x.id)
-        boost = 0
-        if fb == "like":
-            boost = 100
-        elif fb == "dislike":
-            boost = -100
-        # base : rating haut, distance faible
-        return (boost, x.rating, -x.distance_km)
-
-    items = sorted(items, key=score, reverse=True)
-
-    return {
+
+    result = await db.execute(
+        select(Feedback.item_id, Feedback.action).where(
+            Feedback.user_id == uid,
+            Feedback.city == city_clean.lower(),
+            Feedback.category == category,
+        )
+    )
+    fb_map = {item_id: action for item_id, action in result.all()}
+    if settings.FEEDBACK_WRITE_BEHIND:
+        # feedback encore dans le tampon write-behind : visible pour son auteur
+        feedback_buffer.overlay(uid, city_clean.lower(), {category: fb_map})
+
+    # Candidats : dislikes retirés, likes absents des résultats réinjectés
+    items = await build_candidates(
+        provider, city_clean, category, items, fb_map, budget, started_at=search_started_at
+    )
+
+    # Classement : feedback, intérêts, note, distance, budget, popularité (cf. ranking)
+    items, scores = rank_items(
+        items,
+        limit,
+        weights=default_weights,
+        feedback=fb_map,
+        interests=interests,
+        popularity=await city_popularity(city_clean),
+        similar=similar_items(i for i, action in fb_map.items() if action == "like"),
+        budget=budget,
+    )
+
+    log_impressions(
+        user_id=uid,
+        surface="destination",
+        city=city_clean.lower(),
+        category=category,
+        items=impressions(items, scores),
+        started_at=started_at,
+    )
+    return FastJSONResponse({
         "city": city_label,
         "category": category,
         "budget": budget,
         "limit": limit,
         "count": len(items),
         "items": items
-    }
+    })
 
-@router.get("/arrival", response_model=ArrivalResponse)
+@router.get("/arrival", response_model=ArrivalResponse, response_class=FastJSONResponse)
 async def arrival_recommendations(
     city: str | None = Query(None, min_length=2),
     booking_id: str | None = Query(None),
     limit_per_category: int = Query(4, ge=1, le=10),
     budget: str | None = Query(None, description="low/mid/high (optional)"),
     user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
+    started_at = time.perf_counter()
     booking = None
     if booking_id:
-        booking = db.query(Booking).filter(Booking.id == booking_id).first()
+        booking = await db.get(Booking, booking_id)
         if not booking:
             raise HTTPException(status_code=404, detail="Booking not found")
         if booking.owner_id != user["id"]:
@@ -159,73 +223,75 @@ async def arrival_recommendations(
     # city formatting
     city_label = city_clean.title()
 
-    # consent required
-    ensure_destination_consent(user["id"], db)
-
-    # prefs (budget + interests)
-    pref = db.query(Preference).filter(Preference.user_id == user["id"]).first()
-    interests = []
-    pref_budget = None
-    if pref:
-        pref_budget = pref.budget
-        interests = [x for x in pref.interests.split(",") if x.strip()] if pref.interests else []
+    # consent required + prefs (budget + interests), une seule requête / cache
+    profile = await ensure_destination_consent(user["id"], db)
+    interests = list(profile.interests)
 
     if budget is None:
-        budget = pref_budget
+        budget = profile.budget
 
     provider = get_destination_provider()
 
-    categories = ["hotel", "restaurant", "transport", "activity"]
-    sections = {}
-    ensure_feedback_table(db)
-
-    for cat in categories:
-        items = await provider.search(
-            city=city_clean,
-            category=cat,
-            budget=budget,
-            limit=limit_per_category
+    # Feedback de l'utilisateur pour la ville : une seule requête, répartie par catégorie
+    uid = user["id"]
+    result = await db.execute(
+        select(Feedback.category, Feedback.item_id, Feedback.action).where(
+            Feedback.user_id == uid,
+            Feedback.city == city_clean.lower(),
+            Feedback.category.in_(ARRIVAL_CATEGORIES),
         )
-
-        # Priorisation simple selon intérêts (MVP)
-        if interests:
-            boost = (
-                (cat == "restaurant" and "food" in interests) or
-                (cat == "activity" and ("culture" in interests or "nature" in interests))
-            )
-            if boost:
-                items = sorted(items, key=lambda x: (-x.rating, x.distance_km))
-                # ✅ Appliquer feedback utilisateur (like/dislike)
-        uid = user["id"]
-        feedbacks = (
-            db.query(Feedback)
-            .filter(
-                Feedback.user_id == uid,
-                Feedback.city == city_clean.lower(),
-                Feedback.category == cat,
-            )
-            .all()
+    )
+    fb_by_cat: dict[str, dict[str, str]] = {cat: {} for cat in ARRIVAL_CATEGORIES}
+    for cat, item_id, action in result.all():
+        fb_by_cat[cat][item_id] = action
+    if settings.FEEDBACK_WRITE_BEHIND:
+        feedback_buffer.overlay(uid, city_clean.lower(), fb_by_cat)
+
+    # Recherches provider en parallèle : la latence = la catégorie la plus lente
+    results = await search_categories(
+        provider,
+        city=city_clean,
+        categories=ARRIVAL_CATEGORIES,
+        budget=budget,
+        limit=overfetch_limit(limit_per_category),
+        timeout=settings.ARRIVAL_TIMEOUT_S,
+    )
+    # lookup : cache / catalogue, sans appel réseau => pas besoin de tâches parallèles
+    for cat in ARRIVAL_CATEGORIES:
+        results[cat] = await build_candidates(
+            provider, city_clean, cat, results[cat], fb_by_cat[cat], budget
         )
 
-        fb_map = {f.item_id: f.action for f in feedbacks}
-
-        def score(x):
-            fb = fb_map.get(x.id)
-            boost = 0
-            if fb == "like":
-                boost = 100
-            elif fb == "dislike":
-                boost = -100
-               # base : rating haut, distance faible
-            return (boost, x.rating, -x.distance_km)
-
-        items = sorted(items, key=score, reverse=True)
-
-        sections[cat] = items
-
-    return {
+    # Toutes les catégories classées en un seul passage vectorisé
+    ranked = rank_groups(
+        results,
+        limit_per_category,
+        weights=default_weights,
+        feedback=fb_by_cat,
+        interests=interests,
+        popularity=await city_popularity(city_clean),
+        similar=similar_items(
+            i for fb in fb_by_cat.values() for i, action in fb.items() if action == "like"
+        ),
+        budget=budget,
+    )
+    sections = {cat: ranked[cat][0] for cat in ARRIVAL_CATEGORIES}
+
+    log_impressions(
+        user_id=uid,
+        surface="arrival",
+        booking_id=booking.id if booking else None,
+        city=city_clean.lower(),
+        items=[
+            row
+            for cat in ARRIVAL_CATEGORIES
+            for row in impressions(*ranked[cat], category=cat)
+        ],
+        started_at=started_at,
+    )
+    return FastJSONResponse({
         "city": city_label,
         "budget": budget,
         "interests": interests,
         "sections": sections,
-    }
+    })
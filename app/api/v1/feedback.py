@@ -1,25 +1,22 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
-from app.schemas.feedback import FeedbackCreate, FeedbackOut
-from app.models.feedback import Feedback
+from app.schemas.booking import BulkRowError
+from app.schemas.feedback import FeedbackBatch, FeedbackBatchResult, FeedbackCreate, FeedbackOut
 from app.models.booking import Booking
 from app.api.deps import get_current_user
+from app.core.config import settings
 from app.core.database import get_db
+from app.services.feedback_buffer import record_feedback
 
 router = APIRouter(prefix="/feedback", tags=["feedback"])
 
-@router.post("", response_model=FeedbackOut)
-def upsert_feedback(
-    payload: FeedbackCreate,
-    user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
-):
-    uid = user["id"]
+
+def resolve_feedback(payload: FeedbackCreate, uid: str, booking: Booking | None) -> dict:
+    """Ligne feedback normalisée (city en minuscules, item_id par défaut) ou HTTPException."""
     # Normaliser city en lowercase pour cohérence
     city_clean = None
     if payload.booking_id:
-        booking = db.query(Booking).filter(Booking.id == payload.booking_id).first()
         if not booking:
             raise HTTPException(status_code=404, detail="Booking not found")
         if booking.owner_id != uid:
@@ -41,29 +38,6 @@ def upsert_feedback(
         else:
             raise HTTPException(status_code=422, detail="item_id or booking_id is required")
 
-    existing = (
-        db.query(Feedback)
-        .filter(Feedback.user_id == uid, Feedback.item_id == item_id)
-        .first()
-    )
-
-    if existing:
-        existing.action = payload.action
-        existing.category = payload.category
-        existing.city = city_clean
-        db.add(existing)
-    else:
-        fb = Feedback(
-            user_id=uid,
-            item_id=item_id,
-            category=payload.category,
-            city=city_clean,
-            action=payload.action,
-        )
-        db.add(fb)
-
-    db.commit()
-
     return {
         "user_id": uid,
         "item_id": item_id,
@@ -71,3 +45,56 @@ def upsert_feedback(
         "city": city_clean,
         "action": payload.action,
     }
+
+
+@router.post("", response_model=FeedbackOut)
+def upsert_feedback(
+    payload: FeedbackCreate,
+    user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    booking = None
+    if payload.booking_id:
+        booking = db.query(Booking).filter(Booking.id == payload.booking_id).first()
+
+    row = resolve_feedback(payload, user["id"], booking)
+    record_feedback(db, [row])
+    return row
+
+
+@router.post("/batch", response_model=FeedbackBatchResult)
+def upsert_feedback_batch(
+    payload: FeedbackBatch,
+    user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Plusieurs évènements en un appel : un seul upsert, erreurs renvoyées par index"""
+    if len(payload.events) > settings.FEEDBACK_BATCH_MAX:
+        raise HTTPException(
+            status_code=413, detail=f"At most {settings.FEEDBACK_BATCH_MAX} events per batch"
+        )
+
+    uid = user["id"]
+    booking_ids = {e.booking_id for e in payload.events if e.booking_id}
+    bookings = (
+        {b.id: b for b in db.query(Booking).filter(Booking.id.in_(booking_ids)).all()}
+        if booking_ids else {}
+    )
+
+    # Le dernier évènement sur un même item l'emporte (comme des appels successifs) ;
+    # dédoublonné car un même INSERT ne peut pas toucher deux fois la même ligne
+    latest: dict[str, dict] = {}
+    errors: list[BulkRowError] = []
+    for index, event in enumerate(payload.events):
+        try:
+            row = resolve_feedback(event, uid, bookings.get(event.booking_id))
+        except HTTPException as exc:
+            errors.append(BulkRowError(index=index, detail=str(exc.detail)))
+            continue
+        latest.pop(row["item_id"], None)
+        latest[row["item_id"]] = row
+
+    rows = list(latest.values())
+    if rows:
+        record_feedback(db, rows)
+    return {"applied": len(rows), "items": rows, "errors": errors}
@@ -1,39 +1,97 @@
+import base64
 from datetime import date
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import case, tuple_
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user
 from app.core.database import get_db
 from app.models.booking import Booking
-from app.schemas.timeline import TimelineResponse
-from app.services.timeline_service import build_timeline
+from app.schemas.timeline import TimelineResponse, TripListResponse, TripSummary
+from app.services.timeline_service import compute_phase, render_timeline
+from app.utils.json_template import Raw
+from app.utils.responses import FastJSONResponse
 
 
 router = APIRouter(prefix="/my-trips", tags=["my-trips"])
 
 
 def pick_active_or_next_booking(db: Session, owner_id: str, today: date) -> Booking | None:
-    # 1) Prochain voyage (depart >= today) le plus proche
-    next_b = (
+    # Une seule requête : prochain voyage (depart >= today) le plus proche,
+    # sinon dernier voyage passé (le plus récent)
+    upcoming = Booking.depart_date >= today
+    return (
         db.query(Booking)
-        .filter(Booking.owner_id == owner_id, Booking.depart_date >= today)
-        .order_by(Booking.depart_date.asc())
+        .filter(Booking.owner_id == owner_id)
+        .order_by(
+            case((upcoming, 0), else_=1),
+            case((upcoming, Booking.depart_date)).asc(),
+            Booking.depart_date.desc(),
+            Booking.id,
+        )
         .first()
     )
-    if next_b:
-        return next_b
 
-    # 2) Sinon, dernier voyage passé (le plus récent)
-    last_b = (
-        db.query(Booking)
-        .filter(Booking.owner_id == owner_id)
-        .order_by(Booking.depart_date.desc())
-        .first()
+
+def encode_cursor(depart_date: date, booking_id: str) -> str:
+    raw = f"{depart_date.isoformat()}|{booking_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[date, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        depart, booking_id = raw.split("|", 1)
+        return date.fromisoformat(depart), booking_id
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@router.get("", response_model=TripListResponse)
+def list_my_trips(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None),
+    user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Tous les voyages de l'utilisateur, par date de départ, paginés par curseur (keyset)"""
+    query = (
+        db.query(
+            Booking.id,
+            Booking.origin,
+            Booking.destination,
+            Booking.trip_type,
+            Booking.cabin,
+            Booking.depart_date,
+            Booking.return_date,
+        )
+        .filter(Booking.owner_id == user["id"])
     )
-    return last_b
+    if cursor:
+        query = query.filter(tuple_(Booking.depart_date, Booking.id) > decode_cursor(cursor))
+    rows = query.order_by(Booking.depart_date, Booking.id).limit(limit + 1).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    today = date.today()
+    items = [
+        TripSummary(
+            booking_id=r.id,
+            origin=r.origin,
+            destination=r.destination,
+            trip_type=r.trip_type,
+            cabin=r.cabin,
+            depart_date=r.depart_date,
+            return_date=r.return_date,
+            status=compute_phase(today, r.depart_date, r.return_date),
+        )
+        for r in rows
+    ]
+    next_cursor = encode_cursor(rows[-1].depart_date, rows[-1].id) if has_more else None
+    return TripListResponse(items=items, next_cursor=next_cursor)
 
 
-@router.get("/timeline", response_model=TimelineResponse)
+@router.get("/timeline", response_model=TimelineResponse, response_class=FastJSONResponse)
 def timeline_current_or_next(
     user: dict = Depends(get_current_user),
     db: Session = Depends(get_db),
@@ -44,10 +102,12 @@ def timeline_current_or_next(
     if not booking:
         raise HTTPException(status_code=404, detail="No bookings found for this user")
 
-    return build_timeline(booking=booking, today=today)
+    return FastJSONResponse(Raw(render_timeline(booking=booking, today=today)))
 
 
-@router.get("/{booking_id}/timeline", response_model=TimelineResponse)
+@router.get(
+    "/{booking_id}/timeline", response_model=TimelineResponse, response_class=FastJSONResponse
+)
 def timeline_for_booking(
     booking_id: str,
     user: dict = Depends(get_current_user),
@@ -59,4 +119,4 @@ def timeline_for_booking(
     if booking.owner_id != user["id"]:
         raise HTTPException(status_code=403, detail="Forbidden")
 
-    return build_timeline(booking=booking, today=date.today())
+    return FastJSONResponse(Raw(render_timeline(booking=booking, today=date.today())))
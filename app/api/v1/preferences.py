@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user
 from app.core.database import get_db
+from app.services.profile_service import invalidate_profile
 from app.models.preference import Preference
 from app.schemas.preference import PreferenceUpsert, PreferenceOut
 
@@ -22,6 +23,7 @@ def get_preferences(
         db.add(row)
         db.commit()
         db.refresh(row)
+        invalidate_profile(user["id"])
 
     interests_list = [x for x in row.interests.split(",") if x.strip()] if row.interests else []
     return {"user_id": row.user_id, "budget": row.budget, "interests": interests_list}
@@ -50,5 +52,6 @@ def upsert_preferences(
 
     db.commit()
     db.refresh(row)
+    invalidate_profile(user["id"])
 
     return {"user_id": row.user_id, "budget": row.budget, "interests": interests_clean}
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user
 from app.core.database import get_db
+from app.services.profile_service import invalidate_profile
 from app.models.consent import Consent
 from app.schemas.privacy import ConsentUpsert, ConsentOut
 
@@ -20,6 +21,7 @@ def get_consent(
         db.add(row)
         db.commit()
         db.refresh(row)
+        invalidate_profile(user["id"])
     return row
 
 
@@ -38,4 +40,5 @@ def upsert_consent(
 
     db.commit()
     db.refresh(row)
+    invalidate_profile(user["id"])
     return row
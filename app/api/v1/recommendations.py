@@ -1,8 +1,14 @@
+import time
+from datetime import date, timedelta
+
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user
-from app.core.database import get_db
+from app.api.deps import get_current_user, require_crm_key
+from app.core.config import settings
+from app.core.database import get_async_db, get_db
 from app.models.booking import Booking
 from app.schemas.arrival import ArrivalResponse
 from app.schemas.destination import DestinationRecoResponse
@@ -11,8 +17,11 @@ from app.api.v1.destinations import (
     arrival_recommendations as arrival_recommendations_handler,
     destination_recommendations as destination_recommendations_handler,
 )
+from app.services.batch_scoring import stream_post_booking_ndjson
 from app.services.scoring import compute_scores
 from app.services.recommender import build_post_booking_cards
+from app.services.reco_log_service import log_impressions
+from app.utils.responses import FastJSONResponse
 
 router = APIRouter(prefix="/recommendations", tags=["recommendations"])
 
@@ -23,6 +32,7 @@ def post_booking_recommendations(
     user: dict = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
+    started_at = time.perf_counter()
     booking = db.query(Booking).filter(Booking.id == booking_id).first()
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
@@ -40,6 +50,16 @@ def post_booking_recommendations(
 
     cards = build_post_booking_cards(scores=scores, cabin=booking.cabin)
 
+    log_impressions(
+        user_id=user["id"],
+        surface="post_booking",
+        booking_id=booking.id,
+        items=[
+            {"id": c["id"], "rank": rank, "score": c["confidence"]} for rank, c in enumerate(cards)
+        ],
+        started_at=started_at,
+    )
+
     return {
         "booking_id": booking.id,
         "summary": {
@@ -51,14 +71,36 @@ def post_booking_recommendations(
     }
 
 
-@router.get("/destination", response_model=DestinationRecoResponse)
+@router.get("/post-booking/batch", dependencies=[Depends(require_crm_key)])
+def post_booking_recommendations_batch(
+    depart_from: date | None = Query(None, description="défaut : aujourd'hui"),
+    depart_to: date | None = Query(None, description="défaut : depart_from + 7 jours"),
+):
+    """
+    Cartes post-booking de toutes les réservations au départ dans la fenêtre,
+    en NDJSON (une ligne par réservation, même contenu que /post-booking + owner_id).
+    """
+    depart_from = depart_from or date.today()
+    depart_to = depart_to or depart_from + timedelta(days=settings.BATCH_SCORING_DEFAULT_DAYS)
+    if depart_to < depart_from:
+        raise HTTPException(status_code=422, detail="depart_to must be >= depart_from")
+
+    return StreamingResponse(
+        stream_post_booking_ndjson(depart_from, depart_to, settings.BATCH_SCORING_CHUNK),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.get(
+    "/destination", response_model=DestinationRecoResponse, response_class=FastJSONResponse
+)
 async def destination_recommendations_alias(
     city: str = Query(..., min_length=2),
     category: str = Query(..., description="transport/hotel/restaurant/activity"),
     budget: str | None = Query(None, description="low/mid/high"),
     limit: int = Query(10, ge=1, le=20),
     user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     return await destination_recommendations_handler(
         city=city,
@@ -70,14 +112,14 @@ async def destination_recommendations_alias(
     )
 
 
-@router.get("/arrival", response_model=ArrivalResponse)
+@router.get("/arrival", response_model=ArrivalResponse, response_class=FastJSONResponse)
 async def arrival_recommendations_alias(
     city: str | None = Query(None, min_length=2),
     booking_id: str | None = Query(None),
     limit_per_category: int = Query(4, ge=1, le=10),
     budget: str | None = Query(None, description="low/mid/high (optional)"),
     user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     return await arrival_recommendations_handler(
         city=city,
@@ -1,5 +1,6 @@
 from fastapi import APIRouter
 from app.core.config import settings
+from app.core.schema import schema_status
 from app.api.v1.recommendations import router as recommendations_router
 from app.api.v1.destinations import router as destinations_router
 from app.api.v1.privacy import router as privacy_router
@@ -9,6 +10,13 @@ from app.api.v1.travel_info import router as travel_info_router
 
 from app.api.v1.auth import router as auth_router
 from app.api.v1.bookings import router as bookings_router
+from app.services.destination_service import get_destination_cache_stats
+from app.services.candidates import candidate_stats
+from app.services.feedback_buffer import feedback_buffer
+from app.services.item_similarity import similarity_index
+from app.services.ranking import popularity_cache
+from app.services.reco_log_service import reco_log_writer
+from app.services.ticket_jobs import ticket_jobs
 
 router = APIRouter(prefix="/api/v1")
 
@@ -25,4 +33,40 @@ router.include_router(travel_info_router)
 
 @router.get("/health", tags=["health"])
 def health():
-    return {"status": "ok", "app": settings.APP_NAME, "env": settings.ENV}
+    return {
+        "status": "ok",
+        "app": settings.APP_NAME,
+        "env": settings.ENV,
+        "schema": schema_status,
+    }
+
+
+@router.get("/health/cache", tags=["health"])
+def health_cache():
+    return {
+        "destination_cache": get_destination_cache_stats(),
+        "popularity_cache": popularity_cache.stats(),
+    }
+
+
+@router.get("/health/ranking", tags=["health"])
+def health_ranking():
+    return {
+        "candidates": candidate_stats.stats(),
+        "similarity_index": similarity_index.stats(),
+    }
+
+
+@router.get("/health/tickets", tags=["health"])
+def health_tickets():
+    return {"ticket_jobs": ticket_jobs.stats()}
+
+
+@router.get("/health/feedback", tags=["health"])
+def health_feedback():
+    return {"feedback_buffer": feedback_buffer.stats()}
+
+
+@router.get("/health/reco-log", tags=["health"])
+def health_reco_log():
+    return {"reco_log": reco_log_writer.stats()}
@@ -1,10 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user
+from app.core.config import settings
 from app.core.database import get_db
 from app.models.booking import Booking
-from app.schemas.travel_info import TravelInfoResponse, TravelInfoItem
+from app.schemas.travel_info import TravelInfoResponse
+from app.services.travel_info_service import (
+    CHECK_IN_PAYLOAD,
+    DEPARTURE_DAY_PAYLOAD,
+    TravelInfoPayload,
+)
+from app.utils.http import etag_matches
 
 router = APIRouter(prefix="/travel-info", tags=["travel-info"])
 
@@ -24,145 +31,41 @@ def get_booking_or_none(
     return booking
 
 
-def build_check_in_response(booking: Booking | None) -> TravelInfoResponse:
-    checklist = [
-        TravelInfoItem(
-            id="doc_id",
-            title="Piece d'identite",
-            description="Passeport ou CNI selon destination.",
-            tag="document",
-        ),
-        TravelInfoItem(
-            id="boarding_pass",
-            title="Carte d'embarquement",
-            description="Check-in en ligne recommande pour gagner du temps.",
-            tag="check-in",
-        ),
-        TravelInfoItem(
-            id="baggage",
-            title="Bagages",
-            description="Respecter les limites de poids et dimensions.",
-            tag="bagage",
-        ),
-    ]
-    tips = [
-        TravelInfoItem(
-            id="online_window",
-            title="Fenetre check-in",
-            description="Ouvre 24h avant le depart (selon vol).",
-        ),
-        TravelInfoItem(
-            id="airport_time",
-            title="Arriver tot",
-            description="Prevoir 2h (vol national) ou 3h (international).",
-        ),
-    ]
-    services = [
-        TravelInfoItem(
-            id="fast_track",
-            title="Fast Track",
-            description="Acces prioritaire aux controles de securite.",
-            tag="service",
-        ),
-        TravelInfoItem(
-            id="seat",
-            title="Choisir mon siege",
-            description="Selection de siege selon disponibilite.",
-            tag="confort",
-        ),
-    ]
+def travel_info_response(
+    payload: TravelInfoPayload,
+    booking: Booking | None,
+    if_none_match: str | None,
+) -> Response:
+    if booking is not None:
+        return Response(payload.render(booking), media_type="application/json")
 
-    return TravelInfoResponse(
-        booking_id=booking.id if booking else None,
-        phase="check_in",
-        title="Check-in",
-        subtitle="Finalisez avant le depart : check-in, infos aeroport, fast track.",
-        origin=booking.origin if booking else None,
-        destination=booking.destination if booking else None,
-        depart_date=booking.depart_date if booking else None,
-        checklist=checklist,
-        tips=tips,
-        services=services,
-    )
-
-
-def build_departure_day_response(booking: Booking | None) -> TravelInfoResponse:
-    checklist = [
-        TravelInfoItem(
-            id="gate",
-            title="Porte d'embarquement",
-            description="Verifier l'ecran d'affichage regulierement.",
-            tag="embarquement",
-        ),
-        TravelInfoItem(
-            id="security",
-            title="Controle de securite",
-            description="Prevoir du temps selon l'affluence.",
-            tag="aeroport",
-        ),
-        TravelInfoItem(
-            id="boarding_time",
-            title="Heure d'embarquement",
-            description="Se presenter avant l'heure indiquee.",
-            tag="horaires",
-        ),
-    ]
-    tips = [
-        TravelInfoItem(
-            id="documents",
-            title="Documents a portee",
-            description="Passeport et carte d'embarquement faciles d'acces.",
-        ),
-        TravelInfoItem(
-            id="carry_on",
-            title="Bagage cabine",
-            description="Objets essentiels uniquement pour accelerer le controle.",
-        ),
-    ]
-    services = [
-        TravelInfoItem(
-            id="fast_track",
-            title="Fast Track",
-            description="Option pour reduire l'attente aux controles.",
-            tag="service",
-        ),
-        TravelInfoItem(
-            id="lounge",
-            title="Acces lounge",
-            description="Espace calme avec wifi et rafraichissements.",
-            tag="confort",
-        ),
-    ]
-
-    return TravelInfoResponse(
-        booking_id=booking.id if booking else None,
-        phase="departure_day",
-        title="Jour du depart",
-        subtitle="Derniers rappels : porte d'embarquement, attente, services.",
-        origin=booking.origin if booking else None,
-        destination=booking.destination if booking else None,
-        depart_date=booking.depart_date if booking else None,
-        checklist=checklist,
-        tips=tips,
-        services=services,
-    )
+    # Variante générique : contenu constant => cacheable côté client
+    headers = {
+        "ETag": payload.etag,
+        "Cache-Control": f"private, max-age={settings.STATIC_PAYLOAD_MAX_AGE_S}",
+    }
+    if if_none_match and etag_matches(if_none_match, payload.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(payload.generic, media_type="application/json", headers=headers)
 
 
 @router.get("/check-in", response_model=TravelInfoResponse)
 def check_in_info(
     booking_id: str | None = Query(None),
+    if_none_match: str | None = Header(None),
     user: dict = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     booking = get_booking_or_none(booking_id, user["id"], db)
-    return build_check_in_response(booking)
+    return travel_info_response(CHECK_IN_PAYLOAD, booking, if_none_match)
 
 
 @router.get("/departure-day", response_model=TravelInfoResponse)
 def departure_day_info(
     booking_id: str | None = Query(None),
+    if_none_match: str | None = Header(None),
     user: dict = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     booking = get_booking_or_none(booking_id, user["id"], db)
-    return build_departure_day_response(booking)
+    return travel_info_response(DEPARTURE_DAY_PAYLOAD, booking, if_none_match)
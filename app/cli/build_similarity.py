@@ -0,0 +1,51 @@
+"""
+Construit l'index de similarité item-item à partir de la table feedback.
+
+    python -m app.cli.build_similarity [--out var/similarity/items.simx] [--full]
+
+Incrémental par défaut : seules les villes dont le feedback a changé depuis le
+dernier index sont recalculées. Les workers rechargent le nouveau fichier d'eux-mêmes
+(SIMILARITY_RELOAD_S). Le résumé est écrit en JSON sur stdout.
+"""
+import argparse
+import json
+import sys
+import time
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.item_similarity import build_index
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--out",
+        default=settings.SIMILARITY_INDEX_PATH,
+        help="fichier d'index (défaut: SIMILARITY_INDEX_PATH)",
+    )
+    parser.add_argument("--full", action="store_true", help="recalcule toutes les villes")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        result = build_index(db, args.out, full=args.full)
+    elapsed = time.perf_counter() - started
+
+    summary = {
+        "cities": result.cities,
+        "rebuilt": len(result.rebuilt),
+        "reused": result.reused,
+        "items": result.items,
+        "neighbors": result.neighbors,
+        "bytes": result.bytes,
+        "elapsed_s": round(elapsed, 3),
+    }
+    print(json.dumps(summary))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
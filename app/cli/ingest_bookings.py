@@ -0,0 +1,68 @@
+"""
+Import groupé de réservations depuis un fichier NDJSON (une réservation par ligne).
+
+    python -m app.cli.ingest_bookings bookings.ndjson [--owner guest:abc] [--chunk 500]
+
+Chaque ligne contient les champs de BookingCreate et, sauf --owner, un `owner_id`.
+Le résumé (créées / erreurs) est écrit en JSON sur stdout, le détail des erreurs sur stderr.
+"""
+import argparse
+import json
+import sys
+import time
+from typing import Any, Iterator, TextIO
+
+from app.core.database import SessionLocal
+from app.services.booking_ingest import ingest_bookings
+
+
+def read_rows(stream: TextIO, default_owner: str | None) -> Iterator[tuple[str | None, Any]]:
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            raw = json.loads(line)
+        except json.JSONDecodeError:
+            yield default_owner, line  # rejetée à la validation, avec son index
+            continue
+        owner_id = raw.pop("owner_id", None) if isinstance(raw, dict) else None
+        yield owner_id or default_owner, raw
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("path", help="fichier NDJSON, '-' pour stdin")
+    parser.add_argument("--owner", help="owner_id par défaut (ex: guest:abc123)")
+    parser.add_argument(
+        "--chunk", type=int, default=None, help="lignes par INSERT (défaut: BOOKING_BULK_CHUNK)"
+    )
+    args = parser.parse_args(argv)
+
+    stream = sys.stdin if args.path == "-" else open(args.path, encoding="utf-8")
+    started = time.perf_counter()
+    try:
+        with SessionLocal() as db:
+            result = ingest_bookings(db, read_rows(stream, args.owner), chunk_size=args.chunk)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+    elapsed = time.perf_counter() - started
+
+    for index, detail in result.errors:
+        print(f"row {index}: {detail}", file=sys.stderr)
+    summary = {
+        "rows": len(result.ids),
+        "created": result.created,
+        "errors": len(result.errors),
+        "elapsed_s": round(elapsed, 3),
+        "rows_per_s": round(len(result.ids) / elapsed) if elapsed else None,
+    }
+    print(json.dumps(summary))
+    return 1 if result.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
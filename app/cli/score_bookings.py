@@ -0,0 +1,60 @@
+"""
+Cartes post-booking en lot pour les campagnes CRM, en NDJSON.
+
+    python -m app.cli.score_bookings [--from 2026-10-19] [--to 2026-10-26] [--out cards.ndjson]
+
+Par défaut : réservations au départ dans les BATCH_SCORING_DEFAULT_DAYS prochains jours,
+écrites sur stdout. Le résumé (lignes, débit) est écrit en JSON sur stderr.
+"""
+import argparse
+import json
+import sys
+import time
+from datetime import date, timedelta
+
+from app.core.config import settings
+from app.services.batch_scoring import stream_post_booking_ndjson
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--from", dest="depart_from", type=date.fromisoformat, default=None)
+    parser.add_argument("--to", dest="depart_to", type=date.fromisoformat, default=None)
+    parser.add_argument("--out", default="-", help="fichier NDJSON, '-' pour stdout")
+    parser.add_argument(
+        "--chunk", type=int, default=settings.BATCH_SCORING_CHUNK, help="réservations par requête"
+    )
+    args = parser.parse_args(argv)
+
+    depart_from = args.depart_from or date.today()
+    depart_to = args.depart_to or depart_from + timedelta(days=settings.BATCH_SCORING_DEFAULT_DAYS)
+
+    out = sys.stdout.buffer if args.out == "-" else open(args.out, "wb")
+    started = time.perf_counter()
+    rows = 0
+    try:
+        for block in stream_post_booking_ndjson(depart_from, depart_to, args.chunk):
+            out.write(block)
+            rows += block.count(b"\n")
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+        else:
+            out.flush()
+    elapsed = time.perf_counter() - started
+
+    summary = {
+        "depart_from": depart_from.isoformat(),
+        "depart_to": depart_to.isoformat(),
+        "rows": rows,
+        "elapsed_s": round(elapsed, 3),
+        "rows_per_s": round(rows / elapsed) if elapsed else None,
+    }
+    print(json.dumps(summary), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -9,13 +11,119 @@ class Settings(BaseSettings):
     JWT_SECRET: str = "change_me"
     JWT_ALGO: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MIN: int = 60
+    # Cache des tokens déjà vérifiés (évite HMAC + parsing à chaque requête)
+    JWT_CACHE_SIZE: int = 10_000
+    JWT_NEGATIVE_CACHE_TTL_S: float = 30.0
+
+    # Hash des mots de passe (pbkdf2_sha256) dans un pool de process dédié
+    PASSWORD_HASH_ROUNDS: int = 29000  # changer => rehash transparent au prochain login
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 64  # au-delà => 503
 
     # Database
     DATABASE_URL: str = "sqlite:///./ram_companion.db"
+    # true => `alembic upgrade head` au démarrage si la base est en retard
+    DB_AUTO_MIGRATE: bool = False
+
+    # Pool (PostgreSQL)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_S: float = 10.0
+    DB_POOL_RECYCLE_S: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 5000  # 0 => pas de limite
+
+    # Pragmas SQLite appliqués à chaque connexion
+    SQLITE_WAL: bool = True
+    SQLITE_SYNCHRONOUS: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 128 * 1024 * 1024
 
     # Destination provider
     DEST_PROVIDER: str = "mock"
     PLACES_API_KEY: str = ""
+    PLACES_BASE_URL: str = "https://places.googleapis.com"
+    PLACES_TIMEOUT_S: float = 2.0
+    PLACES_MAX_CONCURRENCY: int = 32
+    PLACES_MAX_CONNECTIONS: int = 64
+    PLACES_MAX_RETRIES: int = 2
+    PLACES_BREAKER_THRESHOLD: int = 5
+    PLACES_BREAKER_RESET_S: float = 30.0
+    # Deadline (secondes) pour l'ensemble des recherches de /destinations/arrival
+    ARRIVAL_TIMEOUT_S: float = 3.0
+
+    # Cache des résultats provider (LRU + TTL + stale-while-revalidate)
+    DEST_CACHE_ENABLED: bool = True
+    DEST_CACHE_MAXSIZE: int = 2048
+    DEST_CACHE_TTL_S: float = 600.0
+    DEST_CACHE_STALE_S: float = 300.0
+
+    # Import groupé de réservations : INSERT multi-lignes par paquets
+    BOOKING_BULK_MAX: int = 5000  # lignes max par requête HTTP
+    BOOKING_BULK_CHUNK: int = 500
+
+    # Feedback envoyé par lots depuis l'app mobile
+    FEEDBACK_BATCH_MAX: int = 500
+    # Write-behind : accusé de réception dès la mise en tampon, écriture groupée ensuite
+    FEEDBACK_WRITE_BEHIND: bool = False
+    FEEDBACK_BUFFER_MAX: int = 10_000  # au-delà : écriture directe (pas de perte)
+    FEEDBACK_FLUSH_SIZE: int = 500
+    FEEDBACK_FLUSH_INTERVAL_S: float = 1.0
+    FEEDBACK_SPILL_DIR: str = "var/feedback-spill"
+    FEEDBACK_SPILL_FSYNC: bool = False  # True : survit aussi à une coupure machine
+
+    # Journal des impressions de recommandations (écrit hors requête, par lots)
+    RECO_LOG_ENABLED: bool = True
+    RECO_LOG_QUEUE_MAX: int = 10_000  # file pleine => impression ignorée (comptée)
+    RECO_LOG_BATCH: int = 500
+    RECO_LOG_FLUSH_INTERVAL_S: float = 2.0
+
+    # Classement des items destination (app/services/ranking.py) : poids du score
+    RANK_W_RATING: float = 1.0
+    RANK_W_DISTANCE: float = 0.001  # par km
+    RANK_W_PRICE: float = 0.0  # par palier d'écart au budget
+    RANK_W_INTEREST: float = 0.5
+    RANK_W_FEEDBACK: float = 100.0
+    RANK_W_POPULARITY: float = 0.05
+    RANK_POPULARITY_TTL_S: float = 300.0  # agrégat likes/dislikes par ville, en cache
+    # Génération de candidats : sur-échantillonnage provider + likes réinjectés
+    RANK_OVERFETCH_FACTOR: int = 3
+    RANK_CANDIDATES_MAX: int = 20  # plafond du provider (Places : 20 résultats max)
+    RANK_LIKED_MAX: int = 10  # likes réinjectés au plus, par catégorie
+    # Similarité item-item (python -m app.cli.build_similarity) : boost des items proches des likes
+    RANK_W_SIMILAR: float = 0.3
+    SIMILARITY_INDEX_PATH: str = "var/similarity/items.simx"
+    SIMILARITY_RELOAD_S: float = 30.0  # fréquence de vérification d'un nouvel index
+    SIMILARITY_TOP_K: int = 20  # voisins gardés par item
+    SIMILARITY_MIN_SUPPORT: int = 2  # utilisateurs communs minimum
+    SIMILARITY_MAX_USER_ITEMS: int = 50  # feedback par utilisateur pris en compte
+
+    # Scoring post-booking en lot (CRM) : flux NDJSON, réservé aux appels avec X-API-Key
+    CRM_API_KEY: str = ""  # vide => endpoint désactivé
+    BATCH_SCORING_CHUNK: int = 5000  # réservations lues par requête SQL
+    BATCH_SCORING_DEFAULT_DAYS: int = 7  # fenêtre de départ par défaut : les 7 prochains jours
+
+    # Billets PDF rendus, en cache mémoire (clé = empreinte des champs imprimés)
+    TICKET_CACHE_SIZE: int = 512
+    TICKET_CACHE_TTL_S: float = 24 * 3600
+    # Export groupé (ZIP) : rendu dans un pool de process
+    TICKET_RENDER_WORKERS: int = 2
+    TICKET_EXPORT_MAX: int = 500  # nombre max de billets par archive
+    # Rendu en tâche de fond : fichiers prêts sur disque, sinon 202 + Retry-After
+    TICKET_JOBS_ENABLED: bool = False
+    TICKET_STORE_DIR: str = "var/tickets"
+    TICKET_JOB_RETRY_AFTER_S: int = 2
+    # Nettoyage du store : fichiers plus vieux que l'âge max, puis les plus anciens au-delà de la taille max
+    TICKET_STORE_MAX_AGE_S: float = 7 * 24 * 3600
+    TICKET_STORE_MAX_MB: int = 512
+    TICKET_STORE_SWEEP_S: float = 600.0  # intervalle minimal entre deux nettoyages
+
+    # Contenus statiques (infos voyage sans booking) : Cache-Control max-age
+    STATIC_PAYLOAD_MAX_AGE_S: int = 3600
+
+    # Préférences de personnalisation en cache par process (le consentement est relu à chaque requête)
+    PROFILE_CACHE_SIZE: int = 10_000
+    PROFILE_CACHE_TTL_S: float = 30.0
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
@@ -1,19 +1,102 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.core.config import settings
 
-connect_args = {"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {}
+is_sqlite = settings.DATABASE_URL.startswith("sqlite")
 
-engine = create_engine(settings.DATABASE_URL, connect_args=connect_args)
+
+def async_database_url(url: str) -> str:
+    """sqlite:// -> sqlite+aiosqlite://, postgresql(+psycopg2):// -> postgresql+asyncpg://"""
+    scheme, sep, rest = url.partition("://")
+    if scheme in ("sqlite", "sqlite+pysqlite"):
+        return f"sqlite+aiosqlite{sep}{rest}"
+    if scheme in ("postgresql", "postgresql+psycopg2", "postgres"):
+        return f"postgresql+asyncpg{sep}{rest}"
+    return url
+
+
+def engine_options(async_driver: bool = False) -> dict:
+    """
+    Profil du moteur selon la base :
+    - SQLite : pas de pool réglable, busy timeout côté driver (pragmas au connect)
+    - PostgreSQL : pool dimensionné, pre-ping, recycle et statement_timeout
+    """
+    if is_sqlite:
+        return {
+            "connect_args": {
+                "check_same_thread": False,
+                "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000,
+            },
+        }
+
+    options: dict = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_S,
+        "pool_recycle": settings.DB_POOL_RECYCLE_S,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if settings.DATABASE_URL.startswith("postgres") and settings.DB_STATEMENT_TIMEOUT_MS:
+        timeout = str(settings.DB_STATEMENT_TIMEOUT_MS)
+        options["connect_args"] = (
+            {"server_settings": {"statement_timeout": timeout}}  # asyncpg
+            if async_driver
+            else {"options": f"-c statement_timeout={timeout}"}  # psycopg2
+        )
+    return options
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL : les lecteurs ne sont plus bloqués par l'écrivain
+    cursor = dbapi_connection.cursor()
+    if settings.SQLITE_WAL:
+        cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    cursor.close()
+
+
+def apply_sqlite_pragmas(sync_engine: Engine) -> None:
+    if is_sqlite:
+        event.listen(sync_engine, "connect", set_sqlite_pragmas)
+
+
+# Moteur sync : endpoints `def` (threadpool), Alembic, check du schéma
+engine = create_engine(settings.DATABASE_URL, **engine_options())
+apply_sqlite_pragmas(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Moteur async (aiosqlite / asyncpg) : endpoints `async def`, sans bloquer la boucle
+async_engine = create_async_engine(
+    async_database_url(settings.DATABASE_URL), **engine_options(async_driver=True)
+)
+apply_sqlite_pragmas(async_engine.sync_engine)
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 Base = declarative_base()
 
 
+def upsert_insert(table):
+    """INSERT du dialecte courant, qui expose on_conflict_do_update / _do_nothing."""
+    return (sqlite.insert if is_sqlite else postgresql.insert)(table)
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
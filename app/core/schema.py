@@ -0,0 +1,64 @@
+import logging
+from pathlib import Path
+from typing import Any
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.database import Base
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_DIR = Path(__file__).resolve().parents[2] / "alembic"
+
+# Résultat du dernier check (exposé par /health)
+schema_status: dict[str, Any] = {"ready": False}
+
+
+class SchemaNotReady(RuntimeError):
+    """La base n'est pas à la révision Alembic attendue : l'app refuse de démarrer."""
+
+
+def alembic_config() -> Config:
+    # Config sans fichier .ini : env.py ne reconfigure pas le logging de l'app
+    cfg = Config()
+    cfg.set_main_option("script_location", str(ALEMBIC_DIR))
+    return cfg
+
+
+def check_schema(engine: Engine) -> dict[str, Any]:
+    """
+    Vérifie une seule fois, au démarrage, que la base est à la tête Alembic et que
+    toutes les tables des modèles existent. Avec DB_AUTO_MIGRATE=true, applique
+    `alembic upgrade head` au lieu d'échouer. Lève SchemaNotReady sinon.
+    """
+    cfg = alembic_config()
+    heads = set(ScriptDirectory.from_config(cfg).get_heads())
+
+    with engine.connect() as conn:
+        current = set(MigrationContext.configure(conn).get_current_heads())
+
+    if current != heads and settings.DB_AUTO_MIGRATE:
+        logger.info("schema at %s, upgrading to %s", sorted(current), sorted(heads))
+        command.upgrade(cfg, "head")
+        with engine.connect() as conn:
+            current = set(MigrationContext.configure(conn).get_current_heads())
+
+    if current != heads:
+        raise SchemaNotReady(
+            f"Database schema at {sorted(current) or 'empty'}, expected {sorted(heads)}: "
+            "run `alembic upgrade head`"
+        )
+
+    existing = set(inspect(engine).get_table_names())
+    missing = sorted(set(Base.metadata.tables) - existing)
+    if missing:
+        raise SchemaNotReady(f"Missing tables: {', '.join(missing)}")
+
+    schema_status.update(ready=True, revision=sorted(current))
+    return schema_status
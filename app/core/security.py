@@ -1,11 +1,25 @@
+import asyncio
+import hashlib
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from typing import Any, Optional
 
-from jose import jwt
+from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.core.config import settings
+from app.utils.cache import ExpiringLRUCache
 
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["pbkdf2_sha256"],
+    deprecated="auto",
+    pbkdf2_sha256__rounds=settings.PASSWORD_HASH_ROUNDS,
+)
+
+# digest(token) -> claims vérifiés, ou _INVALID pour un token refusé (cache négatif)
+_INVALID = object()
+token_cache: ExpiringLRUCache = ExpiringLRUCache(maxsize=settings.JWT_CACHE_SIZE)
 
 
 def create_access_token(subject: str, payload: Optional[dict[str, Any]] = None) -> str:
@@ -37,9 +51,91 @@ def decode_token(token: str) -> dict[str, Any]:
     return jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGO])
 
 
+def decode_token_cached(token: str) -> dict[str, Any]:
+    """
+    Comme decode_token, mais mémorise les tokens déjà vérifiés jusqu'à leur `exp`
+    (clé = sha256 du token) et les tokens invalides pendant JWT_NEGATIVE_CACHE_TTL_S.
+    Retourne une copie des claims : l'entrée en cache n'est jamais modifiée.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    cached = token_cache.get(key)
+    if cached is _INVALID:
+        raise JWTError("Invalid token (cached)")
+    if cached is not None:
+        return dict(cached)
+
+    try:
+        payload = decode_token(token)
+    except JWTError:
+        token_cache.set(key, _INVALID, time.time() + settings.JWT_NEGATIVE_CACHE_TTL_S)
+        raise
+
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        token_cache.set(key, payload, float(exp))
+    return dict(payload)
+
+
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
 
 def verify_password(password: str, hashed_password: str) -> bool:
     return pwd_context.verify(password, hashed_password)
+
+
+class PasswordHasherBusy(Exception):
+    """Trop de hash/vérifications en attente : on refuse plutôt que d'empiler."""
+
+
+_hash_pool: ProcessPoolExecutor | None = None
+_hash_pending = 0
+
+
+def _get_hash_pool() -> ProcessPoolExecutor:
+    global _hash_pool
+    if _hash_pool is None:
+        _hash_pool = ProcessPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _hash_pool
+
+
+def shutdown_hash_pool() -> None:
+    global _hash_pool
+    if _hash_pool is not None:
+        _hash_pool.shutdown(wait=False, cancel_futures=True)
+        _hash_pool = None
+
+
+def _verify_and_update(password: str, hashed_password: str) -> tuple[bool, str | None]:
+    return pwd_context.verify_and_update(password, hashed_password)
+
+
+async def _run_in_hash_pool(fn, *args):
+    """
+    Exécute fn dans le pool de process sans occuper un thread du threadpool FastAPI.
+    File d'attente bornée à PASSWORD_HASH_MAX_PENDING (compteur de la boucle asyncio).
+    """
+    global _hash_pending
+    if _hash_pending >= settings.PASSWORD_HASH_MAX_PENDING:
+        raise PasswordHasherBusy()
+    _hash_pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_hash_pool(), fn, *args)
+    finally:
+        _hash_pending -= 1
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_in_hash_pool(hash_password, password)
+
+
+async def verify_password_async(password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """
+    Vérifie le mot de passe. Retourne (ok, new_hash) : new_hash est non-None si le
+    hash stocké utilise un ancien coût (PASSWORD_HASH_ROUNDS a changé) et doit être remplacé.
+    """
+    return await _run_in_hash_pool(_verify_and_update, password, hashed_password)
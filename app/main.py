@@ -1,9 +1,42 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1.feedback import router as feedback_router
 
 from app.core.config import settings
+from app.core.database import async_engine, engine
+from app.core.schema import check_schema
+from app.core.security import shutdown_hash_pool
 from app.api.v1.router import router as v1_router
+from app.services.destination_service import (
+    close_destination_provider,
+    get_destination_provider,
+)
+from app.services.feedback_buffer import feedback_buffer
+from app.services.reco_log_service import reco_log_writer
+from app.services.ticket_service import shutdown_render_pool
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Schéma vérifié une fois ici (plus d'introspection par requête) ; lève si en retard
+    app.state.schema = check_schema(engine)
+    # Provider (et son pool HTTP) créé une fois au démarrage, fermé à l'arrêt
+    get_destination_provider()
+    if settings.RECO_LOG_ENABLED:
+        reco_log_writer.start()
+    if settings.FEEDBACK_WRITE_BEHIND:
+        # rejoue d'abord les segments d'un arrêt brutal, puis lance le flusher
+        feedback_buffer.start()
+    yield
+    if settings.FEEDBACK_WRITE_BEHIND:
+        feedback_buffer.stop()
+    await reco_log_writer.stop()
+    await close_destination_provider()
+    shutdown_hash_pool()
+    shutdown_render_pool()
+    await async_engine.dispose()
 
 
 def create_app() -> FastAPI:
@@ -11,6 +44,7 @@ def create_app() -> FastAPI:
         title=settings.APP_NAME,
         version="0.1.0",
         description="Backend API for RAM Companion (MVP).",
+        lifespan=lifespan,
     )
 
     # CORS: pour que le frontend (plus tard) puisse appeler l'API
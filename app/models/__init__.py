@@ -3,3 +3,4 @@ from app.models.consent import Consent  # noqa: F401
 from app.models.feedback import Feedback  # noqa: F401
 from app.models.preference import Preference  # noqa: F401
 from app.models.user import User  # noqa: F401
+from app.models.reco_log import RecoLog  # noqa: F401
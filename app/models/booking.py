@@ -1,5 +1,5 @@
 from datetime import datetime, date
-from sqlalchemy import String, Date, DateTime
+from sqlalchemy import String, Date, DateTime, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.database import Base
@@ -29,3 +29,12 @@ class Booking(Base):
     email: Mapped[str | None] = mapped_column(String(120), nullable=True)
 
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        # Liste "mes voyages" : filtre owner + pagination keyset (depart_date, id).
+        # Index non couvrant : les colonnes du résumé sont lues dans la table
+        # (limit + 1 lignes par page), mais ni tri ni parcours hors de l'owner
+        Index("ix_bookings_owner_depart", "owner_id", "depart_date", "id"),
+        # Scoring en lot (CRM) : fenêtre de départ, pagination keyset (depart_date, id)
+        Index("ix_bookings_depart", "depart_date", "id"),
+    )
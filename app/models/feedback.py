@@ -14,6 +14,8 @@ class Feedback(Base):
     action = Column(String, nullable=False)                  # like/dislike
 
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # dernière écriture (upsert compris) : sert aux reconstructions incrémentales de l'index de similarité
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=True)
 
     __table_args__ = (
         UniqueConstraint("user_id", "item_id", name="uq_feedback_user_item"),
@@ -0,0 +1,27 @@
+from datetime import datetime
+from sqlalchemy import String, DateTime, Float, Integer, JSON
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class RecoLog(Base):
+    """Une ligne par réponse de recommandation affichée (impressions)."""
+
+    __tablename__ = "reco_logs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+
+    user_id: Mapped[str] = mapped_column(String(120), index=True)
+    booking_id: Mapped[str | None] = mapped_column(String(36), nullable=True)
+
+    # post_booking / destination / arrival
+    surface: Mapped[str] = mapped_column(String(20))
+    city: Mapped[str | None] = mapped_column(String(80), nullable=True)
+    category: Mapped[str | None] = mapped_column(String(20), nullable=True)
+
+    # [{"id": ..., "rank": 0, "score": ..., "category": ...}] dans l'ordre affiché
+    items: Mapped[list] = mapped_column(JSON)
+    latency_ms: Mapped[float] = mapped_column(Float)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
@@ -3,6 +3,17 @@ from typing import Optional
 
 from app.schemas.destination import DestinationItem
 
+# Niveaux de prix acceptés par budget (partagé par les providers et le ranking)
+BUDGET_MAP = {
+    "low": {"€"},
+    "mid": {"€", "€€"},
+    "high": {"€€", "€€€"},
+}
+
+
+class ProviderUnavailable(Exception):
+    """Le provider externe est indisponible (timeouts, erreurs, circuit ouvert)."""
+
 
 class DestinationProvider(ABC):
     @abstractmethod
@@ -14,3 +25,14 @@ class DestinationProvider(ABC):
         limit: int = 10,
     ) -> list[DestinationItem]:
         raise NotImplementedError
+
+    async def lookup(self, city: str, category: str, item_ids: list[str]) -> list[DestinationItem]:
+        """
+        Items connus par leur id (ex: likes de l'utilisateur hors du top renvoyé
+        par search). Par défaut : aucun, l'appelant s'en passe.
+        """
+        return []
+
+    async def aclose(self) -> None:
+        """Libère les ressources (clients HTTP, etc.). Rien à faire par défaut."""
+        return None
@@ -0,0 +1,72 @@
+from typing import Optional
+
+from app.providers.base import BUDGET_MAP, DestinationProvider
+from app.schemas.destination import DestinationItem
+from app.utils.cache import AsyncTTLCache
+
+# On interroge toujours le provider avec ce plafond (>= limites max des endpoints)
+# pour qu'une seule entrée de cache serve toutes les valeurs de `limit`.
+FETCH_LIMIT = 20
+
+
+class CachedDestinationProvider(DestinationProvider):
+    """
+    Enveloppe n'importe quel DestinationProvider avec un AsyncTTLCache
+    clé = (city, category, budget) normalisés.
+    """
+
+    def __init__(
+        self,
+        inner: DestinationProvider,
+        maxsize: int = 2048,
+        ttl: float = 600.0,
+        stale_ttl: float = 300.0,
+    ):
+        self.inner = inner
+        self.cache: AsyncTTLCache[list[DestinationItem]] = AsyncTTLCache(
+            maxsize=maxsize, ttl=ttl, stale_ttl=stale_ttl
+        )
+
+    async def search(
+        self,
+        city: str,
+        category: str,
+        budget: Optional[str] = None,
+        limit: int = 10,
+    ) -> list[DestinationItem]:
+        city_key = city.strip().lower()
+        category_key = category.strip().lower()
+        budget_key = budget.strip().lower() if budget else None
+        key = (city_key, category_key, budget_key)
+        fetch_limit = max(limit, FETCH_LIMIT)
+
+        async def load() -> list[DestinationItem]:
+            return await self.inner.search(
+                city=city_key.title(),
+                category=category_key,
+                budget=budget_key,
+                limit=fetch_limit,
+            )
+
+        items = await self.cache.get_or_load(key, load)
+        return items[:limit]
+
+    async def lookup(self, city: str, category: str, item_ids: list[str]) -> list[DestinationItem]:
+        # D'abord les résultats déjà en cache pour la ville (tous budgets), puis le provider
+        city_key = city.strip().lower()
+        category_key = category.strip().lower()
+        wanted = set(item_ids)
+        found: dict[str, DestinationItem] = {}
+        for budget_key in (None, *BUDGET_MAP):
+            for x in self.cache.peek((city_key, category_key, budget_key)) or ():
+                if x.id in wanted:
+                    found.setdefault(x.id, x)
+        missing = [i for i in item_ids if i not in found]
+        if missing:
+            for x in await self.inner.lookup(city_key.title(), category_key, missing):
+                found.setdefault(x.id, x)
+        return [found[i] for i in item_ids if i in found]
+
+    async def aclose(self) -> None:
+        self.cache.clear()
+        await self.inner.aclose()
@@ -1,6 +1,7 @@
-import random
-from typing import Optional
-from app.providers.base import DestinationProvider
+import zlib
+from functools import lru_cache
+from typing import NamedTuple, Optional
+from app.providers.base import BUDGET_MAP, DestinationProvider
 from app.schemas.destination import DestinationItem
 
 # Quelques templates de données réalistes (MVP) — enrichi
@@ -77,14 +78,110 @@ MOCK_DB = {
     ],
 }
 
-# Mapping budget — plus réaliste et plus agréable en UX
-BUDGET_MAP = {
-    "low": {"€"},
-    "mid": {"€", "€€"},
-    "high": {"€€", "€€€"},
+# Liens externes réalistes selon la catégorie ({city} = slug de la ville)
+LINK_TEMPLATES = {
+    "hotel": "https://www.booking.com/hotel/{city}/{item}.html",
+    "restaurant": "https://www.tripadvisor.com/Restaurant_Review-{city}-{item}.html",
+    "activity": "https://www.getyourguide.com/{city}/{item}-t123456",
+    "transport": "https://www.rome2rio.com/s/{city}/{item}",
 }
 
 
+def item_slug(name: str) -> str:
+    return name.lower().replace(' ', '-').replace('é', 'e').replace('è', 'e').replace('ô', 'o')
+
+
+def city_slug(city: str) -> str:
+    return city.lower().replace(' ', '-').replace('é', 'e').replace('è', 'e')
+
+
+class CatalogEntry(NamedTuple):
+    name: str
+    address: str
+    price: str
+    id_suffix: str  # "<nom>" normalisé pour l'id / l'image
+    link_template: str | None  # lien avec {city} restant à remplir
+
+
+def compile_catalog() -> dict[tuple[str, str | None], tuple[CatalogEntry, ...]]:
+    """
+    Compile MOCK_DB une seule fois : un index immuable par (catégorie, budget),
+    budget=None => toutes les entrées de la catégorie.
+    """
+    index: dict[tuple[str, str | None], tuple[CatalogEntry, ...]] = {}
+    for category, rows in MOCK_DB.items():
+        template = LINK_TEMPLATES.get(category)
+        entries = tuple(
+            CatalogEntry(
+                name=name,
+                address=address,
+                price=price,
+                id_suffix=name.lower().replace(' ', '_'),
+                link_template=(
+                    template.replace("{item}", item_slug(name)) if template else None
+                ),
+            )
+            for name, address, price in rows
+        )
+        index[(category, None)] = entries
+        for budget, allowed in BUDGET_MAP.items():
+            index[(category, budget)] = tuple(e for e in entries if e.price in allowed)
+    return index
+
+
+CATALOG_INDEX = compile_catalog()
+
+
+class CityEntry(NamedTuple):
+    id: str
+    name: str
+    price: str
+    address: str
+    image_url: str
+    link: str | None
+    distance_km: float
+    rating: float
+
+
+def mock_metrics(item_key: str) -> tuple[float, float]:
+    """
+    Distance (0.3–6.5 km) et note (3.6–4.9) fictives, dérivées de l'id : un même
+    item a les mêmes valeurs dans search et lookup, d'un appel à l'autre.
+    """
+    h = zlib.crc32(item_key.encode())
+    distance_km = round(0.3 + (h % 1000) / 999 * 6.2, 1)
+    rating = round(3.6 + (h // 1000 % 1000) / 999 * 1.3, 1)
+    return distance_km, rating
+
+
+@lru_cache(maxsize=1024)
+def city_entries(category: str, budget: str | None, city: str) -> tuple[CityEntry, ...]:
+    """
+    Champs statiques (id, nom, adresse, liens, distance, note) d'un index pour
+    une ville donnée, calculés une fois par (catégorie, budget, ville) et triés
+    pour l'UX : proches d'abord, puis meilleure note.
+    """
+    c_slug = city_slug(city)
+    prefix = f"{category}_{city.lower().replace(' ', '_')}_"
+    entries = []
+    for entry in CATALOG_INDEX.get((category, budget), ()):
+        item_key = prefix + entry.id_suffix
+        distance_km, rating = mock_metrics(item_key)
+        entries.append(
+            CityEntry(
+                id=item_key,
+                name=f"{entry.name} — {city}",
+                price=entry.price,
+                address=f"{entry.address}, {city}",
+                image_url=f"https://picsum.photos/seed/{item_key}/400/250",
+                link=entry.link_template.replace("{city}", c_slug) if entry.link_template else None,
+                distance_km=distance_km,
+                rating=rating,
+            )
+        )
+    entries.sort(key=lambda e: (e.distance_km, -e.rating))
+    return tuple(entries)
+
 
 class MockDestinationProvider(DestinationProvider):
     async def search(
@@ -95,62 +192,35 @@ class MockDestinationProvider(DestinationProvider):
         limit: int = 10,
     ) -> list[DestinationItem]:
         category = category.lower().strip()
+        budget = budget.lower().strip() if budget else None
+        if budget not in BUDGET_MAP:
+            budget = None  # budget absent/inconnu => pas de filtre
 
-        if category not in MOCK_DB:
+        if (category, budget) not in CATALOG_INDEX:
             return []
+        # entrées déjà triées : on ne construit les DestinationItem que pour le top `limit`
+        return [mock_item(entry, category) for entry in city_entries(category, budget, city)[:limit]]
 
-        candidates = MOCK_DB[category]
-
-        # Filtre budget
-        if budget:
-            budget = budget.lower().strip()
-            allowed = BUDGET_MAP.get(budget)
-            if allowed:
-                candidates = [c for c in candidates if c[2] in allowed]
-
-        # Génération d'items "uniques" et réalistes
-        items: list[DestinationItem] = []
-        random.shuffle(candidates)
-
-        for i, (name, address, price) in enumerate(candidates):
-
-            rating = round(random.uniform(3.6, 4.9), 1)
-            distance_km = round(random.uniform(0.3, 6.5), 1)
-            
-            # Génération de liens externes réalistes selon la catégorie
-            item_slug = name.lower().replace(' ', '-').replace('é', 'e').replace('è', 'e').replace('ô', 'o')
-            city_slug = city.lower().replace(' ', '-').replace('é', 'e').replace('è', 'e')
-            
-            if category == "hotel":
-                external_link = f"https://www.booking.com/hotel/{city_slug}/{item_slug}.html"
-            elif category == "restaurant":
-                external_link = f"https://www.tripadvisor.com/Restaurant_Review-{city_slug}-{item_slug}.html"
-            elif category == "activity":
-                external_link = f"https://www.getyourguide.com/{city_slug}/{item_slug}-t123456"
-            elif category == "transport":
-                external_link = f"https://www.rome2rio.com/s/{city_slug}/{item_slug}"
-            else:
-                external_link = None
-
-            items.append(
-                DestinationItem(
-                    id=f"{category}_{city.lower().replace(' ', '_')}_{name.lower().replace(' ', '_')}",
-                    category=category,
-                    name=f"{name} — {city}",
-                    rating=rating,
-                    price_level=price,
-                    distance_km=distance_km,
-                    address=f"{address}, {city}",
-                    image_url=(
-                        f"https://picsum.photos/seed/"
-                        f"{category}_{city.lower().replace(' ', '_')}_"
-                        f"{name.lower().replace(' ', '_')}/400/250"
-                    ),
-                    source="mock",
-                    link=external_link,
-                )
-            )
-
-        # Tri utile UX: proches d'abord, puis meilleure note
-        items.sort(key=lambda x: (x.distance_km, -x.rating))
-        return items[:limit]
+    async def lookup(self, city: str, category: str, item_ids: list[str]) -> list[DestinationItem]:
+        category = category.lower().strip()
+        wanted = set(item_ids)
+        return [
+            mock_item(entry, category)
+            for entry in city_entries(category, None, city)
+            if entry.id in wanted
+        ]
+
+
+def mock_item(entry: CityEntry, category: str) -> DestinationItem:
+    return DestinationItem(
+        id=entry.id,
+        category=category,
+        name=entry.name,
+        rating=entry.rating,
+        price_level=entry.price,
+        distance_km=entry.distance_km,
+        address=entry.address,
+        image_url=entry.image_url,
+        source="mock",
+        link=entry.link,
+    )
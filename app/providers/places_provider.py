@@ -0,0 +1,243 @@
+import asyncio
+import logging
+import math
+import random
+import time
+from typing import Any, Optional
+
+import httpx
+
+from app.providers.base import BUDGET_MAP, DestinationProvider, ProviderUnavailable
+from app.schemas.destination import DestinationItem
+
+logger = logging.getLogger(__name__)
+
+PLACES_SEARCH_PATH = "/v1/places:searchText"
+PLACES_FIELD_MASK = ",".join(
+    [
+        "places.id",
+        "places.displayName",
+        "places.formattedAddress",
+        "places.rating",
+        "places.priceLevel",
+        "places.location",
+        "places.googleMapsUri",
+    ]
+)
+
+# Requête texte envoyée à Places pour chaque catégorie
+CATEGORY_QUERIES = {
+    "hotel": "hotels in {city}",
+    "restaurant": "restaurants in {city}",
+    "activity": "tourist attractions in {city}",
+    "transport": "public transport stations in {city}",
+}
+
+# priceLevel Places -> notre échelle € / €€ / €€€
+PRICE_LEVELS = {
+    "PRICE_LEVEL_FREE": "€",
+    "PRICE_LEVEL_INEXPENSIVE": "€",
+    "PRICE_LEVEL_MODERATE": "€€",
+    "PRICE_LEVEL_EXPENSIVE": "€€€",
+    "PRICE_LEVEL_VERY_EXPENSIVE": "€€€",
+}
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class CircuitBreaker:
+    """
+    Disjoncteur simple :
+    - closed : on laisse passer, on compte les échecs consécutifs
+    - open : après `failure_threshold` échecs, on refuse pendant `reset_timeout` secondes
+    - half-open : ensuite un seul appel d'essai ; succès => closed, échec => open
+      (un essai resté sans réponse, ex. annulé, est relancé après `reset_timeout`)
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._trial_started_at: float | None = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open":
+            now = time.monotonic()
+            if self._trial_started_at is None or now - self._trial_started_at >= self.reset_timeout:
+                self._trial_started_at = now
+                return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._trial_started_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_started_at = None
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    r = 6371.0
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp = p2 - p1
+    dl = math.radians(lng2 - lng1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * r * math.asin(math.sqrt(a))
+
+
+class PlacesDestinationProvider(DestinationProvider):
+    """
+    Provider Google Places (API "Text Search", v1).
+    Un seul httpx.AsyncClient (pool + keep-alive) pour toute la durée de vie de l'app,
+    concurrence bornée, timeouts, retries avec jitter et circuit breaker.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = "https://places.googleapis.com",
+        timeout: float = 2.0,
+        max_concurrency: int = 32,
+        max_connections: int = 64,
+        max_retries: int = 2,
+        backoff_base: float = 0.1,
+        breaker: CircuitBreaker | None = None,
+        client: httpx.AsyncClient | None = None,
+    ):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.breaker = breaker or CircuitBreaker()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._client = client or httpx.AsyncClient(
+            base_url=base_url,
+            timeout=httpx.Timeout(timeout),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=30.0,
+            ),
+            headers={
+                "X-Goog-Api-Key": api_key,
+                "X-Goog-FieldMask": PLACES_FIELD_MASK,
+            },
+        )
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def search(
+        self,
+        city: str,
+        category: str,
+        budget: Optional[str] = None,
+        limit: int = 10,
+    ) -> list[DestinationItem]:
+        category = category.lower().strip()
+        query = CATEGORY_QUERIES.get(category)
+        if query is None:
+            return []
+
+        body = {
+            "textQuery": query.format(city=city),
+            "maxResultCount": min(limit, 20),
+        }
+        data = await self._post(PLACES_SEARCH_PATH, body)
+        items = self._to_items(data.get("places", []), city=city, category=category)
+
+        allowed = BUDGET_MAP.get(budget.lower().strip()) if budget else None
+        if allowed:
+            items = [x for x in items if x.price_level in allowed]
+
+        # Tri utile UX: proches d'abord, puis meilleure note
+        items.sort(key=lambda x: (x.distance_km, -x.rating))
+        return items[:limit]
+
+    async def _post(self, path: str, body: dict[str, Any]) -> dict[str, Any]:
+        if not self.breaker.allow():
+            raise ProviderUnavailable("places: circuit open")
+
+        last_error: Exception | None = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                # backoff exponentiel avec "full jitter"
+                await asyncio.sleep(random.uniform(0, self.backoff_base * (2 ** attempt)))
+            try:
+                async with self._semaphore:
+                    resp = await self._client.post(path, json=body)
+            except httpx.TransportError as exc:
+                last_error = exc
+                continue
+
+            if resp.status_code in RETRY_STATUSES:
+                last_error = ProviderUnavailable(f"places: HTTP {resp.status_code}")
+                continue
+            if resp.status_code >= 400:
+                # 4xx (clé invalide, requête refusée) : inutile de réessayer
+                last_error = ProviderUnavailable(f"places: HTTP {resp.status_code}")
+                break
+
+            try:
+                data = resp.json()
+            except ValueError as exc:
+                last_error = exc
+                break
+            self.breaker.record_success()
+            return data
+
+        self.breaker.record_failure()
+        logger.warning("places request failed (state=%s): %r", self.breaker.state, last_error)
+        raise ProviderUnavailable(str(last_error)) from last_error
+
+    @staticmethod
+    def _to_items(places: list[dict], city: str, category: str) -> list[DestinationItem]:
+        # Pas de position utilisateur : distance mesurée depuis le barycentre des résultats
+        coords = [
+            (p["location"]["latitude"], p["location"]["longitude"])
+            for p in places
+            if p.get("location")
+        ]
+        center = (
+            (sum(c[0] for c in coords) / len(coords), sum(c[1] for c in coords) / len(coords))
+            if coords else None
+        )
+
+        city_id = city.lower().replace(' ', '_')
+        items: list[DestinationItem] = []
+        for p in places:
+            loc = p.get("location")
+            distance_km = (
+                round(haversine_km(center[0], center[1], loc["latitude"], loc["longitude"]), 1)
+                if center and loc else 0.0
+            )
+            rating = min(max(float(p.get("rating") or 0.0), 0.0), 5.0)
+            items.append(
+                DestinationItem(
+                    id=f"{category}_{city_id}_{p['id']}",
+                    category=category,
+                    name=(p.get("displayName") or {}).get("text", ""),
+                    rating=rating,
+                    price_level=PRICE_LEVELS.get(p.get("priceLevel", ""), "€€"),
+                    distance_km=distance_km,
+                    address=p.get("formattedAddress", city),
+                    image_url=None,  # les photos Places exigent la clé API : pas exposées au client
+                    source="places",
+                    link=p.get("googleMapsUri"),
+                )
+            )
+        return items
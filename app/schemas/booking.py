@@ -35,3 +35,22 @@ class BookingOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class TicketExportRequest(BaseModel):
+    # Soit une liste d'ids, soit des filtres (appliqués aux réservations de l'utilisateur)
+    booking_ids: list[str] | None = Field(None, min_length=1)
+    depart_from: date | None = None
+    depart_to: date | None = None
+    destination: str | None = None
+
+
+class BulkRowError(BaseModel):
+    index: int
+    detail: str
+
+
+class BulkBookingResult(BaseModel):
+    created: int
+    ids: list[str | None]  # même ordre que l'entrée, None pour une ligne rejetée
+    errors: list[BulkRowError]
@@ -1,6 +1,8 @@
 from pydantic import BaseModel, Field
 from typing import Literal
 
+from app.schemas.booking import BulkRowError
+
 class FeedbackCreate(BaseModel):
     item_id: str | None = Field(None, min_length=3)
     category: Literal["hotel", "restaurant", "activity", "transport"]
@@ -14,3 +16,11 @@ class FeedbackOut(BaseModel):
     category: str
     city: str
     action: str
+
+class FeedbackBatch(BaseModel):
+    events: list[FeedbackCreate] = Field(..., min_length=1)
+
+class FeedbackBatchResult(BaseModel):
+    applied: int  # lignes écrites (après dédoublonnage par item)
+    items: list[FeedbackOut]
+    errors: list[BulkRowError]
@@ -24,3 +24,19 @@ class TimelineResponse(BaseModel):
     status: str  # current phase
     dates: TimelineDates
     steps: list[TimelineStep]
+
+
+class TripSummary(BaseModel):
+    booking_id: str
+    origin: str
+    destination: str
+    trip_type: str
+    cabin: str
+    depart_date: date
+    return_date: date | None
+    status: str  # phase courante (compute_phase)
+
+
+class TripListResponse(BaseModel):
+    items: list[TripSummary]
+    next_cursor: str | None  # à renvoyer tel quel pour la page suivante
@@ -0,0 +1,151 @@
+"""
+Scoring post-booking en lot (campagnes CRM).
+
+Même résultat que compute_scores + build_post_booking_cards, mais par colonnes :
+les réservations sont lues par paquets (pagination keyset sur depart_date, id),
+trip_type / churn_risk / motif sont calculés avec NumPy sur tout le paquet, et
+chaque ligne NDJSON réutilise le JSON pré-rendu de sa combinaison
+(trip_type, churn_risk, motif, cabine eco) : au plus 54 combinaisons, dont les
+cartes sont construites une fois par build_post_booking_cards.
+"""
+from dataclasses import dataclass
+from datetime import date
+from typing import Iterator, NamedTuple, Sequence
+
+import numpy as np
+import orjson
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.booking import Booking
+from app.services.recommender import build_post_booking_cards
+from app.services.scoring import ScoreSummary, infer_motive_prob
+
+TRIP_TYPES = ("short", "medium", "long")
+CHURN_RISKS = ("low", "medium", "high")
+AGE_BUCKETS = (None, "30_60", "under_30")  # "under_30" : même motif que "over_60"
+MOTIVES = tuple(infer_motive_prob(bucket) for bucket in AGE_BUCKETS)
+SHORT, MEDIUM, LONG = range(3)
+
+
+class BookingColumns(NamedTuple):
+    ids: list[str]
+    owners: list[str]
+    depart: np.ndarray  # datetime64[D]
+    ret: np.ndarray  # datetime64[D], NaT si aller simple
+    cabin: list[str]
+
+
+def score_columns(
+    depart: np.ndarray,
+    ret: np.ndarray,
+    cabin: Sequence[str],
+    age_bucket: Sequence[str | None] | None = None,
+    loyalty: Sequence[str | None] | None = None,
+) -> np.ndarray:
+    """
+    Code de combinaison par réservation :
+    ((trip_type * 3 + churn_risk) * 3 + motif) * 2 + cabine eco.
+    Mêmes règles que app.services.scoring.
+    """
+    n = depart.shape[0]
+    duration = np.abs((ret - depart).astype("timedelta64[D]").astype(np.int64))
+    trip = np.where(duration <= 3, SHORT, np.where(duration <= 10, MEDIUM, LONG))
+    trip[np.isnat(ret)] = MEDIUM  # pas de retour => "medium"
+
+    # cabine : comparaison sur les valeurs distinctes (quelques-unes), pas ligne à ligne
+    cabins, cabin_idx = np.unique(np.asarray(cabin, dtype=object), return_inverse=True)
+    economy = np.array([c.lower() == "economy" for c in cabins], dtype=bool)[cabin_idx]
+
+    churn_score = 2 * economy + (trip == LONG)
+    if loyalty is not None:
+        churn_score += 2 * (np.asarray(loyalty, dtype=object) == "disloyal")
+    churn = np.where(churn_score >= 4, 2, np.where(churn_score >= 2, 1, 0))
+
+    motive = np.zeros(n, dtype=np.int64)
+    if age_bucket is not None:
+        buckets = np.asarray(age_bucket, dtype=object)
+        motive[buckets == "30_60"] = 1
+        motive[(buckets != None) & (buckets != "30_60")] = 2  # noqa: E711 (comparaison par élément)
+
+    return ((trip * 3 + churn) * 3 + motive) * 2 + economy
+
+
+@dataclass(frozen=True)
+class Combination:
+    summary: ScoreSummary
+    cards: list[dict]
+    json: bytes  # '"summary":{...},"cards":[...]'
+
+
+def decode_combination(code: int) -> Combination:
+    rest, economy = divmod(code, 2)
+    rest, motive = divmod(rest, 3)
+    trip, churn = divmod(rest, 3)
+    summary = ScoreSummary(
+        trip_type=TRIP_TYPES[trip],
+        churn_risk=CHURN_RISKS[churn],
+        motive_prob=MOTIVES[motive],
+    )
+    cards = build_post_booking_cards(summary, cabin="economy" if economy else "")
+    body = orjson.dumps({"summary": summary.__dict__, "cards": cards})
+    return Combination(summary=summary, cards=cards, json=body[1:-1])
+
+
+class CombinationCache(dict):
+    def __missing__(self, code: int) -> Combination:
+        combination = self[code] = decode_combination(code)
+        return combination
+
+
+combinations = CombinationCache()
+
+
+def iter_booking_chunks(
+    db: Session, depart_from: date, depart_to: date, chunk_size: int
+) -> Iterator[BookingColumns]:
+    """Réservations au départ dans [depart_from, depart_to], par paquets (keyset)."""
+    cursor = None
+    while True:
+        stmt = select(
+            Booking.id, Booking.owner_id, Booking.depart_date, Booking.return_date, Booking.cabin
+        ).where(Booking.depart_date.between(depart_from, depart_to))
+        if cursor is not None:
+            stmt = stmt.where(tuple_(Booking.depart_date, Booking.id) > cursor)
+        rows = db.execute(stmt.order_by(Booking.depart_date, Booking.id).limit(chunk_size)).all()
+        if not rows:
+            return
+        ids, owners, departs, returns, cabins = zip(*rows)
+        yield BookingColumns(
+            ids=list(ids),
+            owners=list(owners),
+            depart=np.array(departs, dtype="datetime64[D]"),
+            ret=np.array(returns, dtype="datetime64[D]"),
+            cabin=list(cabins),
+        )
+        if len(rows) < chunk_size:
+            return
+        cursor = (departs[-1], ids[-1])
+
+
+def render_chunk(chunk: BookingColumns) -> bytes:
+    codes = score_columns(chunk.depart, chunk.ret, chunk.cabin).tolist()
+    dumps = orjson.dumps
+    return b"".join(
+        b'{"booking_id":%s,"owner_id":%s,%s}\n'
+        % (dumps(booking_id), dumps(owner_id), combinations[code].json)
+        for booking_id, owner_id, code in zip(chunk.ids, chunk.owners, codes)
+    )
+
+
+def stream_post_booking_ndjson(
+    depart_from: date, depart_to: date, chunk_size: int
+) -> Iterator[bytes]:
+    """
+    Une ligne NDJSON par réservation, un bloc d'octets par paquet.
+    Session dédiée : le flux survit à la fin du handler HTTP.
+    """
+    with SessionLocal() as db:
+        for chunk in iter_booking_chunks(db, depart_from, depart_to, chunk_size):
+            yield render_chunk(chunk)
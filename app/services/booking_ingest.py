@@ -0,0 +1,144 @@
+"""
+Import groupé de réservations (synchro groupes, reprise depuis le système de résa).
+
+Par paquet de BOOKING_BULK_CHUNK lignes : un INSERT multi-lignes pour les bookings,
+un upsert pour les consentements, un commit. Une ligne invalide ou refusée par la
+base est signalée (index + détail) sans faire échouer le reste du lot.
+"""
+import logging
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Iterable
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import upsert_insert
+from app.models.booking import Booking
+from app.models.consent import Consent
+from app.schemas.booking import BookingCreate
+from app.services.profile_service import invalidate_profile
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IngestResult:
+    ids: list[str | None] = field(default_factory=list)
+    errors: list[tuple[int, str]] = field(default_factory=list)
+
+    @property
+    def created(self) -> int:
+        return sum(1 for i in self.ids if i is not None)
+
+
+def validate_row(raw: Any) -> BookingCreate:
+    if not isinstance(raw, dict):
+        raise ValueError("row must be a JSON object")
+    payload = BookingCreate.model_validate(raw)
+    # Même règle que create_booking
+    if payload.trip_type == "oneway" and payload.return_date is not None:
+        raise ValueError("return_date must be null for oneway trips")
+    return payload
+
+
+def _error_detail(exc: Exception) -> str:
+    if isinstance(exc, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" if err["loc"] else err["msg"]
+            for err in exc.errors()
+        )
+    return str(exc)
+
+
+def _booking_values(owner_id: str, payload: BookingCreate) -> dict[str, Any]:
+    return {
+        "id": str(uuid.uuid4()),
+        "owner_id": owner_id,
+        **payload.model_dump(include={
+            "origin", "destination", "trip_type", "cabin", "depart_date", "return_date",
+            "first_name", "last_name", "birth_date", "email",
+        }),
+    }
+
+
+def _enable_consents(db: Session, owner_ids: set[str]) -> None:
+    # Réserver active les recommandations (cf. create_booking) : une requête par paquet
+    stmt = upsert_insert(Consent).values(
+        [{"user_id": owner_id, "destination_recos_enabled": True} for owner_id in owner_ids]
+    )
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[Consent.user_id],
+            set_={"destination_recos_enabled": True, "updated_at": datetime.utcnow()},
+            where=Consent.destination_recos_enabled.is_(False),
+        )
+    )
+
+
+def _write_chunk(db: Session, rows: list[tuple[int, dict[str, Any]]]) -> None:
+    try:
+        db.execute(insert(Booking), [values for _, values in rows])
+        _enable_consents(db, {values["owner_id"] for _, values in rows})
+        db.commit()
+    except SQLAlchemyError:
+        db.rollback()
+        raise
+
+
+def _insert_chunk(db: Session, rows: list[tuple[int, dict[str, Any]]], result: IngestResult) -> None:
+    try:
+        _write_chunk(db, rows)
+        written = rows
+    except SQLAlchemyError:
+        # Paquet refusé : on rejoue ligne par ligne pour isoler les fautives
+        logger.warning("bulk booking chunk failed, retrying %d rows one by one", len(rows))
+        written = []
+        for row in rows:
+            try:
+                _write_chunk(db, [row])
+                written.append(row)
+            except SQLAlchemyError as exc:
+                result.errors.append((row[0], f"database error: {exc.__class__.__name__}"))
+
+    for index, values in written:
+        result.ids[index] = values["id"]
+    for owner_id in {values["owner_id"] for _, values in written}:
+        invalidate_profile(owner_id)
+
+
+def ingest_bookings(
+    db: Session,
+    rows: Iterable[tuple[str | None, Any]],
+    chunk_size: int | None = None,
+) -> IngestResult:
+    """
+    `rows` : couples (owner_id, payload brut ou BookingCreate), dans l'ordre d'entrée.
+    """
+    chunk_size = chunk_size or settings.BOOKING_BULK_CHUNK
+    result = IngestResult()
+    chunk: list[tuple[int, dict[str, Any]]] = []
+
+    for index, (owner_id, raw) in enumerate(rows):
+        result.ids.append(None)
+        try:
+            payload = raw if isinstance(raw, BookingCreate) else validate_row(raw)
+        except (ValidationError, ValueError) as exc:
+            result.errors.append((index, _error_detail(exc)))
+            continue
+        if not owner_id:
+            result.errors.append((index, "owner_id is required"))
+            continue
+        chunk.append((index, _booking_values(owner_id, payload)))
+        if len(chunk) >= chunk_size:
+            _insert_chunk(db, chunk, result)
+            chunk = []
+
+    if chunk:
+        _insert_chunk(db, chunk, result)
+    result.errors.sort()
+    return result
@@ -0,0 +1,106 @@
+"""
+Génération de candidats avant classement.
+
+Le provider est interrogé avec une marge (`limit * RANK_OVERFETCH_FACTOR`,
+plafonnée), les items dislikés sont retirés et les items likés absents des
+résultats sont réinjectés via provider.lookup. Le classement (ranking) ne
+garde ensuite que le top `limit`.
+"""
+import threading
+import time
+from collections import deque
+from typing import Any
+
+from app.core.config import settings
+from app.providers.base import BUDGET_MAP, DestinationProvider
+from app.schemas.destination import DestinationItem
+
+
+def overfetch_limit(limit: int) -> int:
+    return max(limit, min(limit * settings.RANK_OVERFETCH_FACTOR, settings.RANK_CANDIDATES_MAX))
+
+
+class CandidateStats:
+    """Coût de l'étape (durée, items ajoutés / retirés), exposé sur /health/ranking."""
+
+    def __init__(self, latency_window: int = 1000):
+        self._lock = threading.Lock()
+        self._durations: deque[float] = deque(maxlen=latency_window)
+        self.requests = 0
+        self.fetched = 0
+        self.injected = 0
+        self.dropped = 0
+
+    def record(self, fetched: int, injected: int, dropped: int, duration: float) -> None:
+        with self._lock:
+            self.requests += 1
+            self.fetched += fetched
+            self.injected += injected
+            self.dropped += dropped
+            self._durations.append(duration)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "overfetch_factor": settings.RANK_OVERFETCH_FACTOR,
+                "max_candidates": settings.RANK_CANDIDATES_MAX,
+                "requests": self.requests,
+                "fetched": self.fetched,
+                "injected_likes": self.injected,
+                "dropped_dislikes": self.dropped,
+                "duration_ms": _percentiles(sorted(self._durations)),
+            }
+
+
+def _percentiles(sorted_values: list[float]) -> dict[str, float] | None:
+    if not sorted_values:
+        return None
+
+    def pick(q: float) -> float:
+        return round(sorted_values[min(int(q * len(sorted_values)), len(sorted_values) - 1)] * 1000, 2)
+
+    return {"p50": pick(0.5), "p95": pick(0.95), "max": pick(1.0)}
+
+
+candidate_stats = CandidateStats()
+
+
+async def build_candidates(
+    provider: DestinationProvider,
+    city: str,
+    category: str,
+    items: list[DestinationItem],
+    feedback: dict[str, str],
+    budget: str | None = None,
+    started_at: float | None = None,
+) -> list[DestinationItem]:
+    """
+    `items` : résultats (sur-échantillonnés) de provider.search.
+    `started_at` : début de la recherche provider, pour mesurer tout l'étage.
+    """
+    started_at = started_at if started_at is not None else time.perf_counter()
+    kept = [x for x in items if feedback.get(x.id) != "dislike"]
+
+    present = {x.id for x in kept}
+    liked = [
+        item_id
+        for item_id, action in feedback.items()
+        if action == "like" and item_id not in present
+    ][: settings.RANK_LIKED_MAX]
+
+    injected: list[DestinationItem] = []
+    if liked:
+        allowed = BUDGET_MAP.get(budget) if budget else None
+        injected = [
+            x
+            for x in await provider.lookup(city, category, liked)
+            if allowed is None or x.price_level in allowed
+        ]
+
+    candidate_stats.record(
+        fetched=len(items),
+        injected=len(injected),
+        dropped=len(items) - len(kept),
+        duration=time.perf_counter() - started_at,
+    )
+    return kept + injected
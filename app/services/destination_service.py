@@ -1,15 +1,71 @@
+import logging
+
 from app.core.config import settings
 from app.providers.mock_provider import MockDestinationProvider
 from app.providers.base import DestinationProvider
+from app.providers.cached_provider import CachedDestinationProvider
+from app.providers.places_provider import CircuitBreaker, PlacesDestinationProvider
+
+logger = logging.getLogger(__name__)
+
+_provider: DestinationProvider | None = None
+
+
+def build_destination_provider() -> DestinationProvider:
+    """
+    Provider choisi via .env :
+    - DEST_PROVIDER=places + PLACES_API_KEY => Google Places
+    - sinon => mock
+    """
+    if settings.DEST_PROVIDER == "places" and settings.PLACES_API_KEY:
+        provider: DestinationProvider = PlacesDestinationProvider(
+            api_key=settings.PLACES_API_KEY,
+            base_url=settings.PLACES_BASE_URL,
+            timeout=settings.PLACES_TIMEOUT_S,
+            max_concurrency=settings.PLACES_MAX_CONCURRENCY,
+            max_connections=settings.PLACES_MAX_CONNECTIONS,
+            max_retries=settings.PLACES_MAX_RETRIES,
+            breaker=CircuitBreaker(
+                failure_threshold=settings.PLACES_BREAKER_THRESHOLD,
+                reset_timeout=settings.PLACES_BREAKER_RESET_S,
+            ),
+        )
+    else:
+        if settings.DEST_PROVIDER == "places":
+            logger.warning("DEST_PROVIDER=places but PLACES_API_KEY is empty: using mock provider")
+        # fallback sécurisé
+        provider = MockDestinationProvider()
+
+    if settings.DEST_CACHE_ENABLED:
+        provider = CachedDestinationProvider(
+            provider,
+            maxsize=settings.DEST_CACHE_MAXSIZE,
+            ttl=settings.DEST_CACHE_TTL_S,
+            stale_ttl=settings.DEST_CACHE_STALE_S,
+        )
+    return provider
 
 
 def get_destination_provider() -> DestinationProvider:
     """
-    MVP: provider choisi via .env (DEST_PROVIDER=mock).
-    Plus tard: places/amadeus/etc.
+    Provider partagé par tout le process (un seul cache, un seul pool HTTP).
     """
-    if settings.DEST_PROVIDER == "mock":
-        return MockDestinationProvider()
+    global _provider
+    if _provider is None:
+        _provider = build_destination_provider()
+    return _provider
+
+
+async def close_destination_provider() -> None:
+    """Appelé au shutdown de l'app : ferme le client HTTP du provider."""
+    global _provider
+    if _provider is not None:
+        await _provider.aclose()
+        _provider = None
+
 
-    # fallback sécurisé
-    return MockDestinationProvider()
+def get_destination_cache_stats() -> dict | None:
+    provider = get_destination_provider()
+    if isinstance(provider, CachedDestinationProvider):
+        return provider.cache.stats()
+    return None
@@ -0,0 +1,340 @@
+"""
+Tampon write-behind pour le feedback (like/dislike/clicked).
+
+- L'évènement est acquitté dès qu'il est dans le tampon (borné) et journalisé dans
+  un segment NDJSON local : un crash du process ne perd rien, les segments sont
+  rejoués au démarrage.
+- Coalescence par (user_id, item_id) : seul le dernier évènement est écrit.
+- Un thread vide le tampon par lots (FEEDBACK_FLUSH_SIZE ou FEEDBACK_FLUSH_INTERVAL_S)
+  avec l'upsert natif ; l'arrêt de l'app force un dernier flush.
+- Tampon plein : écriture directe, sérialisée avec les flushs (un lot en cours
+  ne peut pas écraser un évènement plus récent).
+- Les lectures (destinations) superposent le feedback en attente de l'utilisateur,
+  y compris le lot en cours d'écriture. Le tampon est propre à chaque worker : la
+  superposition ne couvre que le feedback reçu par ce process.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, TextIO
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.feedback_service import upsert_feedback_rows, write_feedback_rows
+
+try:
+    import fcntl
+except ImportError:  # Windows : pas de verrou inter-process sur les segments
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+Row = dict[str, Any]
+
+
+class FeedbackBufferFull(Exception):
+    """Tampon plein : l'appelant écrit directement en base."""
+
+
+class FeedbackBuffer:
+    def __init__(
+        self,
+        write_rows: Callable[[list[Row]], None],
+        spill_dir: str,
+        max_size: int = 10_000,
+        flush_size: int = 500,
+        flush_interval: float = 1.0,
+        fsync: bool = False,
+    ):
+        self._write_rows = write_rows
+        self.spill_dir = Path(spill_dir)
+        self.max_size = max_size
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # un seul flush à la fois
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread: threading.Thread | None = None
+
+        # user_id -> item_id -> ligne (dernier évènement)
+        self._pending: dict[str, dict[str, Row]] = {}
+        self._size = 0
+        # lot sorti de _pending mais pas encore commité : toujours visible en lecture
+        self._inflight: dict[str, dict[str, Row]] = {}
+        self._segment: TextIO | None = None
+        self._segment_path: Path | None = None
+        # segments fermés à l'écriture mais pas encore en base (gardés ouverts = verrouillés)
+        self._closed_segments: list[tuple[Path, TextIO]] = []
+        self._seq = 0
+
+        self.accepted = 0
+        self.coalesced = 0
+        self.flushed = 0
+        self.flushes = 0
+        self.failures = 0
+
+    # --- cycle de vie -------------------------------------------------------
+
+    def start(self) -> None:
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        self._replay_spill()
+        with self._lock:
+            self._open_segment()
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="feedback-flusher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+        with self._lock:
+            if self._segment is not None:
+                # flush réussi => segment vide, sinon il sera rejoué au prochain démarrage
+                if self._size == 0 and self._segment_path is not None:
+                    self._segment_path.unlink(missing_ok=True)
+                self._segment.close()
+                self._segment = None
+            for _, handle in self._closed_segments:
+                handle.close()
+            self._closed_segments = []
+
+    # --- écriture -------------------------------------------------------------
+
+    def add(self, row: Row) -> None:
+        with self._lock:
+            if self._segment is None:
+                raise FeedbackBufferFull("feedback buffer not started")
+            user_items = self._pending.setdefault(row["user_id"], {})
+            if row["item_id"] in user_items:
+                self.coalesced += 1
+            elif self._size >= self.max_size:
+                raise FeedbackBufferFull()
+            else:
+                self._size += 1
+            # journal avant acquittement
+            self._segment.write(json.dumps(row, ensure_ascii=False) + "\n")
+            self._segment.flush()
+            if self.fsync:
+                os.fsync(self._segment.fileno())
+            user_items[row["item_id"]] = row
+            self.accepted += 1
+            full = self._size >= self.flush_size
+        if full:
+            self._wakeup.set()
+
+    def flush(self) -> int:
+        """Écrit tout le tampon en base ; en cas d'échec les lignes y sont remises."""
+        with self._flush_lock:
+            with self._lock:
+                if self._size == 0:
+                    return 0
+                batch = self._pending
+                self._inflight = batch
+                self._pending = {}
+                self._size = 0
+                # nouveau segment : celui-ci ne couvre plus que le lot en cours
+                self._rotate_segment()
+                segments = list(self._closed_segments)
+
+            rows = [row for items in batch.values() for row in items.values()]
+            try:
+                for start in range(0, len(rows), self.flush_size):
+                    self._write_rows(rows[start:start + self.flush_size])
+            except Exception:
+                logger.exception("feedback flush failed, %d rows kept in buffer", len(rows))
+                self._restore(batch)
+                with self._lock:
+                    self.failures += 1
+                return 0
+
+            for path, handle in segments:
+                path.unlink(missing_ok=True)
+                handle.close()
+            with self._lock:
+                self._inflight = {}
+                self._closed_segments = [s for s in self._closed_segments if s not in segments]
+                self.flushed += len(rows)
+                self.flushes += 1
+            return len(rows)
+
+    def write_through(self, rows: list[Row], write: Callable[[list[Row]], None]) -> None:
+        """
+        Écriture directe (tampon plein) sans être écrasée par un évènement plus
+        ancien du tampon : aucun flush en cours pendant l'écriture, et les lignes
+        en attente pour les mêmes (user_id, item_id) sont abandonnées.
+        """
+        with self._flush_lock:
+            # flush exclu : _inflight est vide, seul _pending peut contenir un ancien évènement
+            with self._lock:
+                stale = {
+                    (row["user_id"], row["item_id"]): self._pending.get(row["user_id"], {}).get(row["item_id"])
+                    for row in rows
+                }
+                # journalisé après l'ancien : au rejeu, le plus récent l'emporte
+                if self._segment is not None:
+                    for row in rows:
+                        self._segment.write(json.dumps(row, ensure_ascii=False) + "\n")
+                    self._segment.flush()
+            write(rows)
+            with self._lock:
+                for (user_id, item_id), old in stale.items():
+                    user_items = self._pending.get(user_id)
+                    # un évènement arrivé pendant l'écriture est plus récent : gardé
+                    if old is not None and user_items is not None and user_items.get(item_id) is old:
+                        del user_items[item_id]
+                        self._size -= 1
+                        if not user_items:
+                            del self._pending[user_id]
+
+    # --- lecture ----------------------------------------------------------------
+
+    def pending_for(self, user_id: str) -> list[Row]:
+        """Feedback de l'utilisateur pas encore commité (lot en cours d'écriture compris)."""
+        with self._lock:
+            # l'évènement en attente, plus récent, l'emporte sur celui du lot en cours
+            rows = {**self._inflight.get(user_id, {}), **self._pending.get(user_id, {})}
+            return list(rows.values())
+
+    def overlay(self, user_id: str, city: str, fb_by_cat: dict[str, dict[str, str]]) -> None:
+        """
+        Superpose le feedback en attente de l'utilisateur sur celui lu en base
+        ({catégorie: {item_id: action}}, pour une ville). Ne couvre que le
+        tampon de ce worker.
+        """
+        for row in self.pending_for(user_id):
+            matches = row["city"] == city and row["category"] in fb_by_cat
+            for cat, items in fb_by_cat.items():
+                if matches and cat == row["category"]:
+                    items[row["item_id"]] = row["action"]
+                else:
+                    # la ligne en base va changer de ville/catégorie
+                    items.pop(row["item_id"], None)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": settings.FEEDBACK_WRITE_BEHIND,
+                "pending": self._size,
+                "inflight": sum(len(items) for items in self._inflight.values()),
+                "max_size": self.max_size,
+                "accepted": self.accepted,
+                "coalesced": self.coalesced,
+                "flushed": self.flushed,
+                "flushes": self.flushes,
+                "failures": self.failures,
+                "spill_segments": len(self._closed_segments) + (1 if self._segment else 0),
+            }
+
+    # --- interne --------------------------------------------------------------
+
+    def _run(self) -> None:
+        while not self._stopping:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            if self._stopping:
+                break
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("feedback flusher error")
+
+    def _restore(self, batch: dict[str, dict[str, Row]]) -> None:
+        with self._lock:
+            self._inflight = {}
+            for user_id, items in batch.items():
+                user_items = self._pending.setdefault(user_id, {})
+                for item_id, row in items.items():
+                    # un évènement plus récent arrivé entre-temps l'emporte
+                    if item_id not in user_items:
+                        user_items[item_id] = row
+                        self._size += 1
+
+    def _open_segment(self) -> None:
+        self._seq += 1
+        name = f"feedback-{time.time_ns()}-{os.getpid()}-{self._seq}.ndjson"
+        self._segment_path = self.spill_dir / name
+        self._segment = open(self._segment_path, "a", encoding="utf-8")
+        # verrou tenu tant que le segment n'est pas en base : un autre worker
+        # qui démarre ne le rejoue pas
+        if fcntl is not None:
+            fcntl.flock(self._segment.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    def _rotate_segment(self) -> None:
+        if self._segment is not None:
+            self._segment.flush()
+            self._closed_segments.append((self._segment_path, self._segment))
+        self._open_segment()
+
+    @staticmethod
+    def _is_locked(handle: TextIO) -> bool:
+        if fcntl is None:
+            return False
+        try:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            return True
+        return False
+
+    def _replay_spill(self) -> None:
+        # Segments laissés par un arrêt brutal : rejoués dans l'ordre, coalescés
+        # (segments encore verrouillés par un autre worker vivant : ignorés)
+        latest: dict[tuple[str, str], Row] = {}
+        replayed: list[tuple[Path, TextIO]] = []
+        try:
+            for path in sorted(self.spill_dir.glob("feedback-*.ndjson")):
+                handle = open(path, encoding="utf-8")
+                if self._is_locked(handle):
+                    handle.close()
+                    continue
+                replayed.append((path, handle))
+                for line in handle:
+                    try:
+                        row = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # dernière ligne tronquée
+                    latest.pop((row["user_id"], row["item_id"]), None)
+                    latest[(row["user_id"], row["item_id"])] = row
+            rows = list(latest.values())
+            for start in range(0, len(rows), self.flush_size):
+                self._write_rows(rows[start:start + self.flush_size])
+            for path, _ in replayed:
+                path.unlink()
+        finally:
+            for _, handle in replayed:
+                handle.close()
+        if replayed:
+            logger.info("replayed %d feedback rows from %d spill segments", len(rows), len(replayed))
+
+
+feedback_buffer = FeedbackBuffer(
+    write_rows=write_feedback_rows,
+    spill_dir=settings.FEEDBACK_SPILL_DIR,
+    max_size=settings.FEEDBACK_BUFFER_MAX,
+    flush_size=settings.FEEDBACK_FLUSH_SIZE,
+    flush_interval=settings.FEEDBACK_FLUSH_INTERVAL_S,
+    fsync=settings.FEEDBACK_SPILL_FSYNC,
+)
+
+
+def record_feedback(db: Session, rows: list[Row]) -> None:
+    """Tampon si le write-behind est actif, sinon (ou tampon plein) upsert immédiat."""
+    if settings.FEEDBACK_WRITE_BEHIND:
+        for i, row in enumerate(rows):
+            try:
+                feedback_buffer.add(row)
+            except FeedbackBufferFull:
+                feedback_buffer.write_through(rows[i:], lambda batch: upsert_feedback_rows(db, batch))
+                return
+        return
+    upsert_feedback_rows(db, rows)
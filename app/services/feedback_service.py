@@ -0,0 +1,28 @@
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal, upsert_insert
+from app.models.feedback import Feedback
+
+
+def upsert_feedback_rows(db: Session, rows: list[dict]) -> None:
+    # Un seul INSERT ... ON CONFLICT (user_id, item_id) DO UPDATE : pas de course
+    # SELECT-puis-INSERT sur uq_feedback_user_item
+    stmt = upsert_insert(Feedback).values(rows)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[Feedback.user_id, Feedback.item_id],
+            set_={
+                "action": stmt.excluded.action,
+                "category": stmt.excluded.category,
+                "city": stmt.excluded.city,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+    )
+    db.commit()
+
+
+def write_feedback_rows(rows: list[dict]) -> None:
+    """Écriture hors requête (flush du tampon write-behind) : session dédiée."""
+    with SessionLocal() as db:
+        upsert_feedback_rows(db, rows)
@@ -0,0 +1,450 @@
+"""
+Similarité item-item (filtrage collaboratif) construite hors ligne depuis `feedback`.
+
+Par ville, chaque like/dislike est une note +1/-1 (les autres actions, ex.
+"clicked", ne sont pas des notes) ; la similarité entre deux items est le
+cosinus de leurs vecteurs de notes (utilisateurs communs), gardée si au moins
+`min_support` utilisateurs ont noté les deux. On conserve les
+`top_k` voisins de chaque item.
+
+L'index est un seul fichier (écrit par app.cli.build_similarity) :
+
+    MAGIC (8 o) | longueur de l'en-tête (uint32) | en-tête JSON | tableaux alignés
+
+Les tableaux sont lus par mmap (np.frombuffer) : chargement quasi instantané,
+pages partagées par tous les workers via le cache du système.
+    ids     S{w}   ids des items, triés (recherche par np.searchsorted)
+    city    int32  ville de chaque item (indice dans header["cities"])
+    indptr  int64  voisins de l'item i : nbr/sim[indptr[i]:indptr[i + 1]]
+    nbr     int32  indice du voisin dans ids
+    sim     float32
+"""
+import json
+import logging
+import mmap
+import os
+import struct
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterable, NamedTuple
+
+import numpy as np
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.feedback import Feedback
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"SIMX\x01\x00\x00\x00"
+ALIGN = 64
+FORMAT_VERSION = 1
+
+# feedback "génériques" (cf. resolve_feedback) : pas des items recommandables
+SYNTHETIC_PREFIXES = ("booking:", "city:")
+
+PAIR_CHUNK = 2_000_000  # paires générées par paquet
+
+
+class CityNeighbors(NamedTuple):
+    """Voisinage d'une ville, indices locaux (CSR)."""
+
+    ids: np.ndarray  # S{w}
+    indptr: np.ndarray  # int64
+    nbr: np.ndarray  # int32
+    sim: np.ndarray  # float32
+
+
+def city_neighbors(
+    user_ids: np.ndarray,
+    item_ids: np.ndarray,
+    ratings: np.ndarray,
+    top_k: int,
+    min_support: int,
+    max_user_items: int,
+) -> CityNeighbors:
+    """
+    Cosinus item-item sur les notes +1/-1 d'une ville. Les paires sont générées
+    par utilisateur, vectorisées par taille de panier (au plus `max_user_items`
+    items par utilisateur), puis agrégées par clé i * n + j.
+    """
+    items, item_idx = np.unique(item_ids, return_inverse=True)
+    _, user_idx = np.unique(user_ids, return_inverse=True)
+    n = items.shape[0]
+
+    order = np.argsort(user_idx, kind="stable")
+    it = item_idx[order]
+    r = ratings[order].astype(np.float32)
+    starts = np.flatnonzero(np.r_[True, np.diff(user_idx[order]) != 0])
+    sizes = np.minimum(np.diff(np.r_[starts, it.shape[0]]), max_user_items)
+
+    # paires (i, j) par paquets bornés, réduites au fil de l'eau : mémoire ~ paires distinctes
+    partials: list[tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+    for k in np.unique(sizes[sizes >= 2]):
+        a, b = np.triu_indices(k, 1)
+        user_starts = starts[sizes == k]
+        step = max(1, PAIR_CHUNK // a.shape[0])
+        for chunk in range(0, user_starts.shape[0], step):
+            block = user_starts[chunk : chunk + step, None] + np.arange(k)
+            i, j = it[block[:, a]].ravel(), it[block[:, b]].ravel()
+            w = (r[block[:, a]] * r[block[:, b]]).ravel()
+            partials.append(
+                _reduce_pairs(
+                    np.concatenate([i.astype(np.int64) * n + j, j.astype(np.int64) * n + i]),
+                    np.concatenate([w, w]),
+                    None,
+                )
+            )
+
+    if not partials:
+        empty = np.zeros(0, dtype=np.int32)
+        return CityNeighbors(items[:0], np.zeros(1, dtype=np.int64), empty, empty.astype(np.float32))
+
+    pair, dot, support = _reduce_pairs(*(np.concatenate(parts) for parts in zip(*partials)))
+    norm = np.bincount(item_idx, minlength=n).astype(np.float64)
+    row, col = pair // n, pair % n
+    sim = dot / np.sqrt(norm[row] * norm[col])
+
+    keep = (support >= min_support) & (sim > 0)
+    row, col, sim = row[keep], col[keep], sim[keep]
+
+    # top_k voisins par ligne : tri (ligne, -sim), puis rang dans la ligne
+    order = np.lexsort((-sim, row))
+    row, col, sim = row[order], col[order], sim[order]
+    first = np.searchsorted(row, row, side="left")
+    keep = np.arange(row.shape[0]) - first < top_k
+    row, col, sim = row[keep], col[keep], sim[keep]
+
+    # seuls les items ayant au moins un voisin sont indexés (ensemble clos : sim symétrique)
+    used = np.unique(row)
+    remap = np.full(n, -1, dtype=np.int64)
+    remap[used] = np.arange(used.shape[0])
+    indptr = np.zeros(used.shape[0] + 1, dtype=np.int64)
+    np.cumsum(np.bincount(remap[row], minlength=used.shape[0]), out=indptr[1:])
+    return CityNeighbors(
+        ids=items[used],
+        indptr=indptr,
+        nbr=remap[col].astype(np.int32),
+        sim=sim.astype(np.float32),
+    )
+
+
+def _gather(starts: np.ndarray, lens: np.ndarray) -> np.ndarray:
+    """Positions concaténées des segments [start, start + len) (sans boucle Python)."""
+    total = int(lens.sum())
+    first = np.cumsum(lens) - lens
+    return np.repeat(starts - first, lens) + np.arange(total)
+
+
+def _reduce_pairs(
+    keys: np.ndarray, weights: np.ndarray, counts: np.ndarray | None
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Agrège par clé : (clés uniques, somme des poids, nombre d'utilisateurs)."""
+    unique, inverse = np.unique(keys, return_inverse=True)
+    total = np.bincount(inverse, weights=weights)
+    support = np.bincount(inverse, weights=counts) if counts is not None else np.bincount(inverse)
+    return unique, total, support.astype(np.int64)
+
+
+class SimilarityIndex:
+    """Index chargé (tableaux en lecture seule sur le mmap du fichier)."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            stat = os.fstat(f.fileno())
+        self.identity = (stat.st_ino, stat.st_mtime_ns)
+
+        if self._mm[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"{self.path}: not a similarity index")
+        (header_len,) = struct.unpack_from("<I", self._mm, len(MAGIC))
+        start = len(MAGIC) + 4
+        self.header: dict[str, Any] = json.loads(self._mm[start : start + header_len])
+        self.cities: list[str] = self.header["cities"]
+
+        arrays = {}
+        for name, (offset, dtype, count) in self.header["arrays"].items():
+            arrays[name] = np.frombuffer(self._mm, dtype=np.dtype(dtype), count=count, offset=offset)
+        self.ids: np.ndarray = arrays["ids"]
+        self.city: np.ndarray = arrays["city"]
+        self.indptr: np.ndarray = arrays["indptr"]
+        self.nbr: np.ndarray = arrays["nbr"]
+        self.sim: np.ndarray = arrays["sim"]
+
+    def __len__(self) -> int:
+        return self.ids.shape[0]
+
+    def rows(self, item_ids: Iterable[str]) -> np.ndarray:
+        """Lignes des items présents dans l'index (les autres sont ignorés)."""
+        width = self.ids.dtype.itemsize
+        probes = np.array(
+            [x.encode() for x in item_ids if len(x.encode()) <= width], dtype=self.ids.dtype
+        )
+        if not probes.shape[0] or not len(self):
+            return np.zeros(0, dtype=np.intp)
+        pos = np.minimum(np.searchsorted(self.ids, probes), len(self) - 1)
+        return pos[self.ids[pos] == probes]
+
+    def similar_to(self, liked: Iterable[str]) -> dict[str, float]:
+        """
+        Score de chaque voisin des items likés : somme des similarités
+        (un item proche de plusieurs likes compte davantage).
+        """
+        rows = self.rows(liked)
+        if not rows.shape[0]:
+            return {}
+        pos = _gather(self.indptr[rows], self.indptr[rows + 1] - self.indptr[rows])
+        nbr, inverse = np.unique(self.nbr[pos], return_inverse=True)
+        totals = np.bincount(inverse, weights=self.sim[pos])
+        return {
+            item.decode(): float(score) for item, score in zip(self.ids[nbr], totals)
+        }
+
+    def city_neighbors(self, city: str) -> CityNeighbors | None:
+        """Voisinage d'une ville en indices locaux (réutilisé par les reconstructions)."""
+        try:
+            code = self.cities.index(city)
+        except ValueError:
+            return None
+        rows = np.flatnonzero(self.city == code)
+        local = np.full(len(self), -1, dtype=np.int64)
+        local[rows] = np.arange(rows.shape[0])
+        starts, ends = self.indptr[rows], self.indptr[rows + 1]
+        indptr = np.zeros(rows.shape[0] + 1, dtype=np.int64)
+        np.cumsum(ends - starts, out=indptr[1:])
+        pos = _gather(starts, ends - starts)
+        return CityNeighbors(
+            ids=np.array(self.ids[rows]),
+            indptr=indptr,
+            nbr=local[self.nbr[pos]].astype(np.int32),
+            sim=np.array(self.sim[pos]),
+        )
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "path": str(self.path),
+            "built_at": self.header["built_at"],
+            "cities": len(self.cities),
+            "items": len(self),
+            "neighbors": int(self.nbr.shape[0]),
+            "bytes": len(self._mm),
+        }
+
+
+def write_index(
+    path: str | Path,
+    by_city: dict[str, CityNeighbors],
+    fingerprints: dict[str, list],
+    params: dict[str, Any],
+) -> int:
+    """Fusionne les villes, trie les ids et écrit le fichier (tmp + rename atomique)."""
+    cities = sorted(by_city)
+    parts = [by_city[c] for c in cities]
+    width = max([p.ids.dtype.itemsize for p in parts if p.ids.shape[0]] or [1])
+
+    ids = np.concatenate([p.ids.astype(f"S{width}") for p in parts] or [np.zeros(0, f"S{width}")])
+    city = np.concatenate(
+        [np.full(p.ids.shape[0], code, dtype=np.int32) for code, p in enumerate(parts)]
+        or [np.zeros(0, np.int32)]
+    )
+    item_offsets = np.cumsum([0] + [p.ids.shape[0] for p in parts])
+    nbr_offsets = np.cumsum([0] + [p.nbr.shape[0] for p in parts])
+    lens = np.concatenate([np.diff(p.indptr) for p in parts] or [np.zeros(0, np.int64)])
+    seg_starts = np.concatenate(
+        [p.indptr[:-1] + off for p, off in zip(parts, nbr_offsets)] or [np.zeros(0, np.int64)]
+    )
+    nbr = np.concatenate(
+        [p.nbr.astype(np.int64) + off for p, off in zip(parts, item_offsets)]
+        or [np.zeros(0, np.int64)]
+    )
+    sim = np.concatenate([p.sim for p in parts] or [np.zeros(0, np.float32)])
+
+    # tri global des ids (recherche binaire au service), lignes et voisins renumérotés
+    order = np.argsort(ids, kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(order.shape[0])
+    indptr = np.zeros(order.shape[0] + 1, dtype=np.int64)
+    np.cumsum(lens[order], out=indptr[1:])
+    pos = _gather(seg_starts[order], lens[order])
+    arrays = {
+        "ids": ids[order],
+        "city": city[order],
+        "indptr": indptr,
+        "nbr": rank[nbr[pos]].astype(np.int32),
+        "sim": sim[pos].astype(np.float32),
+    }
+
+    header: dict[str, Any] = {
+        "version": FORMAT_VERSION,
+        "built_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "params": params,
+        "cities": cities,
+        "fingerprints": {c: fingerprints[c] for c in cities},
+        "arrays": {},
+    }
+    # offsets dépendants de la taille de l'en-tête : on réserve large puis on complète
+    header_len = len(json.dumps(header)) + 256 * len(arrays)
+    offset = _align(len(MAGIC) + 4 + header_len)
+    for name, arr in arrays.items():
+        header["arrays"][name] = [offset, arr.dtype.str, int(arr.shape[0])]
+        offset = _align(offset + arr.nbytes)
+    raw_header = json.dumps(header).encode().ljust(header_len)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(MAGIC + struct.pack("<I", header_len) + raw_header)
+        for name, arr in arrays.items():
+            f.write(b"\0" * (header["arrays"][name][0] - f.tell()))
+            f.write(arr.tobytes())
+        size = f.tell()
+    os.replace(tmp, path)
+    return size
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGN - 1) // ALIGN * ALIGN
+
+
+class BuildResult(NamedTuple):
+    cities: int
+    rebuilt: list[str]
+    reused: int
+    items: int
+    neighbors: int
+    bytes: int
+
+
+def build_index(db: Session, path: str | Path, full: bool = False) -> BuildResult:
+    """
+    Reconstruit l'index. Incrémental par défaut : seules les villes dont
+    l'empreinte (nombre de feedback, dernière écriture) a changé sont recalculées,
+    les autres sont reprises telles quelles de l'index existant.
+    """
+    params = {
+        "top_k": settings.SIMILARITY_TOP_K,
+        "min_support": settings.SIMILARITY_MIN_SUPPORT,
+        "max_user_items": settings.SIMILARITY_MAX_USER_ITEMS,
+    }
+    # seuls like / dislike sont des notes ; "clicked" (et autres actions) est ignoré
+    recommendable = Feedback.action.in_(("like", "dislike")) & ~or_(
+        *(Feedback.item_id.startswith(p) for p in SYNTHETIC_PREFIXES)
+    )
+    last_write = func.max(func.coalesce(Feedback.updated_at, Feedback.created_at))
+    fingerprints = {
+        city: [count, str(last)]
+        for city, count, last in db.execute(
+            select(Feedback.city, func.count(), last_write)
+            .where(recommendable)
+            .group_by(Feedback.city)
+        )
+    }
+
+    previous = None
+    if not full and Path(path).exists():
+        try:
+            previous = SimilarityIndex(path)
+        except (OSError, ValueError) as exc:
+            logger.warning("similarity index unreadable, full rebuild: %r", exc)
+        if previous is not None and previous.header.get("params") != params:
+            previous = None
+
+    by_city: dict[str, CityNeighbors] = {}
+    rebuilt: list[str] = []
+    for city, fingerprint in fingerprints.items():
+        if previous is not None and previous.header["fingerprints"].get(city) == fingerprint:
+            reused = previous.city_neighbors(city)
+            if reused is not None:
+                by_city[city] = reused
+                continue
+        rows = db.execute(
+            select(Feedback.user_id, Feedback.item_id, Feedback.action).where(
+                Feedback.city == city, recommendable
+            )
+        ).all()
+        users, items, actions = zip(*rows)
+        by_city[city] = city_neighbors(
+            np.array(users, dtype=object).astype(str),
+            np.array([x.encode() for x in items]),
+            np.where(np.array(actions) == "like", 1, -1),
+            **params,
+        )
+        rebuilt.append(city)
+
+    size = write_index(path, by_city, fingerprints, params)
+    return BuildResult(
+        cities=len(by_city),
+        rebuilt=rebuilt,
+        reused=len(by_city) - len(rebuilt),
+        items=sum(p.ids.shape[0] for p in by_city.values()),
+        neighbors=sum(p.nbr.shape[0] for p in by_city.values()),
+        bytes=size,
+    )
+
+
+class SimilarityIndexHandle:
+    """
+    Index partagé par le process, rechargé si le fichier a été remplacé
+    (vérification au plus toutes les `reload_s` secondes). Fichier absent => pas de boost.
+    """
+
+    def __init__(self, path: str | Path, reload_s: float):
+        self.path = Path(path)
+        self.reload_s = reload_s
+        self._index: SimilarityIndex | None = None
+        self._checked_at = float("-inf")
+        self.loads = 0
+        self.load_ms: float | None = None
+
+    def get(self) -> SimilarityIndex | None:
+        now = time.monotonic()
+        if now - self._checked_at >= self.reload_s:
+            self._checked_at = now
+            self._refresh()
+        return self._index
+
+    def _refresh(self) -> None:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            self._index = None
+            return
+        if self._index is not None and self._index.identity == (stat.st_ino, stat.st_mtime_ns):
+            return
+        started = time.perf_counter()
+        try:
+            self._index = SimilarityIndex(self.path)
+        except (OSError, ValueError) as exc:
+            logger.warning("similarity index not loaded: %r", exc)
+            return
+        self.loads += 1
+        self.load_ms = round((time.perf_counter() - started) * 1000, 3)
+
+    def stats(self) -> dict[str, Any]:
+        index = self._index
+        return {
+            "loaded": index is not None,
+            "loads": self.loads,
+            "load_ms": self.load_ms,
+            **(index.stats() if index is not None else {}),
+        }
+
+
+similarity_index = SimilarityIndexHandle(
+    settings.SIMILARITY_INDEX_PATH, reload_s=settings.SIMILARITY_RELOAD_S
+)
+
+
+def similar_items(liked: Iterable[str]) -> dict[str, float]:
+    """Voisins des items likés (vide si pas d'index ou boost désactivé)."""
+    if not settings.RANK_W_SIMILAR:
+        return {}
+    liked = list(liked)
+    index = similarity_index.get()
+    if index is None or not liked:
+        return {}
+    return index.similar_to(liked)
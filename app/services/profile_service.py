@@ -0,0 +1,92 @@
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.consent import Consent
+from app.models.preference import Preference
+from app.utils.cache import ExpiringLRUCache
+
+
+@dataclass(frozen=True)
+class PersonalizationProfile:
+    user_id: str
+    destination_recos_enabled: bool
+    budget: str | None
+    interests: tuple[str, ...]  # déjà nettoyés (lowercase, sans vides)
+
+
+@dataclass(frozen=True)
+class CachedPreferences:
+    budget: str | None
+    interests: tuple[str, ...]
+
+
+# Seules les préférences sont mises en cache (par process) : le consentement est relu
+# à chaque requête, pour qu'un opt-out s'applique tout de suite sur tous les workers.
+profile_cache: ExpiringLRUCache[CachedPreferences] = ExpiringLRUCache(
+    maxsize=settings.PROFILE_CACHE_SIZE
+)
+# incrémenté à chaque invalidation : un chargement concurrent ne remet pas en cache
+# une valeur lue avant l'écriture
+_invalidations = 0
+
+
+def parse_interests(csv: str | None) -> tuple[str, ...]:
+    if not csv:
+        return ()
+    return tuple(x.strip().lower() for x in csv.split(",") if x.strip())
+
+
+async def load_profile(db: AsyncSession, user_id: str) -> PersonalizationProfile:
+    """
+    Consentement + budget + intérêts en une seule requête (sous-requêtes scalaires).
+    Budget et intérêts sont mis en cache PROFILE_CACHE_TTL_S secondes ; le consentement
+    est toujours relu. Crée le consentement par défaut (opt-in) si l'utilisateur n'en a
+    pas encore.
+    """
+    consent = (
+        select(Consent.destination_recos_enabled)
+        .where(Consent.user_id == user_id)
+        .scalar_subquery()
+    )
+    cached = profile_cache.get(user_id)
+    if cached is not None:
+        enabled = (await db.execute(select(consent))).scalar()
+        budget, interests = cached.budget, cached.interests
+    else:
+        generation = _invalidations
+        stmt = select(
+            consent,
+            select(Preference.budget).where(Preference.user_id == user_id).scalar_subquery(),
+            select(Preference.interests).where(Preference.user_id == user_id).scalar_subquery(),
+        )
+        enabled, budget, raw_interests = (await db.execute(stmt)).one()
+        interests = parse_interests(raw_interests)
+        if generation == _invalidations:
+            profile_cache.set(
+                user_id,
+                CachedPreferences(budget=budget, interests=interests),
+                time.time() + settings.PROFILE_CACHE_TTL_S,
+            )
+
+    if enabled is None:
+        db.add(Consent(user_id=user_id, destination_recos_enabled=True))
+        await db.commit()
+        enabled = True
+
+    return PersonalizationProfile(
+        user_id=user_id,
+        destination_recos_enabled=bool(enabled),
+        budget=budget,
+        interests=interests,
+    )
+
+
+def invalidate_profile(user_id: str) -> None:
+    """À appeler après toute écriture de Consent / Preference pour cet utilisateur."""
+    global _invalidations
+    _invalidations += 1
+    profile_cache.invalidate(user_id)
@@ -0,0 +1,232 @@
+"""
+Classement personnalisé des items destination, vectorisé (NumPy).
+
+score = w_rating * note
+      - w_distance * distance_km
+      - w_price * |palier prix - palier du budget|   (si budget connu)
+      + w_interest * (catégorie liée aux intérêts)
+      + w_feedback * (+1 like / -1 dislike de l'utilisateur)
+      + w_popularity * tanh(likes - dislikes de tous les utilisateurs / 5)
+      + w_similar * min(similarité avec les items likés, 1)   (index item-item)
+
+Poids par défaut : même ordre qu'avant (feedback, puis note, puis distance) ;
+popularité et intérêts départagent, la similarité vaut au plus 0,3 point de
+note. Égalités : ordre d'entrée du provider.
+"""
+from dataclasses import dataclass
+from typing import Mapping, Sequence
+
+import numpy as np
+from sqlalchemy import case, func, select
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.feedback import Feedback
+from app.schemas.destination import DestinationItem
+from app.utils.cache import AsyncTTLCache
+
+PRICE_TIERS = {"€": 1, "€€": 2, "€€€": 3}
+BUDGET_TIERS = {"low": 1, "mid": 2, "high": 3}
+FEEDBACK_VALUES = {"like": 1.0, "dislike": -1.0}
+
+# intérêt déclaré -> catégories mises en avant
+INTEREST_CATEGORIES = {
+    "food": ("restaurant",),
+    "culture": ("activity",),
+    "nature": ("activity",),
+}
+
+
+@dataclass(frozen=True)
+class RankingWeights:
+    rating: float
+    distance: float  # par km : avec le réglage par défaut, ne départage qu'à note égale
+    price: float
+    interest: float
+    feedback: float
+    popularity: float
+    similar: float
+
+    @classmethod
+    def from_settings(cls) -> "RankingWeights":
+        return cls(
+            rating=settings.RANK_W_RATING,
+            distance=settings.RANK_W_DISTANCE,
+            price=settings.RANK_W_PRICE,
+            interest=settings.RANK_W_INTEREST,
+            feedback=settings.RANK_W_FEEDBACK,
+            popularity=settings.RANK_W_POPULARITY,
+            similar=settings.RANK_W_SIMILAR,
+        )
+
+
+default_weights = RankingWeights.from_settings()
+
+
+def boosted_categories(interests: Sequence[str]) -> set[str]:
+    return {cat for interest in interests for cat in INTEREST_CATEGORIES.get(interest, ())}
+
+
+def score_items(
+    items: Sequence[DestinationItem],
+    *,
+    weights: RankingWeights,
+    feedback: Mapping[str, str] | None = None,
+    interests: Sequence[str] = (),
+    popularity: Mapping[str, int] | None = None,
+    similar: Mapping[str, float] | None = None,
+    budget: str | None = None,
+) -> np.ndarray:
+    n = len(items)
+    feedback = feedback or {}
+    popularity = popularity or {}
+
+    rating = np.fromiter((x.rating for x in items), dtype=np.float64, count=n)
+    distance = np.fromiter((x.distance_km for x in items), dtype=np.float64, count=n)
+    scores = weights.rating * rating - weights.distance * distance
+
+    if feedback and weights.feedback:
+        fb = np.fromiter(
+            (FEEDBACK_VALUES.get(feedback.get(x.id), 0.0) for x in items), dtype=np.float64, count=n
+        )
+        scores += weights.feedback * fb
+
+    boosted = boosted_categories(interests)
+    if boosted and weights.interest:
+        match = np.fromiter((x.category in boosted for x in items), dtype=np.float64, count=n)
+        scores += weights.interest * match
+
+    target = BUDGET_TIERS.get(budget or "")
+    if target and weights.price:
+        tier = np.fromiter(
+            (PRICE_TIERS.get(x.price_level, 2) for x in items), dtype=np.float64, count=n
+        )
+        scores -= weights.price * np.abs(tier - target)
+
+    if popularity and weights.popularity:
+        pop = np.fromiter((popularity.get(x.id, 0) for x in items), dtype=np.float64, count=n)
+        scores += weights.popularity * np.tanh(pop / 5.0)
+
+    if similar and weights.similar:
+        sim = np.fromiter((similar.get(x.id, 0.0) for x in items), dtype=np.float64, count=n)
+        scores += weights.similar * np.minimum(sim, 1.0)
+
+    return scores
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices des k meilleurs scores, du meilleur au moins bon ; à score égal,
+    l'indice le plus petit d'abord (comme un tri stable). O(n) + O(k log k).
+    """
+    n = scores.shape[0]
+    k = min(k, n)
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k < n:
+        kth = scores[np.argpartition(-scores, k - 1)[:k]].min()
+        above = np.flatnonzero(scores > kth)
+        ties = np.flatnonzero(scores == kth)[: k - above.shape[0]]
+        selected = np.concatenate([above, ties])
+    else:
+        selected = np.arange(n)
+    return selected[np.lexsort((selected, -scores[selected]))]
+
+
+def rank_items(
+    items: Sequence[DestinationItem],
+    k: int,
+    *,
+    weights: RankingWeights,
+    feedback: Mapping[str, str] | None = None,
+    interests: Sequence[str] = (),
+    popularity: Mapping[str, int] | None = None,
+    similar: Mapping[str, float] | None = None,
+    budget: str | None = None,
+) -> tuple[list[DestinationItem], list[float]]:
+    """Top-k d'une liste de candidats, avec leurs scores."""
+    if not items:
+        return [], []
+    scores = score_items(
+        items,
+        weights=weights,
+        feedback=feedback,
+        interests=interests,
+        popularity=popularity,
+        similar=similar,
+        budget=budget,
+    )
+    order = top_k(scores, k)
+    return [items[i] for i in order], scores[order].tolist()
+
+
+def rank_groups(
+    groups: Mapping[str, Sequence[DestinationItem]],
+    k: int,
+    *,
+    weights: RankingWeights,
+    feedback: Mapping[str, Mapping[str, str]] | None = None,
+    interests: Sequence[str] = (),
+    popularity: Mapping[str, int] | None = None,
+    similar: Mapping[str, float] | None = None,
+    budget: str | None = None,
+) -> dict[str, tuple[list[DestinationItem], list[float]]]:
+    """
+    Version batch : tous les groupes (ex: les catégories de /arrival) sont scorés
+    en un seul passage vectorisé, puis top-k par groupe.
+    `feedback` : {groupe: {item_id: action}}.
+    """
+    keys = list(groups)
+    flat = [x for key in keys for x in groups[key]]
+    if not flat:
+        return {key: ([], []) for key in keys}
+
+    merged_feedback: dict[str, str] = {}
+    for key in keys:
+        merged_feedback.update((feedback or {}).get(key, {}))
+    scores = score_items(
+        flat,
+        weights=weights,
+        feedback=merged_feedback,
+        interests=interests,
+        popularity=popularity,
+        similar=similar,
+        budget=budget,
+    )
+
+    ranked = {}
+    start = 0
+    for key in keys:
+        end = start + len(groups[key])
+        part = scores[start:end]
+        order = top_k(part, k)
+        ranked[key] = ([flat[start + i] for i in order], part[order].tolist())
+        start = end
+    return ranked
+
+
+# --- Popularité : likes - dislikes par item (tous utilisateurs, y compris l'appelant) ---
+
+popularity_cache: AsyncTTLCache[dict[str, int]] = AsyncTTLCache(
+    maxsize=1024, ttl=settings.RANK_POPULARITY_TTL_S
+)
+
+
+async def _load_popularity(city: str) -> dict[str, int]:
+    # session dédiée : le chargement est partagé entre requêtes (single-flight)
+    # "clicked" et autres actions : neutres
+    net = func.sum(
+        case((Feedback.action == "like", 1), (Feedback.action == "dislike", -1), else_=0)
+    )
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(Feedback.item_id, net).where(Feedback.city == city).group_by(Feedback.item_id)
+        )
+        return {item_id: int(score) for item_id, score in result.all() if score}
+
+
+async def city_popularity(city: str) -> dict[str, int]:
+    if not settings.RANK_W_POPULARITY:
+        return {}
+    city = city.strip().lower()
+    return await popularity_cache.get_or_load(city, lambda: _load_popularity(city))
@@ -0,0 +1,167 @@
+"""
+Journal des impressions de recommandations (RecoLog), écrit hors du chemin de requête.
+
+Les endpoints déposent une entrée dans une asyncio.Queue bornée (jamais d'attente :
+file pleine => entrée ignorée et comptée) ; une tâche de fond la vide par lots
+(RECO_LOG_BATCH entrées ou RECO_LOG_FLUSH_INTERVAL_S) avec un INSERT groupé.
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import insert
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.reco_log import RecoLog
+
+logger = logging.getLogger(__name__)
+
+
+class RecoLogWriter:
+    def __init__(self, maxsize: int = 10_000, batch_size: int = 500, flush_interval: float = 2.0):
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._task: asyncio.Task | None = None
+        self._batch: list[dict[str, Any]] = []  # lot en cours de constitution
+        self._writing: asyncio.Future | None = None
+
+        self.enqueued = 0
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+
+    def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._task = asyncio.create_task(self._run(), name="reco-log-writer")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._loop = None
+        if self._writing is not None:
+            await self._writing
+        # dernier lot : celui en cours + ce qui reste dans la file
+        batch, self._batch = self._batch, []
+        await self._write(batch)
+        while not self._queue.empty():
+            await self._write(self._drain(self.batch_size))
+
+    def log(self, entry: dict[str, Any]) -> None:
+        """Non bloquant ; appelable depuis la boucle (async def) ou le threadpool (def)."""
+        loop = self._loop
+        if loop is None:
+            self.dropped += 1
+            return
+        entry.setdefault("created_at", datetime.utcnow())
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._put(entry)
+        else:
+            loop.call_soon_threadsafe(self._put, entry)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "enabled": settings.RECO_LOG_ENABLED,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "maxsize": self.maxsize,
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+            "written": self.written,
+            "failed": self.failed,
+        }
+
+    def _put(self, entry: dict[str, Any]) -> None:
+        try:
+            self._queue.put_nowait(entry)
+            self.enqueued += 1
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    def _drain(self, limit: int) -> list[dict[str, Any]]:
+        batch = []
+        while len(batch) < limit and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = self._batch
+            batch.append(await self._queue.get())
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                batch.extend(self._drain(self.batch_size - len(batch)))
+                timeout = deadline - time.monotonic()
+                if len(batch) >= self.batch_size or timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            self._batch = []
+            # shield : un arrêt pendant l'INSERT n'interrompt pas le lot (stop l'attend)
+            self._writing = asyncio.ensure_future(self._write(batch))
+            try:
+                await asyncio.shield(self._writing)
+            finally:
+                if self._writing.done():
+                    self._writing = None
+
+    async def _write(self, batch: list[dict[str, Any]]) -> None:
+        if not batch:
+            return
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(insert(RecoLog), batch)
+                await db.commit()
+            self.written += len(batch)
+        except Exception:
+            # journal best effort : on ne rejoue pas
+            self.failed += len(batch)
+            logger.exception("reco log flush failed (%d entries dropped)", len(batch))
+
+
+reco_log_writer = RecoLogWriter(
+    maxsize=settings.RECO_LOG_QUEUE_MAX,
+    batch_size=settings.RECO_LOG_BATCH,
+    flush_interval=settings.RECO_LOG_FLUSH_INTERVAL_S,
+)
+
+
+def log_impressions(
+    *,
+    user_id: str,
+    surface: str,
+    items: list[dict[str, Any]],
+    started_at: float,
+    booking_id: str | None = None,
+    city: str | None = None,
+    category: str | None = None,
+) -> None:
+    """`started_at` : time.perf_counter() au début du handler (latence servie)."""
+    if not settings.RECO_LOG_ENABLED:
+        return
+    reco_log_writer.log({
+        "user_id": user_id,
+        "booking_id": booking_id,
+        "surface": surface,
+        "city": city,
+        "category": category,
+        "items": items,
+        "latency_ms": round((time.perf_counter() - started_at) * 1000, 2),
+    })
@@ -0,0 +1,227 @@
+"""
+Génération des billets en tâche de fond.
+
+create_booking / update_booking_info mettent un rendu en file ; le pool de rendu
+écrit le PDF dans un store local (un fichier par empreinte). download_ticket sert
+le fichier s'il existe, sinon répond 202 avec Retry-After.
+
+Le store est nettoyé périodiquement (âge puis taille max, cf. TICKET_STORE_*).
+Un billet modifié pendant son rendu n'est pas réécrit sur le disque : l'ancienne
+empreinte est marquée "abandonnée" et le fichier est supprimé à la fin du job.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any
+
+from app.core.config import settings
+from app.models.booking import Booking
+from app.services.ticket_service import (
+    generated_at_label,
+    get_render_pool,
+    ticket_fields,
+    ticket_fingerprint,
+)
+from app.services.ticket_template import write_ticket
+
+logger = logging.getLogger(__name__)
+
+STORE_DIR = Path(settings.TICKET_STORE_DIR)
+
+
+def artifact_path(fingerprint: str) -> Path:
+    return STORE_DIR / f"{fingerprint}.pdf"
+
+
+class TicketJobQueue:
+    """
+    File des rendus en cours (clé = empreinte : un seul job par version du billet).
+    Appelée depuis le threadpool et depuis les callbacks du pool : protégée par un lock.
+    """
+
+    def __init__(self, latency_window: int = 1000):
+        self._lock = threading.Lock()
+        self._pending: dict[str, float] = {}  # empreinte -> date de mise en file
+        self._discarded: set[str] = set()  # rendus en cours dont le résultat est à jeter
+        self._next_sweep = 0.0
+        self._sweeping = False
+        self._render_s: deque[float] = deque(maxlen=latency_window)
+        self._total_s: deque[float] = deque(maxlen=latency_window)
+
+        self.enqueued = 0
+        self.completed = 0
+        self.failed = 0
+        self.dropped = 0  # rendus terminés après l'abandon de leur empreinte
+        self.swept = 0  # fichiers supprimés par le nettoyage
+
+    def is_pending(self, fingerprint: str) -> bool:
+        with self._lock:
+            return fingerprint in self._pending
+
+    def enqueue(self, booking: Booking) -> str:
+        fingerprint = ticket_fingerprint(booking)
+        if artifact_path(fingerprint).exists():
+            return fingerprint
+        with self._lock:
+            if fingerprint in self._pending:
+                self._discarded.discard(fingerprint)  # de nouveau demandé : on garde le résultat
+                return fingerprint
+            self._pending[fingerprint] = time.monotonic()
+            self.enqueued += 1
+
+        STORE_DIR.mkdir(parents=True, exist_ok=True)
+        try:
+            future = get_render_pool().submit(
+                write_ticket,
+                str(artifact_path(fingerprint)),
+                **ticket_fields(booking),
+                generated_at=generated_at_label(),
+            )
+        except Exception:
+            with self._lock:
+                self._pending.pop(fingerprint, None)
+            raise
+        future.add_done_callback(lambda f: self._done(fingerprint, f))
+        self.maybe_sweep()
+        return fingerprint
+
+    def discard(self, fingerprint: str) -> None:
+        """Supprime le fichier ; un rendu en cours pour cette empreinte sera jeté à la fin."""
+        with self._lock:
+            if fingerprint in self._pending:
+                self._discarded.add(fingerprint)
+        artifact_path(fingerprint).unlink(missing_ok=True)
+
+    def _done(self, fingerprint: str, future: Future) -> None:
+        with self._lock:
+            enqueued_at = self._pending.pop(fingerprint, None)
+            discarded = fingerprint in self._discarded
+            self._discarded.discard(fingerprint)
+            if discarded:
+                self.dropped += 1
+        if discarded:
+            # le billet a changé pendant le rendu : ce fichier ne doit pas être servi
+            artifact_path(fingerprint).unlink(missing_ok=True)
+            return
+        with self._lock:
+            if future.cancelled() or future.exception() is not None:
+                self.failed += 1
+                error = None if future.cancelled() else future.exception()
+            else:
+                self.completed += 1
+                self._render_s.append(future.result())
+                if enqueued_at is not None:
+                    self._total_s.append(time.monotonic() - enqueued_at)
+                return
+        logger.warning("ticket render failed for %s: %r", fingerprint, error)
+
+    def maybe_sweep(self) -> None:
+        """Lance un nettoyage du store en arrière-plan, au plus toutes les TICKET_STORE_SWEEP_S."""
+        now = time.monotonic()
+        with self._lock:
+            if self._sweeping or now < self._next_sweep:
+                return
+            self._sweeping = True
+            self._next_sweep = now + settings.TICKET_STORE_SWEEP_S
+        threading.Thread(target=self._sweep, name="ticket-store-sweep", daemon=True).start()
+
+    def _sweep(self) -> None:
+        try:
+            removed = sweep_store(
+                max_age_s=settings.TICKET_STORE_MAX_AGE_S,
+                max_bytes=settings.TICKET_STORE_MAX_MB * 1024 * 1024,
+                keep=self._pending_fingerprints(),
+            )
+            with self._lock:
+                self.swept += removed
+        except Exception:
+            logger.exception("ticket store sweep failed")
+        finally:
+            with self._lock:
+                self._sweeping = False
+
+    def _pending_fingerprints(self) -> set[str]:
+        with self._lock:
+            return set(self._pending)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            render = sorted(self._render_s)
+            total = sorted(self._total_s)
+            return {
+                "enabled": settings.TICKET_JOBS_ENABLED,
+                "queue_depth": len(self._pending),
+                "enqueued": self.enqueued,
+                "completed": self.completed,
+                "failed": self.failed,
+                "dropped": self.dropped,
+                "swept": self.swept,
+                "render_ms": _percentiles(render),
+                "end_to_end_ms": _percentiles(total),
+            }
+
+
+def sweep_store(max_age_s: float, max_bytes: int, keep: set[str] = frozenset()) -> int:
+    """
+    Supprime les fichiers du store plus vieux que `max_age_s` (temporaires
+    abandonnés compris), puis les plus anciens tant que le total dépasse
+    `max_bytes`. Les empreintes de `keep` (rendus en cours) sont ignorées.
+    Retourne le nombre de fichiers supprimés.
+    """
+    if not STORE_DIR.exists():
+        return 0
+    now = time.time()
+    files: list[tuple[float, int, Path]] = []
+    removed = 0
+    for path in STORE_DIR.iterdir():
+        if path.name.split(".", 1)[0] in keep:
+            continue
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        if now - stat.st_mtime > max_age_s:
+            path.unlink(missing_ok=True)
+            removed += 1
+        elif path.suffix == ".pdf":
+            files.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+        removed += 1
+    return removed
+
+
+def _percentiles(sorted_values: list[float]) -> dict[str, float] | None:
+    if not sorted_values:
+        return None
+
+    def pick(q: float) -> float:
+        return round(sorted_values[min(int(q * len(sorted_values)), len(sorted_values) - 1)] * 1000, 2)
+
+    return {"p50": pick(0.5), "p95": pick(0.95), "max": pick(1.0)}
+
+
+ticket_jobs = TicketJobQueue()
+
+
+def enqueue_ticket(booking: Booking) -> None:
+    """Met le rendu en file si le mode tâche de fond est activé (best effort)."""
+    if not settings.TICKET_JOBS_ENABLED:
+        return
+    try:
+        ticket_jobs.enqueue(booking)
+    except Exception:
+        # le billet sera rendu à la demande au prochain téléchargement
+        logger.exception("could not enqueue ticket render for booking %s", booking.id)
+
+
+def discard_artifact(fingerprint: str) -> None:
+    ticket_jobs.discard(fingerprint)
@@ -0,0 +1,173 @@
+import asyncio
+import hashlib
+import multiprocessing
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import partial
+from typing import Any, AsyncIterator, NamedTuple
+
+from app.core.config import settings
+from app.models.booking import Booking
+from app.services.ticket_template import render_ticket
+from app.utils.cache import ExpiringLRUCache
+
+# À incrémenter si la mise en page change : invalide toutes les empreintes
+TICKET_LAYOUT_VERSION = "2"
+
+# empreinte -> PDF rendu
+ticket_cache: ExpiringLRUCache[bytes] = ExpiringLRUCache(maxsize=settings.TICKET_CACHE_SIZE)
+
+
+def ticket_fingerprint(booking: Booking) -> str:
+    """Hash des seuls champs imprimés sur le billet (sert de clé de cache et d'ETag)."""
+    fields = (
+        TICKET_LAYOUT_VERSION,
+        booking.id,
+        booking.first_name,
+        booking.last_name,
+        booking.email,
+        booking.birth_date,
+        booking.origin,
+        booking.destination,
+        booking.depart_date,
+        booking.return_date,
+        booking.cabin,
+        booking.trip_type,
+    )
+    raw = "\x1f".join("" if f is None else str(f) for f in fields)
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+def ticket_fields(booking: Booking) -> dict[str, Any]:
+    """Champs imprimés (types simples, picklables pour le pool de rendu)."""
+    return {
+        "booking_id": booking.id,
+        "origin": booking.origin,
+        "destination": booking.destination,
+        "trip_type": booking.trip_type,
+        "cabin": booking.cabin,
+        "depart_date": booking.depart_date,
+        "return_date": booking.return_date,
+        "first_name": booking.first_name,
+        "last_name": booking.last_name,
+        "email": booking.email,
+        "birth_date": booking.birth_date,
+    }
+
+
+def generated_at_label() -> str:
+    return datetime.now().strftime('%d/%m/%Y à %H:%M')
+
+
+def render_ticket_pdf(booking: Booking) -> bytes:
+    return render_ticket(**ticket_fields(booking), generated_at=generated_at_label())
+
+
+def get_ticket_pdf(booking: Booking, fingerprint: str | None = None) -> bytes:
+    """PDF du billet depuis le cache (clé = empreinte), rendu seulement si absent."""
+    key = fingerprint or ticket_fingerprint(booking)
+    pdf = ticket_cache.get(key)
+    if pdf is None:
+        pdf = render_ticket_pdf(booking)
+        ticket_cache.set(key, pdf, time.time() + settings.TICKET_CACHE_TTL_S)
+    return pdf
+
+
+# --- Export groupé ---------------------------------------------------------
+
+class TicketJob(NamedTuple):
+    filename: str
+    fingerprint: str
+    fields: dict[str, Any]
+
+
+_render_pool: ProcessPoolExecutor | None = None
+
+
+def get_render_pool() -> ProcessPoolExecutor:
+    global _render_pool
+    if _render_pool is None:
+        _render_pool = ProcessPoolExecutor(
+            max_workers=settings.TICKET_RENDER_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _render_pool
+
+
+def shutdown_render_pool() -> None:
+    global _render_pool
+    if _render_pool is not None:
+        _render_pool.shutdown(wait=False, cancel_futures=True)
+        _render_pool = None
+
+
+def ticket_job(booking: Booking, filename: str) -> TicketJob:
+    return TicketJob(filename, ticket_fingerprint(booking), ticket_fields(booking))
+
+
+class _ZipChunks:
+    """Destination non-seekable pour zipfile : on récupère les octets au fil de l'eau."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def _pdf_for(job: TicketJob, pool: ProcessPoolExecutor) -> bytes:
+    pdf = ticket_cache.get(job.fingerprint)
+    if pdf is None:
+        loop = asyncio.get_running_loop()
+        pdf = await loop.run_in_executor(
+            pool, partial(render_ticket, **job.fields, generated_at=generated_at_label())
+        )
+        ticket_cache.set(job.fingerprint, pdf, time.time() + settings.TICKET_CACHE_TTL_S)
+    return pdf
+
+
+async def stream_tickets_zip(jobs: list[TicketJob]) -> AsyncIterator[bytes]:
+    """
+    Archive ZIP produite billet par billet : seuls quelques PDF en vol sont en mémoire
+    (fenêtre = 2 x workers), jamais l'archive complète. Ordre des entrées = ordre des jobs.
+    """
+    pool = get_render_pool()
+    window = 2 * settings.TICKET_RENDER_WORKERS
+    pending: deque[tuple[TicketJob, asyncio.Task]] = deque()
+    sink = _ZipChunks()
+    remaining = iter(jobs)
+
+    def refill() -> None:
+        while len(pending) < window:
+            job = next(remaining, None)
+            if job is None:
+                return
+            pending.append((job, asyncio.ensure_future(_pdf_for(job, pool))))
+
+    try:
+        # PDF déjà compressés (Flate) : pas de second deflate
+        with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED) as archive:
+            refill()
+            while pending:
+                job, task = pending.popleft()
+                pdf = await task
+                refill()
+                archive.writestr(job.filename, pdf)
+                yield sink.drain()
+        yield sink.drain()
+    finally:
+        # client déconnecté : on abandonne les rendus en cours
+        for _, task in pending:
+            task.cancel()
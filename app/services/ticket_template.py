@@ -0,0 +1,205 @@
+"""
+Rendu des billets PDF par gabarit.
+
+La partie fixe du document (catalogue, page, polices, bandeau rouge, titres,
+pied de page) est compilée une seule fois à l'import. Un rendu ne produit plus
+que le flux de contenu des ~10 champs variables, puis la table xref.
+"""
+import os
+import time
+import zlib
+from datetime import date
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import cm
+
+WIDTH, HEIGHT = A4
+X = 2 * cm
+
+# Polices standard (Type 1, non embarquées) partagées par tous les billets
+FONTS = {
+    "F1": b"/BaseFont /Helvetica /Encoding /WinAnsiEncoding",
+    "F2": b"/BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding",
+    "F3": b"/BaseFont /Helvetica-Oblique /Encoding /WinAnsiEncoding",
+    "F4": b"/BaseFont /Symbol",  # caractères hors WinAnsi (ex: flèche)
+}
+REGULAR, BOLD, OBLIQUE, SYMBOL = "F1", "F2", "F3", "F4"
+
+# Caractères hors cp1252 rendus avec la police Symbol (comme le fait reportlab)
+SYMBOL_CHARS = {"→": b"\\256"}
+
+
+def _escape(raw: bytes) -> bytes:
+    return raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+def _text_ops(text: str, font: str, size: float) -> bytes:
+    """Opérateurs Tj pour `text`, en basculant sur Symbol pour les caractères spéciaux."""
+    ops: list[bytes] = []
+    run: list[str] = []
+
+    def flush() -> None:
+        if run:
+            raw = "".join(run).encode("cp1252", errors="replace")
+            ops.append(b"/%s %g Tf (%s) Tj" % (font.encode(), size, _escape(raw)))
+            run.clear()
+
+    for ch in text:
+        symbol = SYMBOL_CHARS.get(ch)
+        if symbol is None:
+            run.append(ch)
+            continue
+        flush()
+        ops.append(b"/%s %g Tf (%s) Tj" % (SYMBOL.encode(), size, symbol))
+    flush()
+    return b" ".join(ops)
+
+
+def _draw(x: float, y: float, text: str, font: str, size: float) -> bytes:
+    return b"BT 1 0 0 1 %.2f %.2f Tm %s ET\n" % (x, y, _text_ops(text, font, size))
+
+
+# --- Partie fixe du flux de contenu, compilée une fois --------------------
+
+STATIC_HEADER = b"".join(
+    [
+        # Bandeau rouge RAM
+        b"0.7 0.1 0.1 rg 0 %.2f %.2f %.2f re B\n" % (HEIGHT - 4 * cm, WIDTH, 4 * cm),
+        b"1 1 1 rg\n",
+        _draw(X, HEIGHT - 2.5 * cm, "Royal Air Maroc", BOLD, 24),
+        _draw(X, HEIGHT - 3.2 * cm, "E-Ticket / Billet Électronique", REGULAR, 14),
+        b"0 0 0 rg\n",
+        _draw(X, HEIGHT - 6 * cm, "PASSAGER / PASSENGER", BOLD, 12),
+    ]
+)
+STATIC_FOOTER = _draw(
+    X,
+    1.5 * cm,
+    "Veuillez présenter ce document à l'embarquement / Please present this document at boarding",
+    OBLIQUE,
+    8,
+)
+FLIGHT_TITLE = "DÉTAILS DU VOL / FLIGHT DETAILS"
+
+# --- Objets PDF fixes (1..7) et leurs offsets, compilés une fois -----------
+
+PDF_HEADER = b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n"
+
+# 1 Catalog, 2 Pages, 3 Page, 4.. polices, puis le flux de contenu (seul objet variable)
+FONT_OBJS = {name: 4 + i for i, name in enumerate(FONTS)}
+CONTENTS_OBJ = 4 + len(FONTS)
+
+
+def _compile_prefix() -> tuple[bytes, list[int]]:
+    font_refs = b" ".join(b"/%s %d 0 R" % (name.encode(), num) for name, num in FONT_OBJS.items())
+    bodies = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [ 3 0 R ] /Count 1 >>",
+        (
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [ 0 0 %.4f %.4f ] "
+            b"/Resources << /Font << %s >> /ProcSet [ /PDF /Text ] >> /Contents %d 0 R >>"
+        ) % (WIDTH, HEIGHT, font_refs, CONTENTS_OBJ),
+    ]
+    for name, spec in FONTS.items():
+        bodies.append(b"<< /Type /Font /Subtype /Type1 /Name /%s %s >>" % (name.encode(), spec))
+
+    out = bytearray(PDF_HEADER)
+    offsets: list[int] = []
+    for num, body in enumerate(bodies, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (num, body)
+    return bytes(out), offsets
+
+
+PREFIX, PREFIX_OFFSETS = _compile_prefix()
+
+
+def _fmt_date(d: date) -> str:
+    return d.strftime("%d/%m/%Y")
+
+
+def render_ticket(
+    *,
+    booking_id: str,
+    origin: str,
+    destination: str,
+    trip_type: str,
+    cabin: str,
+    depart_date: date,
+    return_date: date | None,
+    first_name: str | None,
+    last_name: str | None,
+    email: str | None,
+    birth_date: date | None,
+    generated_at: str,
+) -> bytes:
+    """Superpose les champs du billet sur le gabarit et retourne le PDF complet."""
+    ops = [STATIC_HEADER]
+
+    # Informations du passager
+    y_pos = HEIGHT - 7 * cm
+    if first_name and last_name:
+        ops.append(_draw(X, y_pos, f"Nom / Name: {last_name.upper()} {first_name}", REGULAR, 10))
+        y_pos -= 0.6 * cm
+    if email:
+        ops.append(_draw(X, y_pos, f"Email: {email}", REGULAR, 10))
+        y_pos -= 0.6 * cm
+    if birth_date:
+        ops.append(
+            _draw(X, y_pos, f"Date de naissance / Birth date: {_fmt_date(birth_date)}", REGULAR, 10)
+        )
+        y_pos -= 1 * cm
+
+    # Détails du vol
+    ops.append(_draw(X, y_pos, FLIGHT_TITLE, BOLD, 12))
+    y_pos -= 0.8 * cm
+    lines = [
+        f"Référence: {booking_id[:8].upper()}",
+        f"Trajet: {origin} → {destination}",
+        f"Date de départ: {_fmt_date(depart_date)}",
+    ]
+    if return_date:
+        lines.append(f"Date de retour: {_fmt_date(return_date)}")
+    lines.append(f"Classe: {cabin.upper()}")
+    lines.append(f"Type: {'Aller-Retour' if trip_type == 'roundtrip' else 'Aller Simple'}")
+    for line in lines:
+        ops.append(_draw(X, y_pos, line, REGULAR, 10))
+        y_pos -= 0.6 * cm
+
+    # Pied de page
+    ops.append(_draw(X, 2 * cm, f"Document généré le {generated_at}", OBLIQUE, 8))
+    ops.append(STATIC_FOOTER)
+
+    # Flux < 2 Ko : une fenêtre de 4 Ko (wbits=12) suffit et évite ~250 Ko d'allocations zlib
+    deflate = zlib.compressobj(6, zlib.DEFLATED, 12, 2)
+    stream = deflate.compress(b"".join(ops)) + deflate.flush()
+
+    out = bytearray(PREFIX)
+    contents_offset = len(out)
+    out += b"%d 0 obj\n<< /Length %d /Filter /FlateDecode >>\nstream\n" % (CONTENTS_OBJ, len(stream))
+    out += stream
+    out += b"\nendstream\nendobj\n"
+
+    xref_offset = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (CONTENTS_OBJ + 1)
+    for offset in (*PREFIX_OFFSETS, contents_offset):
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        CONTENTS_OBJ + 1,
+        xref_offset,
+    )
+    return bytes(out)
+
+
+def write_ticket(path: str, **fields) -> float:
+    """
+    Rend le billet et l'écrit dans `path` (fichier temporaire + rename atomique).
+    Exécuté dans le pool de rendu ; retourne la durée du rendu en secondes.
+    """
+    started = time.perf_counter()
+    pdf = render_ticket(**fields)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(pdf)
+    os.replace(tmp, path)
+    return time.perf_counter() - started
@@ -1,5 +1,10 @@
 from datetime import date, timedelta
+from types import MappingProxyType
+
+from pydantic_core import to_json
+
 from app.models.booking import Booking
+from app.utils.json_template import SLOT, JsonTemplate, Raw
 
 
 def compute_phase(today: date, depart: date, ret: date | None) -> str:
@@ -35,67 +40,91 @@ def compute_phase(today: date, depart: date, ret: date | None) -> str:
     return "pre_departure"
 
 
-def build_steps(current: str) -> list[dict]:
-    # mapping des phases -> contenu UI
-    steps = [
+# Contenu UI des phases : figé à l'import (immuable, partagé entre requêtes)
+STEPS: tuple[MappingProxyType, ...] = tuple(
+    MappingProxyType(step)
+    for step in (
         {
             "phase": "pre_departure",
             "title": "Pré-départ",
             "description": "Préparez votre voyage : documents, bagages, options de confort.",
-            "actions": ["OPEN_POST_BOOKING_RECO", "OPEN_BAGGAGE_OPTIONS", "OPEN_SEAT_MAP"],
+            "actions": ("OPEN_POST_BOOKING_RECO", "OPEN_BAGGAGE_OPTIONS", "OPEN_SEAT_MAP"),
         },
         {
             "phase": "check_in",
             "title": "Check-in",
             "description": "Finalisez avant le départ : check-in, infos aéroport, fast track.",
-            "actions": ["OPEN_CHECKIN_INFO", "ADD_FAST_TRACK", "OPEN_AIRPORT_TIPS"],
+            "actions": ("OPEN_CHECKIN_INFO", "ADD_FAST_TRACK", "OPEN_AIRPORT_TIPS"),
         },
         {
             "phase": "departure_day",
             "title": "Jour du départ",
             "description": "Derniers rappels : porte d’embarquement, temps d’attente, services.",
-            "actions": ["OPEN_AIRPORT_TIPS", "ADD_FAST_TRACK", "OPEN_LOUNGE_INFO"],
+            "actions": ("OPEN_AIRPORT_TIPS", "ADD_FAST_TRACK", "OPEN_LOUNGE_INFO"),
         },
         {
             "phase": "arrival",
             "title": "Arrivée",
             "description": "À votre arrivée : transport, hôtel, restaurants, activités.",
-            "actions": ["OPEN_ARRIVAL_RECO"],  # => /destinations/arrival
+            "actions": ("OPEN_ARRIVAL_RECO",),  # => /destinations/arrival
         },
         {
             "phase": "stay",
             "title": "Séjour",
             "description": "Profitez : activités, restaurants, retours pour améliorer vos recommandations.",
-            "actions": ["OPEN_ARRIVAL_RECO", "OPEN_FEEDBACK"],
+            "actions": ("OPEN_ARRIVAL_RECO", "OPEN_FEEDBACK"),
         },
         {
             "phase": "post_trip",
             "title": "Après le voyage",
             "description": "Aidez-nous à améliorer : feedback global, préférences, récapitulatif.",
-            "actions": ["OPEN_FEEDBACK", "OPEN_PREFERENCES"],
+            "actions": ("OPEN_FEEDBACK", "OPEN_PREFERENCES"),
         },
+    )
+)
+
+
+def build_steps(current: str) -> list[dict]:
+    # mapping des phases -> contenu UI (ordre du schéma TimelineStep)
+    return [
+        {
+            "phase": s["phase"],
+            "active": s["phase"] == current,
+            "title": s["title"],
+            "description": s["description"],
+            "actions": list(s["actions"]),
+        }
+        for s in STEPS
     ]
 
-    for s in steps:
-        s["active"] = (s["phase"] == current)
 
-    return steps
+# Liste des étapes déjà sérialisée pour chaque phase courante possible
+STEPS_JSON: dict[str, Raw] = {s["phase"]: Raw(to_json(build_steps(s["phase"]))) for s in STEPS}
+
+TIMELINE_TEMPLATE = JsonTemplate(
+    {
+        "booking_id": SLOT,
+        "destination": SLOT,
+        "origin": SLOT,
+        "trip_type": SLOT,
+        "cabin": SLOT,
+        "status": SLOT,
+        "dates": SLOT,
+        "steps": SLOT,
+    }
+)
 
 
-def build_timeline(booking: Booking, today: date) -> dict:
+def render_timeline(booking: Booking, today: date) -> bytes:
+    """TimelineResponse directement en JSON : seuls les champs du booking sont encodés."""
     current = compute_phase(today=today, depart=booking.depart_date, ret=booking.return_date)
-    steps = build_steps(current)
-
-    return {
-        "booking_id": booking.id,
-        "destination": booking.destination,
-        "origin": booking.origin,
-        "trip_type": booking.trip_type,
-        "cabin": booking.cabin,
-        "status": current,
-        "dates": {
-            "depart_date": booking.depart_date,
-            "return_date": booking.return_date,
-        },
-        "steps": steps,
-    }
+    return TIMELINE_TEMPLATE.render(
+        booking_id=booking.id,
+        destination=booking.destination,
+        origin=booking.origin,
+        trip_type=booking.trip_type,
+        cabin=booking.cabin,
+        status=current,
+        dates={"depart_date": booking.depart_date, "return_date": booking.return_date},
+        steps=STEPS_JSON[current],
+    )
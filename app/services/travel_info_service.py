@@ -0,0 +1,140 @@
+"""
+Contenu des écrans "infos voyage" (check-in, jour du départ).
+
+Le contenu est statique : chaque réponse est compilée une fois à l'import
+(listes pré-sérialisées). Par requête, seuls les champs du booking sont encodés ;
+la variante sans booking est un bloc d'octets constant, avec son ETag.
+"""
+from app.models.booking import Booking
+from app.schemas.travel_info import TravelInfoItem, TravelInfoResponse
+from app.utils.http import content_etag
+from app.utils.json_template import SLOT, JsonTemplate
+
+CHECK_IN = TravelInfoResponse(
+    phase="check_in",
+    title="Check-in",
+    subtitle="Finalisez avant le depart : check-in, infos aeroport, fast track.",
+    checklist=[
+        TravelInfoItem(
+            id="doc_id",
+            title="Piece d'identite",
+            description="Passeport ou CNI selon destination.",
+            tag="document",
+        ),
+        TravelInfoItem(
+            id="boarding_pass",
+            title="Carte d'embarquement",
+            description="Check-in en ligne recommande pour gagner du temps.",
+            tag="check-in",
+        ),
+        TravelInfoItem(
+            id="baggage",
+            title="Bagages",
+            description="Respecter les limites de poids et dimensions.",
+            tag="bagage",
+        ),
+    ],
+    tips=[
+        TravelInfoItem(
+            id="online_window",
+            title="Fenetre check-in",
+            description="Ouvre 24h avant le depart (selon vol).",
+        ),
+        TravelInfoItem(
+            id="airport_time",
+            title="Arriver tot",
+            description="Prevoir 2h (vol national) ou 3h (international).",
+        ),
+    ],
+    services=[
+        TravelInfoItem(
+            id="fast_track",
+            title="Fast Track",
+            description="Acces prioritaire aux controles de securite.",
+            tag="service",
+        ),
+        TravelInfoItem(
+            id="seat",
+            title="Choisir mon siege",
+            description="Selection de siege selon disponibilite.",
+            tag="confort",
+        ),
+    ],
+)
+
+DEPARTURE_DAY = TravelInfoResponse(
+    phase="departure_day",
+    title="Jour du depart",
+    subtitle="Derniers rappels : porte d'embarquement, attente, services.",
+    checklist=[
+        TravelInfoItem(
+            id="gate",
+            title="Porte d'embarquement",
+            description="Verifier l'ecran d'affichage regulierement.",
+            tag="embarquement",
+        ),
+        TravelInfoItem(
+            id="security",
+            title="Controle de securite",
+            description="Prevoir du temps selon l'affluence.",
+            tag="aeroport",
+        ),
+        TravelInfoItem(
+            id="boarding_time",
+            title="Heure d'embarquement",
+            description="Se presenter avant l'heure indiquee.",
+            tag="horaires",
+        ),
+    ],
+    tips=[
+        TravelInfoItem(
+            id="documents",
+            title="Documents a portee",
+            description="Passeport et carte d'embarquement faciles d'acces.",
+        ),
+        TravelInfoItem(
+            id="carry_on",
+            title="Bagage cabine",
+            description="Objets essentiels uniquement pour accelerer le controle.",
+        ),
+    ],
+    services=[
+        TravelInfoItem(
+            id="fast_track",
+            title="Fast Track",
+            description="Option pour reduire l'attente aux controles.",
+            tag="service",
+        ),
+        TravelInfoItem(
+            id="lounge",
+            title="Acces lounge",
+            description="Espace calme avec wifi et rafraichissements.",
+            tag="confort",
+        ),
+    ],
+)
+
+BOOKING_FIELDS = ("booking_id", "origin", "destination", "depart_date")
+
+
+class TravelInfoPayload:
+    """Réponse compilée : octets constants sans booking, gabarit avec booking."""
+
+    def __init__(self, content: TravelInfoResponse):
+        self.generic = content.model_dump_json().encode()
+        self.etag = content_etag(self.generic)
+        self._template = JsonTemplate(
+            {k: SLOT if k in BOOKING_FIELDS else v for k, v in content.model_dump().items()}
+        )
+
+    def render(self, booking: Booking) -> bytes:
+        return self._template.render(
+            booking_id=booking.id,
+            origin=booking.origin,
+            destination=booking.destination,
+            depart_date=booking.depart_date,
+        )
+
+
+CHECK_IN_PAYLOAD = TravelInfoPayload(CHECK_IN)
+DEPARTURE_DAY_PAYLOAD = TravelInfoPayload(DEPARTURE_DAY)
@@ -0,0 +1,192 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Generic, Hashable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+V = TypeVar("V")
+
+
+@dataclass
+class _Entry(Generic[V]):
+    value: V
+    expires_at: float  # au-delà : entrée "stale"
+    stale_until: float  # au-delà : entrée inutilisable
+
+
+class AsyncTTLCache(Generic[V]):
+    """
+    Cache en mémoire (par process) pour des chargements async :
+    - LRU borné à `maxsize` entrées
+    - TTL par entrée, puis fenêtre stale-while-revalidate (`stale_ttl`) :
+      on sert la valeur périmée et on la rafraîchit en arrière-plan
+    - single-flight : des misses concurrents sur la même clé partagent
+      un seul appel au loader
+    Prévu pour être utilisé depuis une seule boucle asyncio.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 600.0, stale_ttl: float = 0.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._data: OrderedDict[Hashable, _Entry[V]] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[V]]) -> V:
+        now = time.monotonic()
+        entry = self._data.get(key)
+        if entry is not None:
+            if now < entry.expires_at:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry.value
+            if now < entry.stale_until:
+                self._data.move_to_end(key)
+                self.stale_hits += 1
+                if key not in self._inflight:
+                    self._start_load(key, loader)
+                return entry.value
+            del self._data[key]
+
+        self.misses += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._start_load(key, loader)
+        else:
+            self.coalesced += 1
+        # shield : l'annulation d'un appelant n'annule pas le chargement partagé
+        return await asyncio.shield(task)
+
+    def peek(self, key: Hashable) -> V | None:
+        """Valeur encore servable (fraîche ou stale), sans chargement ni stats."""
+        entry = self._data.get(key)
+        if entry is None or time.monotonic() >= entry.stale_until:
+            return None
+        return entry.value
+
+    def set(self, key: Hashable, value: V) -> None:
+        now = time.monotonic()
+        self._data[key] = _Entry(
+            value=value,
+            expires_at=now + self.ttl,
+            stale_until=now + self.ttl + self.stale_ttl,
+        )
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_s": self.ttl,
+            "stale_ttl_s": self.stale_ttl,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "inflight": len(self._inflight),
+            "hit_ratio": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+    def _start_load(self, key: Hashable, loader: Callable[[], Awaitable[V]]) -> asyncio.Task:
+        task = asyncio.ensure_future(self._load(key, loader))
+        task.add_done_callback(self._log_failure)
+        self._inflight[key] = task
+        return task
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[V]]) -> V:
+        try:
+            value = await loader()
+            self.set(key, value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    @staticmethod
+    def _log_failure(task: asyncio.Task) -> None:
+        # Récupère l'exception pour les rafraîchissements en arrière-plan
+        # (sinon asyncio logge "exception was never retrieved")
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("cache load failed: %r", task.exception())
+
+
+class ExpiringLRUCache(Generic[V]):
+    """
+    Petit cache LRU thread-safe (dépendances sync => threadpool) où chaque
+    entrée porte sa propre date d'expiration (timestamp epoch, time.time()).
+    """
+
+    def __init__(self, maxsize: int = 10_000):
+        self.maxsize = maxsize
+        self._data: OrderedDict[Hashable, tuple[V, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> V | None:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            value, expires_at = item
+            if time.time() >= expires_at:
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: V, expires_at: float) -> None:
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
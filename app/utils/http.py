@@ -0,0 +1,12 @@
+import hashlib
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+    return etag in candidates
+
+
+def content_etag(body: bytes) -> str:
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
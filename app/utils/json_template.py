@@ -0,0 +1,40 @@
+from typing import Any
+
+from pydantic_core import to_json
+
+
+class Raw(bytes):
+    """Fragment JSON déjà sérialisé, injecté tel quel."""
+
+
+SLOT = object()  # marqueur : champ fourni à chaque rendu
+
+
+class JsonTemplate:
+    """
+    Objet JSON dont les champs statiques sont sérialisés une fois (à l'import) ;
+    seuls les champs marqués SLOT sont encodés et insérés à chaque rendu.
+    L'ordre des clés est celui de `fields` (donc celui du schéma Pydantic).
+    """
+
+    def __init__(self, fields: dict[str, Any]):
+        self.slots: list[str] = []
+        self._parts: list[bytes] = []  # len(parts) == len(slots) + 1
+        buf = b"{"
+        for i, (key, value) in enumerate(fields.items()):
+            buf += (b"," if i else b"") + to_json(key) + b":"
+            if value is SLOT:
+                self._parts.append(buf)
+                self.slots.append(key)
+                buf = b""
+            else:
+                buf += to_json(value)
+        self._parts.append(buf + b"}")
+
+    def render(self, **values: Any) -> bytes:
+        out = [self._parts[0]]
+        for key, part in zip(self.slots, self._parts[1:]):
+            value = values[key]
+            out.append(value if isinstance(value, Raw) else to_json(value))
+            out.append(part)
+        return b"".join(out)
@@ -0,0 +1,28 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.utils.json_template import Raw
+
+
+def _default(obj: Any) -> Any:
+    # Modèles déjà validés (ex: DestinationItem du provider) : champs simples, on les
+    # sérialise tels quels au lieu de les revalider contre le response_model
+    if isinstance(obj, BaseModel):
+        return obj.__dict__
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Réponse JSON via orjson. Renvoyée directement par l'endpoint, elle court-circuite
+    la validation du response_model (qui reste déclaré pour la doc OpenAPI).
+    Un fragment Raw (déjà sérialisé) est envoyé tel quel.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, Raw):
+            return content
+        return orjson.dumps(content, default=_default)
@@ -0,0 +1,156 @@
+"""
+Accès DB des endpoints destinations : Session sync dans la boucle (avant) vs AsyncSession.
+
+    python -m benchmarks.bench_async_db [--requests 1000] [--concurrency 32] [--upstream-ms 20]
+
+Chaque "requête" reproduit le travail DB de /destinations/recommendations
+(profil en une requête, feedback de l'utilisateur pour la ville / catégorie),
+puis attend l'upstream (--upstream-ms, provider simulé). Le scénario "heavy"
+ajoute l'agrégat de popularité de la ville, sans cache.
+
+- sync_in_loop : Session sync appelée depuis la coroutine (code avant AsyncSession)
+- async : AsyncSession (aiosqlite / asyncpg), code actuel
+
+Une sonde mesure le retard de la boucle asyncio (tick de 1 ms).
+Base SQLite temporaire, toujours (DATABASE_URL exporté ignoré).
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+
+from sqlalchemy import case, func, select  # noqa: E402
+
+from app.core.database import AsyncSessionLocal, Base, SessionLocal, async_engine, engine  # noqa: E402
+from app.models.consent import Consent  # noqa: E402
+from app.models.feedback import Feedback  # noqa: E402
+from app.models.preference import Preference  # noqa: E402
+from benchmarks.stats import latency_percentiles  # noqa: E402
+
+USERS = 5000
+ITEMS = 400
+CITIES = ("paris", "casablanca", "marrakech", "madrid")
+
+
+def seed(rows: int) -> None:
+    Base.metadata.create_all(
+        engine, tables=[Feedback.__table__, Consent.__table__, Preference.__table__]
+    )
+    rng = random.Random(0)
+    now = datetime.utcnow()
+    with SessionLocal() as db:
+        db.execute(Consent.__table__.insert(), [
+            {"user_id": f"u{i}", "destination_recos_enabled": True} for i in range(USERS)
+        ])
+        db.execute(Feedback.__table__.insert(), [
+            {"user_id": f"u{i % USERS}", "item_id": f"it{i % ITEMS}_{i // USERS}",
+             "category": rng.choice(("hotel", "restaurant")), "city": rng.choice(CITIES),
+             "action": rng.choice(("like", "dislike", "clicked")),
+             "created_at": now, "updated_at": now}
+            for i in range(rows)
+        ])
+        db.commit()
+
+
+def statements(rng: random.Random, heavy: bool) -> list:
+    user_id = f"u{rng.randrange(USERS)}"
+    city = rng.choice(CITIES)
+    stmts = [
+        select(
+            select(Consent.destination_recos_enabled)
+            .where(Consent.user_id == user_id)
+            .scalar_subquery(),
+            select(Preference.budget).where(Preference.user_id == user_id).scalar_subquery(),
+            select(Preference.interests).where(Preference.user_id == user_id).scalar_subquery(),
+        ),
+        select(Feedback.item_id, Feedback.action).where(
+            Feedback.user_id == user_id, Feedback.city == city, Feedback.category == "hotel"
+        ),
+    ]
+    if heavy:
+        net = func.sum(
+            case((Feedback.action == "like", 1), (Feedback.action == "dislike", -1), else_=0)
+        )
+        stmts.append(
+            select(Feedback.item_id, net).where(Feedback.city == city).group_by(Feedback.item_id)
+        )
+    return stmts
+
+
+async def sync_in_loop(stmts: list) -> None:
+    with SessionLocal() as db:
+        for stmt in stmts:
+            db.execute(stmt).all()
+
+
+async def async_session(stmts: list) -> None:
+    async with AsyncSessionLocal() as db:
+        for stmt in stmts:
+            (await db.execute(stmt)).all()
+
+
+async def run(handler, args, heavy: bool) -> dict:
+    rng = random.Random(1)
+    durations: list[float] = []
+    lags: list[float] = []
+    queue = iter(range(args.requests))
+    done = asyncio.Event()
+
+    async def worker():
+        for _ in queue:
+            t0 = time.perf_counter()
+            await handler(statements(rng, heavy))
+            await asyncio.sleep(args.upstream_ms / 1000)
+            durations.append(time.perf_counter() - t0)
+
+    async def probe():
+        while not done.is_set():
+            t0 = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lags.append(time.perf_counter() - t0 - 0.001)
+
+    prober = asyncio.create_task(probe())
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await prober
+    return {
+        "rps": round(args.requests / elapsed),
+        "request_ms": latency_percentiles(sorted(durations)),
+        "loop_lag_ms": latency_percentiles(sorted(lags)),
+    }
+
+
+async def main_async(args) -> dict:
+    results = {}
+    for scenario, heavy in (("light", False), ("heavy", True)):
+        for name, handler in (("sync_in_loop", sync_in_loop), ("async", async_session)):
+            await handler(statements(random.Random(2), heavy))  # connexions ouvertes hors mesure
+            results[f"{scenario}/{name}"] = await run(handler, args, heavy)
+    await async_engine.dispose()
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--upstream-ms", type=float, default=20.0)
+    parser.add_argument("--rows", type=int, default=50_000, help="lignes feedback initiales")
+    args = parser.parse_args(argv)
+    seed(args.rows)
+    print(json.dumps(asyncio.run(main_async(args)), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,84 @@
+"""
+Coût de l'authentification par requête : decode_token (avant) vs decode_token_cached.
+
+    python -m benchmarks.bench_auth [--calls 20000] [--requests 2000]
+
+- micro : un décodage de token valide, puis d'un token invalide (signature fausse),
+  sans cache (python-jose à chaque fois) et avec cache (hit / cache négatif)
+- GET /api/v1/auth/me en process (httpx.ASGITransport), get_current_user
+  branché sur decode_token puis sur decode_token_cached
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+os.environ["DB_AUTO_MIGRATE"] = "true"
+
+import httpx  # noqa: E402
+from jose import JWTError  # noqa: E402
+
+from app.api import deps  # noqa: E402
+from app.core.security import create_access_token, decode_token, decode_token_cached  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+def per_call_us(fn, token: str, calls: int) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        try:
+            fn(token)
+        except JWTError:
+            pass
+    return round((time.perf_counter() - started) / calls * 1e6, 2)
+
+
+async def me_per_request_us(decoder, token: str, requests: int) -> float:
+    deps.decode_token_cached = decoder
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        headers = {"Authorization": f"Bearer {token}"}
+        (await client.get("/api/v1/auth/me", headers=headers)).raise_for_status()
+        started = time.perf_counter()
+        for _ in range(requests):
+            await client.get("/api/v1/auth/me", headers=headers)
+        return round((time.perf_counter() - started) / requests * 1e6, 1)
+
+
+async def main_async(args) -> dict:
+    token = create_access_token("guest:bench", {"role": "guest"})
+    invalid = token[:-4] + ("AAAA" if not token.endswith("AAAA") else "BBBB")
+    results = {
+        "valid_us": {
+            "decode_token": per_call_us(decode_token, token, args.calls),
+            "decode_token_cached": per_call_us(decode_token_cached, token, args.calls),
+        },
+        "invalid_us": {
+            "decode_token": per_call_us(decode_token, invalid, args.calls),
+            "decode_token_cached": per_call_us(decode_token_cached, invalid, args.calls),
+        },
+    }
+    async with app.router.lifespan_context(app):
+        results["auth_me_request_us"] = {
+            "decode_token": await me_per_request_us(decode_token, token, args.requests),
+            "decode_token_cached": await me_per_request_us(decode_token_cached, token, args.requests),
+        }
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--calls", type=int, default=20_000)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args(argv)
+    print(json.dumps(asyncio.run(main_async(args)), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
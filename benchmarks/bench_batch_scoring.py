@@ -0,0 +1,105 @@
+"""
+Scoring post-booking en lot : réservations/s, boucle par réservation vs par colonnes.
+
+    python -m benchmarks.bench_batch_scoring [--bookings 100000] [--chunk 5000]
+
+Base SQLite temporaire. Sur la même fenêtre de départ, lue par paquets (keyset) :
+- sql_only : lecture seule (iter_booking_chunks)
+- per_booking : compute_scores + build_post_booking_cards + json par réservation
+- column_wise : render_chunk (NumPy + JSON pré-rendu par combinaison), code actuel
+- render_only : render_chunk sur des colonnes déjà en mémoire (sans SQL)
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+import uuid
+from datetime import date, timedelta
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/unused.db"
+
+import orjson  # noqa: E402
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.models.booking import Booking  # noqa: E402
+from app.services.batch_scoring import iter_booking_chunks, render_chunk  # noqa: E402
+from app.services.recommender import build_post_booking_cards  # noqa: E402
+from app.services.scoring import compute_scores  # noqa: E402
+
+START = date(2026, 11, 1)
+DAYS = 30
+
+
+def seed(db: Session, n: int) -> None:
+    rng = random.Random(0)
+    rows = []
+    for i in range(n):
+        depart = START + timedelta(days=rng.randrange(DAYS))
+        ret = None if rng.random() < 0.3 else depart + timedelta(days=rng.randint(0, 30))
+        rows.append({
+            "id": str(uuid.UUID(int=rng.getrandbits(128))), "owner_id": f"guest:{i % 20_000}",
+            "destination": "Paris", "cabin": rng.choice(("economy", "business")),
+            "depart_date": depart, "return_date": ret,
+        })
+        if len(rows) == 10_000:
+            db.execute(insert(Booking), rows)
+            rows.clear()
+    if rows:
+        db.execute(insert(Booking), rows)
+    db.commit()
+
+
+def per_booking(chunk) -> bytes:
+    out = []
+    for booking_id, owner_id, depart, ret, cabin in zip(
+        chunk.ids, chunk.owners, chunk.depart.tolist(), chunk.ret.tolist(), chunk.cabin
+    ):
+        summary = compute_scores(depart, ret, cabin)
+        out.append(orjson.dumps({
+            "booking_id": booking_id, "owner_id": owner_id, "summary": summary.__dict__,
+            "cards": build_post_booking_cards(summary, cabin),
+        }) + b"\n")
+    return b"".join(out)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--bookings", type=int, default=100_000)
+    parser.add_argument("--chunk", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    tmp = tempfile.mkdtemp()
+    engine = create_engine(f"sqlite:///{tmp}/bookings.db")
+    Booking.__table__.create(engine)
+    window = (START, START + timedelta(days=DAYS))
+    results = {}
+    with Session(engine) as db:
+        seed(db, args.bookings)
+        for name, render in (
+            ("sql_only", lambda chunk: b""),
+            ("per_booking", per_booking),
+            ("column_wise", render_chunk),
+        ):
+            started = time.perf_counter()
+            rows = 0
+            for chunk in iter_booking_chunks(db, *window, args.chunk):
+                render(chunk)
+                rows += len(chunk.ids)
+            results[name] = round(rows / (time.perf_counter() - started))
+        chunks = list(iter_booking_chunks(db, *window, args.chunk))
+    engine.dispose()
+
+    started = time.perf_counter()
+    size = sum(len(render_chunk(chunk)) for chunk in chunks)
+    results["render_only"] = round(rows / (time.perf_counter() - started))
+    print(json.dumps({"bookings": rows, "ndjson_bytes": size, "rows_per_s": results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
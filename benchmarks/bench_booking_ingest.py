@@ -0,0 +1,100 @@
+"""
+Débit d'import des réservations : POST /bookings/ une à une vs POST /bookings/bulk vs CLI.
+
+    python -m benchmarks.bench_booking_ingest [--single 500] [--bulk 20000] [--cli 20000]
+
+App en process (httpx.ASGITransport), base SQLite et store de billets temporaires.
+- single : POST /api/v1/bookings/ par réservation
+- bulk : POST /api/v1/bookings/bulk, BOOKING_BULK_MAX lignes par appel
+- cli : ingest_bookings sur un NDJSON (chemin de app.cli.ingest_bookings), 100 propriétaires
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+os.environ["DB_AUTO_MIGRATE"] = "true"
+os.environ["TICKET_STORE_DIR"] = tempfile.mkdtemp()
+
+import httpx  # noqa: E402
+
+from app.cli.ingest_bookings import read_rows  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.database import SessionLocal  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.booking_ingest import ingest_bookings  # noqa: E402
+
+START = date(2026, 11, 1)
+
+
+def booking(i: int) -> dict:
+    depart = START + timedelta(days=i % 60)
+    return {
+        "destination": ("Paris", "Rome", "Madrid")[i % 3],
+        "depart_date": depart.isoformat(),
+        "return_date": (depart + timedelta(days=i % 14)).isoformat(),
+        "cabin": "economy" if i % 4 else "business",
+        "first_name": "Amine", "last_name": f"Alaoui{i}", "email": f"p{i}@example.com",
+    }
+
+
+async def http_rows_per_s(client, headers, path: str, bodies: list, rows: int) -> int:
+    started = time.perf_counter()
+    for body in bodies:
+        (await client.post(path, json=body, headers=headers)).raise_for_status()
+    return round(rows / (time.perf_counter() - started))
+
+
+def cli_rows_per_s(rows: int) -> int:
+    ndjson = io.StringIO(
+        "".join(json.dumps({**booking(i), "owner_id": f"guest:owner{i % 100}"}) + "\n" for i in range(rows))
+    )
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        result = ingest_bookings(db, read_rows(ndjson, None))
+    assert not result.errors, result.errors[:3]
+    return round(rows / (time.perf_counter() - started))
+
+
+async def main_async(args) -> dict:
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            token = (await client.post("/api/v1/auth/guest")).json()["access_token"]
+            headers = {"Authorization": f"Bearer {token}"}
+            step = settings.BOOKING_BULK_MAX
+            results = {
+                "single": await http_rows_per_s(
+                    client, headers, "/api/v1/bookings/",
+                    [booking(i) for i in range(args.single)], args.single,
+                ),
+                f"bulk_{step}": await http_rows_per_s(
+                    client, headers, "/api/v1/bookings/bulk",
+                    [[booking(i) for i in range(k, min(k + step, args.bulk))]
+                     for k in range(0, args.bulk, step)],
+                    args.bulk,
+                ),
+            }
+    results["cli"] = cli_rows_per_s(args.cli)
+    return {"rows_per_s": results}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--single", type=int, default=500)
+    parser.add_argument("--bulk", type=int, default=20_000)
+    parser.add_argument("--cli", type=int, default=20_000)
+    args = parser.parse_args(argv)
+    print(json.dumps(asyncio.run(main_async(args)), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,102 @@
+"""
+Débit d'écriture du feedback : POST /feedback (un évènement) vs POST /feedback/batch.
+
+    python -m benchmarks.bench_feedback [--events 2000] [--batch 500] [--concurrency 8] [--write-behind]
+
+App en process (httpx.ASGITransport), base SQLite temporaire. Mesure aussi
+l'upsert seul (upsert_feedback_rows), une ligne par commit vs un lot par commit.
+--write-behind active le tampon FEEDBACK_WRITE_BEHIND (les appels HTTP ne font
+plus que l'ajout au tampon).
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+os.environ["DB_AUTO_MIGRATE"] = "true"
+os.environ["FEEDBACK_WRITE_BEHIND"] = "true" if "--write-behind" in sys.argv else "false"
+os.environ["FEEDBACK_SPILL_DIR"] = tempfile.mkdtemp()
+
+import httpx  # noqa: E402
+
+from app.core.database import SessionLocal  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.feedback_service import upsert_feedback_rows  # noqa: E402
+from benchmarks.stats import latency_percentiles  # noqa: E402
+
+
+def event(i: int, prefix: str) -> dict:
+    return {
+        "item_id": f"hotel_rome_{prefix}{i}", "category": "hotel", "city": "Rome",
+        "action": "like" if i % 3 else "dislike",
+    }
+
+
+async def run_http(client, headers, calls: list[tuple[str, dict]], events: int, concurrency: int) -> dict:
+    durations: list[float] = []
+    queue = iter(calls)
+
+    async def worker():
+        for path, body in queue:
+            t0 = time.perf_counter()
+            resp = await client.post(path, json=body, headers=headers)
+            resp.raise_for_status()
+            durations.append(time.perf_counter() - t0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {"events_per_s": round(events / elapsed), "call_ms": latency_percentiles(sorted(durations))}
+
+
+def run_db(events: int, batch: int) -> dict:
+    rows = [{**event(i, f"db{batch}_"), "user_id": "bench", "city": "rome"} for i in range(events)]
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        for k in range(0, events, batch):
+            upsert_feedback_rows(db, rows[k : k + batch])
+    return {"events_per_s": round(events / (time.perf_counter() - started))}
+
+
+async def main_async(args) -> dict:
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            token = (await client.post("/api/v1/auth/guest")).json()["access_token"]
+            headers = {"Authorization": f"Bearer {token}"}
+            single = [("/api/v1/feedback", event(i, "s")) for i in range(args.events)]
+            batches = [
+                ("/api/v1/feedback/batch",
+                 {"events": [event(i, "b") for i in range(k, min(k + args.batch, args.events))]})
+                for k in range(0, args.events, args.batch)
+            ]
+            results = {
+                "http_single": await run_http(client, headers, single, args.events, args.concurrency),
+                f"http_batch_{args.batch}": await run_http(
+                    client, headers, batches, args.events, min(args.concurrency, len(batches))
+                ),
+            }
+    results["db_row_per_commit"] = run_db(args.events, 1)
+    results[f"db_{args.batch}_per_commit"] = run_db(args.events, args.batch)
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--write-behind", action="store_true", help="tampon write-behind actif")
+    args = parser.parse_args(argv)
+    print(json.dumps({"write_behind": args.write_behind, **asyncio.run(main_async(args))}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
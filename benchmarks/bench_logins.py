@@ -0,0 +1,106 @@
+"""
+Charge de connexions concurrentes sur /auth/login (app en process, base SQLite temporaire).
+
+    python -m benchmarks.bench_logins [--logins 400] [--concurrency 64] [--mode pool|threadpool]
+
+- pool : vérification dans le pool de process (PASSWORD_HASH_WORKERS), file bornée
+  à PASSWORD_HASH_MAX_PENDING (503 au-delà)
+- threadpool : vérification dans le threadpool, dans le process de l'API (avant le pool)
+
+Pendant la charge, /api/v1/health est sondé toutes les 10 ms : sa latence mesure
+la disponibilité de la boucle asyncio pour le reste du trafic.
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+os.environ["DB_AUTO_MIGRATE"] = "true"
+
+import httpx  # noqa: E402
+from fastapi.concurrency import run_in_threadpool  # noqa: E402
+
+from app.api.v1 import auth  # noqa: E402
+from app.core import security  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.main import app  # noqa: E402
+from benchmarks.stats import latency_percentiles  # noqa: E402
+
+PASSWORD = "correct horse battery"
+
+
+async def verify_in_threadpool(password: str, hashed_password: str):
+    return await run_in_threadpool(security.pwd_context.verify_and_update, password, hashed_password)
+
+
+async def main_async(args) -> dict:
+    if args.mode == "threadpool":
+        auth.verify_password_async = verify_in_threadpool
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            users = [f"bench{i}@example.com" for i in range(args.users)]
+            for email in users:
+                await client.post("/api/v1/auth/register", json={
+                    "first_name": "B", "last_name": "U", "email": email, "password": PASSWORD,
+                })
+
+            durations: list[float] = []
+            statuses: dict[int, int] = {}
+            probes: list[float] = []
+            queue = iter(range(args.logins))
+            done = asyncio.Event()
+
+            async def worker():
+                for i in queue:
+                    t0 = time.perf_counter()
+                    resp = await client.post("/api/v1/auth/login", json={
+                        "email": users[i % len(users)], "password": PASSWORD,
+                    })
+                    durations.append(time.perf_counter() - t0)
+                    statuses[resp.status_code] = statuses.get(resp.status_code, 0) + 1
+
+            async def probe():
+                while not done.is_set():
+                    t0 = time.perf_counter()
+                    await client.get("/api/v1/health")
+                    probes.append(time.perf_counter() - t0)
+                    await asyncio.sleep(0.01)
+
+            prober = asyncio.create_task(probe())
+            started = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+            elapsed = time.perf_counter() - started
+            done.set()
+            await prober
+
+    return {
+        "mode": args.mode,
+        "workers": settings.PASSWORD_HASH_WORKERS,
+        "rounds": settings.PASSWORD_HASH_ROUNDS,
+        "logins_per_s": round(args.logins / elapsed, 1),
+        "status": statuses,
+        "login_ms": latency_percentiles(sorted(durations)),
+        "health_ms": latency_percentiles(sorted(probes)),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--logins", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--mode", choices=("pool", "threadpool"), default="pool")
+    args = parser.parse_args(argv)
+    print(json.dumps(asyncio.run(main_async(args)), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,103 @@
+"""
+Coût par réponse de la timeline et des infos voyage : modèles pydantic par requête vs gabarits compilés.
+
+    python -m benchmarks.bench_payloads [--n 20000]
+
+- legacy : dict des étapes -> TimelineResponse / TravelInfoResponse -> model_dump_json (chemin d'origine)
+- compiled : render_timeline, CHECK_IN_PAYLOAD.render, DEPARTURE_DAY_PAYLOAD.generic
+Pour chaque cas : µs par réponse et pic d'allocation (tracemalloc) sur un appel.
+Les deux chemins doivent produire le même JSON.
+"""
+import argparse
+import json
+import time
+import tracemalloc
+from datetime import date
+
+from app.models.booking import Booking
+from app.schemas.timeline import TimelineResponse
+from app.schemas.travel_info import TravelInfoResponse
+from app.services.timeline_service import build_steps, compute_phase, render_timeline
+from app.services.travel_info_service import (
+    CHECK_IN,
+    CHECK_IN_PAYLOAD,
+    DEPARTURE_DAY,
+    DEPARTURE_DAY_PAYLOAD,
+)
+
+TODAY = date(2026, 11, 3)
+BOOKING = Booking(
+    id="bk_bench", owner_id="guest:bench", origin="CMN", destination="Paris",
+    trip_type="roundtrip", cabin="economy",
+    depart_date=date(2026, 11, 6), return_date=date(2026, 11, 13),
+)
+
+
+def legacy_timeline() -> bytes:
+    current = compute_phase(today=TODAY, depart=BOOKING.depart_date, ret=BOOKING.return_date)
+    return TimelineResponse.model_validate(
+        {
+            "booking_id": BOOKING.id,
+            "destination": BOOKING.destination,
+            "origin": BOOKING.origin,
+            "trip_type": BOOKING.trip_type,
+            "cabin": BOOKING.cabin,
+            "status": current,
+            "dates": {"depart_date": BOOKING.depart_date, "return_date": BOOKING.return_date},
+            "steps": build_steps(current),
+        }
+    ).model_dump_json().encode()
+
+
+def legacy_check_in() -> bytes:
+    return TravelInfoResponse.model_validate(
+        {
+            **CHECK_IN.model_dump(),
+            "booking_id": BOOKING.id,
+            "origin": BOOKING.origin,
+            "destination": BOOKING.destination,
+            "depart_date": BOOKING.depart_date,
+        }
+    ).model_dump_json().encode()
+
+
+def legacy_generic() -> bytes:
+    return TravelInfoResponse.model_validate(DEPARTURE_DAY.model_dump()).model_dump_json().encode()
+
+
+CASES = {
+    "timeline": (legacy_timeline, lambda: render_timeline(BOOKING, TODAY)),
+    "travel_info_booking": (legacy_check_in, lambda: CHECK_IN_PAYLOAD.render(BOOKING)),
+    "travel_info_generic": (legacy_generic, lambda: DEPARTURE_DAY_PAYLOAD.generic),
+}
+
+
+def measure(fn, n: int) -> dict:
+    started = time.perf_counter()
+    for _ in range(n):
+        fn()
+    per_call_us = (time.perf_counter() - started) / n * 1e6
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"us": round(per_call_us, 2), "peak_bytes": peak}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--n", type=int, default=20_000)
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, (legacy, compiled) in CASES.items():
+        assert json.loads(legacy()) == json.loads(compiled()), name
+        results[name] = {"legacy": measure(legacy, args.n), "compiled": measure(compiled, args.n)}
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,122 @@
+"""
+Débit de PlacesDestinationProvider contre un serveur Places local (uvicorn).
+
+    python -m benchmarks.bench_places [--requests 1000] [--concurrency 64] [--latency-ms 20]
+
+Compare le client partagé du provider (pool keep-alive) à un client httpx
+créé par requête (nouvelle connexion TCP à chaque appel).
+"""
+import argparse
+import asyncio
+import json
+import socket
+import threading
+import time
+
+import httpx
+import orjson
+import uvicorn
+
+from app.providers.places_provider import PlacesDestinationProvider
+from benchmarks.stats import latency_percentiles
+
+PLACES = orjson.dumps(
+    {
+        "places": [
+            {
+                "id": f"p{i}",
+                "displayName": {"text": f"Hotel {i}"},
+                "rating": 4.0,
+                "priceLevel": "PRICE_LEVEL_MODERATE",
+                "location": {"latitude": 33.59 + i / 1000, "longitude": -7.61},
+            }
+            for i in range(10)
+        ]
+    }
+)
+
+
+def stub_app(latency_s: float):
+    async def app(scope, receive, send):
+        if scope["type"] != "http":
+            return
+        while (await receive()).get("more_body"):
+            pass
+        await asyncio.sleep(latency_s)
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": PLACES})
+
+    return app
+
+
+def start_stub(latency_s: float) -> tuple[uvicorn.Server, str]:
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(stub_app(latency_s), log_level="warning", access_log=False))
+    threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, f"http://127.0.0.1:{port}"
+
+
+async def run(call, requests: int, concurrency: int) -> dict:
+    durations: list[float] = []
+    queue = iter(range(requests))
+
+    async def worker():
+        for _ in queue:
+            t0 = time.perf_counter()
+            await call()
+            durations.append(time.perf_counter() - t0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {"rps": round(requests / elapsed), **latency_percentiles(sorted(durations))}
+
+
+async def main_async(args) -> dict:
+    server, base_url = start_stub(args.latency_ms / 1000)
+    try:
+        provider = PlacesDestinationProvider(
+            api_key="bench", base_url=base_url, max_concurrency=args.concurrency,
+            max_connections=args.concurrency,
+        )
+
+        async def pooled():
+            await provider.search("Casablanca", "hotel")
+
+        async def per_request():
+            async with httpx.AsyncClient(base_url=base_url) as client:
+                PlacesDestinationProvider._to_items(
+                    (await client.post("/v1/places:searchText", json={})).json()["places"],
+                    city="Casablanca", category="hotel",
+                )
+
+        await pooled()  # ouverture des connexions hors mesure
+        results = {
+            "pooled_client": await run(pooled, args.requests, args.concurrency),
+            "client_per_request": await run(per_request, args.requests, args.concurrency),
+        }
+        await provider.aclose()
+        return results
+    finally:
+        server.should_exit = True
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="latence simulée de l'upstream")
+    args = parser.parse_args(argv)
+    print(json.dumps(asyncio.run(main_async(args)), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
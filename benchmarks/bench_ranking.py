@@ -0,0 +1,90 @@
+"""
+Classement des items : double sorted() (avant) vs rank_items / top_k (NumPy).
+
+    python -m benchmarks.bench_ranking [--sizes 20 1000 100000] [--k 20]
+
+- sorted_x2 : tri "food" (note, distance) puis tri feedback / note / distance,
+  tel que le faisaient les endpoints destinations
+- rank_items : score_items + top_k, poids par défaut (RANK_W_*)
+- top_k : sélection seule sur des scores déjà calculés
+
+Vérifie d'abord que rank_items (sans popularité) rend le même ordre que l'ancien tri.
+"""
+import argparse
+import json
+import random
+import time
+from dataclasses import replace
+
+from app.schemas.destination import DestinationItem
+from app.services.ranking import default_weights, rank_items, score_items, top_k
+
+FEEDBACK_BOOST = {"like": 100, "dislike": -100}
+
+
+def make_items(n: int, seed: int = 0) -> tuple[list[DestinationItem], dict[str, str]]:
+    rng = random.Random(seed)
+    items = [
+        DestinationItem(
+            id=f"restaurant_paris_{i}", category="restaurant", name=f"Restaurant {i}",
+            rating=round(rng.uniform(2, 5), 1), price_level=rng.choice(("€", "€€", "€€€")),
+            distance_km=round(rng.uniform(0, 30), 1), address="Paris", source="mock",
+        )
+        for i in range(n)
+    ]
+    feedback = {x.id: rng.choice(("like", "dislike")) for x in rng.sample(items, n // 10)}
+    return items, feedback
+
+
+def sorted_x2(items: list[DestinationItem], feedback: dict[str, str], interests: list[str], k: int):
+    if "food" in interests:
+        items = sorted(items, key=lambda x: (-x.rating, x.distance_km))
+    return sorted(
+        items,
+        key=lambda x: (FEEDBACK_BOOST.get(feedback.get(x.id), 0), x.rating, -x.distance_km),
+        reverse=True,
+    )[:k]
+
+
+def check_same_order(k: int) -> None:
+    weights = replace(default_weights, popularity=0.0)
+    for seed in range(20):
+        items, feedback = make_items(500, seed)
+        expected = [x.id for x in sorted_x2(items, feedback, ["food"], k)]
+        ranked, _ = rank_items(items, k, weights=weights, feedback=feedback, interests=["food"])
+        assert [x.id for x in ranked] == expected, f"order differs (seed={seed})"
+
+
+def per_call_ms(fn, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return round((time.perf_counter() - started) / repeat * 1000, 3)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 1000, 100_000])
+    parser.add_argument("--k", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    check_same_order(args.k)
+    results = {}
+    for n in args.sizes:
+        items, feedback = make_items(n)
+        repeat = max(3, 20_000 // n)
+        kwargs = {"weights": default_weights, "feedback": feedback, "interests": ["food"]}
+        scores = score_items(items, **kwargs)
+        results[n] = {
+            "sorted_x2_ms": per_call_ms(lambda: sorted_x2(items, feedback, ["food"], args.k), repeat),
+            "rank_items_ms": per_call_ms(lambda: rank_items(items, args.k, **kwargs), repeat),
+            "top_k_ms": per_call_ms(lambda: top_k(scores, args.k), repeat),
+        }
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,106 @@
+"""
+Index de similarité : temps de construction, de chargement et de requête.
+
+    python -m benchmarks.bench_similarity [--rows 1000000] [--cities 10] [--users 100000] [--items 4000]
+
+Feedback synthétique (like / dislike / clicked, 10 par utilisateur) dans une base
+SQLite temporaire, puis :
+- build complet, rebuild sans changement, rebuild après une écriture dans une ville
+- chargement du fichier (mmap) et similar_to() pour 1 et 5 items likés
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/unused.db"
+
+from sqlalchemy import create_engine, update  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.models.feedback import Feedback  # noqa: E402
+from app.services.item_similarity import SimilarityIndex, build_index  # noqa: E402
+
+PER_USER = 10
+
+
+def seed(db: Session, args) -> None:
+    rng = random.Random(0)
+    now = datetime.utcnow()
+    batch = []
+    users_per_city = args.users // args.cities
+    for u in range(args.rows // PER_USER):
+        city = f"city{u // users_per_city % args.cities}"
+        for it in rng.sample(range(args.items // args.cities), PER_USER):
+            batch.append({
+                "user_id": f"u{u}", "item_id": f"hotel_{city}_{it}", "category": "hotel",
+                "city": city, "action": rng.choices(("like", "dislike", "clicked"), (7, 2, 1))[0],
+                "created_at": now, "updated_at": now,
+            })
+        if len(batch) >= 50_000:
+            db.execute(Feedback.__table__.insert(), batch)
+            batch.clear()
+    if batch:
+        db.execute(Feedback.__table__.insert(), batch)
+    db.commit()
+
+
+def timed(fn, repeat: int = 1) -> tuple[float, object]:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - started) / repeat, result
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--cities", type=int, default=10)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--items", type=int, default=4000, help="items au total, répartis par ville")
+    args = parser.parse_args(argv)
+
+    tmp = tempfile.mkdtemp()
+    path = os.path.join(tmp, "items.simx")
+    engine = create_engine(f"sqlite:///{tmp}/feedback.db")
+    Feedback.__table__.create(engine)
+    with Session(engine) as db:
+        seed(db, args)
+
+        full_s, result = timed(lambda: build_index(db, path, full=True))
+        unchanged_s, _ = timed(lambda: build_index(db, path))
+        db.execute(
+            update(Feedback).where(Feedback.id == 1).values(action="dislike", updated_at=datetime.utcnow())
+        )
+        db.commit()
+        one_city_s, partial = timed(lambda: build_index(db, path))
+    engine.dispose()
+
+    load_s, index = timed(lambda: SimilarityIndex(path), repeat=200)
+    liked = [x.decode() for x in index.ids[:5]]
+    query1_s, _ = timed(lambda: index.similar_to(liked[:1]), repeat=2000)
+    query5_s, _ = timed(lambda: index.similar_to(liked), repeat=2000)
+
+    print(json.dumps({
+        "feedback_rows": args.rows,
+        "items": result.items,
+        "neighbors": result.neighbors,
+        "bytes": result.bytes,
+        "build_full_s": round(full_s, 2),
+        "build_unchanged_s": round(unchanged_s, 2),
+        "build_one_city_s": round(one_city_s, 2),
+        "rebuilt_cities": partial.rebuilt,
+        "load_ms": round(load_s * 1000, 3),
+        "query_1_like_us": round(query1_s * 1e6, 1),
+        "query_5_likes_us": round(query5_s * 1e6, 1),
+    }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
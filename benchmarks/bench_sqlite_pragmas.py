@@ -0,0 +1,146 @@
+"""
+Profil SQLite avant / après (engine_options + pragmas WAL) sur une base temporaire.
+
+    python -m benchmarks.bench_sqlite_pragmas [--seconds 5] [--writers 4] [--readers 8]
+
+- before : create_engine(url, connect_args={"check_same_thread": False}), journal
+  "delete", synchronous=FULL (défauts SQLite)
+- after : engine_options() + set_sqlite_pragmas (WAL, SQLITE_SYNCHRONOUS, busy_timeout, mmap)
+
+Deux phases par profil : écritures concurrentes (upsert feedback + commit par ligne),
+puis lectures (feedback d'un utilisateur) pendant qu'un écrivain tourne.
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/unused.db"
+
+from sqlalchemy import create_engine, select  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.core.database import Base, apply_sqlite_pragmas, engine_options, upsert_insert  # noqa: E402
+from app.models.feedback import Feedback  # noqa: E402
+from benchmarks.stats import latency_percentiles  # noqa: E402
+
+USERS = 2000
+ITEMS = 500
+
+
+def make_engine(profile: str, path: str):
+    url = f"sqlite:///{path}"
+    if profile == "before":
+        return create_engine(url, connect_args={"check_same_thread": False})
+    engine = create_engine(url, **engine_options())
+    apply_sqlite_pragmas(engine)
+    return engine
+
+
+def seed(Session, rows: int) -> None:
+    now = datetime.utcnow()
+    with Session() as db:
+        db.execute(Feedback.__table__.insert(), [
+            {"user_id": f"u{i % USERS}", "item_id": f"it{i}", "category": "hotel",
+             "city": "paris", "action": "like", "created_at": now, "updated_at": now}
+            for i in range(rows)
+        ])
+        db.commit()
+
+
+def write_one(Session, rng: random.Random) -> None:
+    now = datetime.utcnow()
+    stmt = upsert_insert(Feedback.__table__).values(
+        user_id=f"u{rng.randrange(USERS)}", item_id=f"it{rng.randrange(ITEMS)}",
+        category="hotel", city="paris", action=rng.choice(("like", "dislike")),
+        created_at=now, updated_at=now,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "item_id"],
+        set_={"action": stmt.excluded.action, "updated_at": now},
+    )
+    with Session() as db:
+        db.execute(stmt)
+        db.commit()
+
+
+def read_one(Session, rng: random.Random) -> None:
+    with Session() as db:
+        db.execute(
+            select(Feedback.item_id, Feedback.action)
+            .where(Feedback.user_id == f"u{rng.randrange(USERS)}", Feedback.city == "paris")
+        ).all()
+
+
+def hammer(fn, Session, threads: int, stop: threading.Event, seed_base: int) -> dict:
+    durations: list[float] = []
+    errors = [0]
+
+    def loop(i: int):
+        rng = random.Random(seed_base + i)
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            try:
+                fn(Session, rng)
+            except OperationalError:  # "database is locked"
+                errors[0] += 1
+                continue
+            durations.append(time.perf_counter() - t0)
+
+    workers = [threading.Thread(target=loop, args=(i,)) for i in range(threads)]
+    for t in workers:
+        t.start()
+    return {"threads": workers, "durations": durations, "errors": errors}
+
+
+def collect(run: dict, seconds: float) -> dict:
+    for t in run["threads"]:
+        t.join()
+    durations = sorted(run["durations"])
+    return {"ops_per_s": round(len(durations) / seconds), "errors": run["errors"][0],
+            **latency_percentiles(durations)}
+
+
+def timed(seconds: float, *specs) -> list[dict]:
+    stop = threading.Event()
+    runs = [hammer(*spec, stop, i * 100) for i, spec in enumerate(specs)]
+    time.sleep(seconds)
+    stop.set()
+    return [collect(run, seconds) for run in runs]
+
+
+def bench(profile: str, args) -> dict:
+    path = os.path.join(tempfile.mkdtemp(), f"{profile}.db")
+    engine = make_engine(profile, path)
+    Base.metadata.create_all(engine, tables=[Feedback.__table__])
+    Session = sessionmaker(bind=engine, autoflush=False)
+    seed(Session, args.rows)
+
+    (writes,) = timed(args.seconds, (write_one, Session, args.writers))
+    writer, reads = timed(
+        args.seconds, (write_one, Session, 1), (read_one, Session, args.readers)
+    )
+    engine.dispose()
+    return {"writes": writes, "reads_during_writes": reads, "background_writer": writer}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--rows", type=int, default=50_000, help="lignes feedback initiales")
+    args = parser.parse_args(argv)
+    print(json.dumps({p: bench(p, args) for p in ("before", "after")}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,117 @@
+"""
+Rendu des billets PDF : canvas reportlab complet (avant) vs gabarit précompilé.
+
+    python -m benchmarks.bench_tickets [--renders 1000]
+
+Billets/s, pic d'allocation par billet (tracemalloc) et taille du PDF.
+legacy_render reprend le dessin reportlab d'avant ticket_template.
+"""
+import argparse
+import json
+import time
+import tracemalloc
+from datetime import date
+from io import BytesIO
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import cm
+from reportlab.pdfgen import canvas
+
+from app.services.ticket_template import render_ticket
+
+FIELDS = {
+    "booking_id": "123e4567-e89b-12d3-a456-426614174000",
+    "origin": "CMN",
+    "destination": "Paris",
+    "trip_type": "roundtrip",
+    "cabin": "economy",
+    "depart_date": date(2026, 11, 1),
+    "return_date": date(2026, 11, 9),
+    "first_name": "Amine",
+    "last_name": "Alaoui",
+    "email": "amine@example.com",
+    "birth_date": date(1990, 1, 1),
+    "generated_at": "18/10/2026 à 09:30",
+}
+
+
+def legacy_render(**f) -> bytes:
+    buffer = BytesIO()
+    p = canvas.Canvas(buffer, pagesize=A4)
+    width, height = A4
+    p.setFillColorRGB(0.7, 0.1, 0.1)
+    p.rect(0, height - 4 * cm, width, 4 * cm, fill=True)
+    p.setFillColorRGB(1, 1, 1)
+    p.setFont("Helvetica-Bold", 24)
+    p.drawString(2 * cm, height - 2.5 * cm, "Royal Air Maroc")
+    p.setFont("Helvetica", 14)
+    p.drawString(2 * cm, height - 3.2 * cm, "E-Ticket / Billet Électronique")
+    p.setFillColorRGB(0, 0, 0)
+    p.setFont("Helvetica-Bold", 12)
+    p.drawString(2 * cm, height - 6 * cm, "PASSAGER / PASSENGER")
+    p.setFont("Helvetica", 10)
+    y = height - 7 * cm
+    p.drawString(2 * cm, y, f"Nom / Name: {f['last_name'].upper()} {f['first_name']}")
+    y -= 0.6 * cm
+    p.drawString(2 * cm, y, f"Email: {f['email']}")
+    y -= 0.6 * cm
+    p.drawString(2 * cm, y, f"Date de naissance / Birth date: {f['birth_date'].strftime('%d/%m/%Y')}")
+    y -= 1 * cm
+    p.setFont("Helvetica-Bold", 12)
+    p.drawString(2 * cm, y, "DÉTAILS DU VOL / FLIGHT DETAILS")
+    y -= 0.8 * cm
+    p.setFont("Helvetica", 10)
+    for line in (
+        f"Référence: {f['booking_id'][:8].upper()}",
+        f"Trajet: {f['origin']} → {f['destination']}",
+        f"Date de départ: {f['depart_date'].strftime('%d/%m/%Y')}",
+        f"Date de retour: {f['return_date'].strftime('%d/%m/%Y')}",
+        f"Classe: {f['cabin'].upper()}",
+        f"Type: {'Aller-Retour' if f['trip_type'] == 'roundtrip' else 'Aller Simple'}",
+    ):
+        p.drawString(2 * cm, y, line)
+        y -= 0.6 * cm
+    p.setFont("Helvetica-Oblique", 8)
+    p.drawString(2 * cm, 2 * cm, f"Document généré le {f['generated_at']}")
+    p.drawString(
+        2 * cm, 1.5 * cm,
+        "Veuillez présenter ce document à l'embarquement / Please present this document at boarding",
+    )
+    p.showPage()
+    p.save()
+    return buffer.getvalue()
+
+
+def measure(render, renders: int) -> dict:
+    render(**FIELDS)
+    started = time.perf_counter()
+    for _ in range(renders):
+        render(**FIELDS)
+    elapsed = (time.perf_counter() - started) / renders
+    tracemalloc.start()
+    pdf = render(**FIELDS)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "tickets_per_s": round(1 / elapsed),
+        "ms_per_ticket": round(elapsed * 1000, 3),
+        "peak_alloc_kib": round(peak / 1024, 1),
+        "pdf_bytes": len(pdf),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--renders", type=int, default=1000)
+    args = parser.parse_args(argv)
+    print(json.dumps({
+        "reportlab_canvas": measure(legacy_render, args.renders),
+        "template": measure(render_ticket, args.renders),
+    }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
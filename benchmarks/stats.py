@@ -0,0 +1,12 @@
+"""Outils de mesure partagés par les benchmarks."""
+
+
+def latency_percentiles(sorted_values: list[float]) -> dict[str, float] | None:
+    """p50 / p95 / max en ms d'une liste triée de durées en secondes."""
+    if not sorted_values:
+        return None
+
+    def pick(q: float) -> float:
+        return round(sorted_values[min(int(q * len(sorted_values)), len(sorted_values) - 1)] * 1000, 2)
+
+    return {"p50": pick(0.5), "p95": pick(0.95), "max": pick(1.0)}
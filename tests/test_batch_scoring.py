@@ -0,0 +1,102 @@
+"""Scoring en lot : mêmes résumés et cartes que compute_scores + build_post_booking_cards."""
+import json
+import random
+import uuid
+from datetime import date, timedelta
+
+import numpy as np
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from app.models.booking import Booking
+from app.services.batch_scoring import (
+    BookingColumns,
+    combinations,
+    iter_booking_chunks,
+    render_chunk,
+    score_columns,
+)
+from app.services.recommender import build_post_booking_cards
+from app.services.scoring import compute_scores
+
+TODAY = date(2026, 10, 18)
+CABINS = ("economy", "Economy", "ECONOMY", "business", "first")
+
+
+def make_bookings(n: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        depart = TODAY + timedelta(days=rng.randint(-3, 20))
+        ret = None if rng.random() < 0.3 else depart + timedelta(days=rng.randint(-15, 30))
+        rows.append({
+            "id": str(uuid.UUID(int=rng.getrandbits(128))), "owner_id": f"guest:{i % 50}",
+            "destination": "Paris", "cabin": rng.choice(CABINS),
+            "depart_date": depart, "return_date": ret,
+        })
+    return rows
+
+
+def columns(rows: list[dict]) -> BookingColumns:
+    return BookingColumns(
+        ids=[r["id"] for r in rows],
+        owners=[r["owner_id"] for r in rows],
+        depart=np.array([r["depart_date"] for r in rows], dtype="datetime64[D]"),
+        ret=np.array([r["return_date"] for r in rows], dtype="datetime64[D]"),
+        cabin=[r["cabin"] for r in rows],
+    )
+
+
+def test_render_chunk_matches_per_booking_scoring():
+    rows = make_bookings(2000)
+
+    lines = render_chunk(columns(rows)).splitlines()
+
+    assert len(lines) == len(rows)
+    for row, line in zip(rows, lines):
+        summary = compute_scores(row["depart_date"], row["return_date"], row["cabin"])
+        assert json.loads(line) == {
+            "booking_id": row["id"],
+            "owner_id": row["owner_id"],
+            "summary": summary.__dict__,
+            "cards": build_post_booking_cards(summary, row["cabin"]),
+        }
+
+
+def test_score_columns_with_age_and_loyalty():
+    rows = make_bookings(200, seed=1)
+    cols = columns(rows)
+    for age_bucket in (None, "under_30", "30_60", "over_60"):
+        for loyalty in (None, "loyal", "disloyal"):
+            codes = score_columns(
+                cols.depart, cols.ret, cols.cabin,
+                [age_bucket] * len(rows), [loyalty] * len(rows),
+            )
+            for row, code in zip(rows, codes.tolist()):
+                expected = compute_scores(
+                    row["depart_date"], row["return_date"], row["cabin"],
+                    age_bucket=age_bucket, loyalty=loyalty,
+                )
+                assert combinations[code].summary == expected
+                assert combinations[code].cards == build_post_booking_cards(expected, row["cabin"])
+
+
+def test_iter_booking_chunks_pages_the_window(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/bookings.db")
+    Booking.__table__.create(engine)
+    rows = make_bookings(500, seed=2)
+    with Session(engine) as db:
+        db.execute(insert(Booking), rows)
+        db.commit()
+
+        window = (TODAY, TODAY + timedelta(days=7))
+        chunks = list(iter_booking_chunks(db, *window, chunk_size=37))
+    engine.dispose()
+
+    ids = [booking_id for chunk in chunks for booking_id in chunk.ids]
+    expected = sorted(
+        (r for r in rows if window[0] <= r["depart_date"] <= window[1]),
+        key=lambda r: (r["depart_date"], r["id"]),
+    )
+    assert ids == [r["id"] for r in expected]
+    assert all(len(chunk.ids) <= 37 for chunk in chunks)
@@ -0,0 +1,71 @@
+"""Tampon write-behind : l'écriture directe (tampon plein) n'est jamais écrasée par un évènement plus ancien."""
+import threading
+import time
+
+import pytest
+
+from app.services.feedback_buffer import FeedbackBuffer, FeedbackBufferFull
+
+
+def event(item_id: str, action: str) -> dict:
+    return {"user_id": "u1", "item_id": item_id, "category": "hotel", "city": "rome", "action": action}
+
+
+class FakeDb:
+    def __init__(self):
+        self.rows: dict[tuple[str, str], str] = {}
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def write(self, rows: list[dict]) -> None:
+        self.gate.wait()
+        self.write_now(rows)
+
+    def write_now(self, rows: list[dict]) -> None:
+        for row in rows:
+            self.rows[(row["user_id"], row["item_id"])] = row["action"]
+
+
+@pytest.fixture
+def db():
+    return FakeDb()
+
+
+@pytest.fixture
+def buffer(db, tmp_path):
+    buf = FeedbackBuffer(db.write, str(tmp_path), max_size=1, flush_interval=3600)
+    buf.start()
+    yield buf
+    db.gate.set()
+    buf.stop()
+
+
+def test_direct_write_waits_for_inflight_flush(buffer, db):
+    buffer.add(event("hotel_a", "dislike"))
+    db.gate.clear()
+    flusher = threading.Thread(target=buffer.flush)
+    flusher.start()
+    time.sleep(0.05)  # le lot (dislike) est en cours d'écriture
+
+    buffer.add(event("hotel_b", "like"))
+    with pytest.raises(FeedbackBufferFull):
+        buffer.add(event("hotel_a", "like"))
+    writer = threading.Thread(target=buffer.write_through, args=([event("hotel_a", "like")], db.write_now))
+    writer.start()
+    time.sleep(0.05)
+    db.gate.set()
+    flusher.join()
+    writer.join()
+
+    assert db.rows[("u1", "hotel_a")] == "like"
+
+
+def test_direct_write_supersedes_pending_event(buffer, db):
+    buffer.add(event("hotel_a", "dislike"))
+    with pytest.raises(FeedbackBufferFull):
+        buffer.add(event("hotel_b", "like"))
+    buffer.write_through([event("hotel_b", "like"), event("hotel_a", "like")], db.write_now)
+    buffer.flush()
+
+    assert db.rows == {("u1", "hotel_a"): "like", ("u1", "hotel_b"): "like"}
+    assert buffer.pending_for("u1") == []
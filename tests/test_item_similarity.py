@@ -0,0 +1,112 @@
+"""Index de similarité : build_index sur une base SQLite temporaire, comparé à un cosinus brute force."""
+import random
+from datetime import datetime
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.models.feedback import Feedback
+from app.services.item_similarity import SimilarityIndex, build_index
+
+TOP_K = 5
+MIN_SUPPORT = 2
+
+
+@pytest.fixture(autouse=True)
+def similarity_params(monkeypatch):
+    monkeypatch.setattr("app.core.config.settings.SIMILARITY_TOP_K", TOP_K)
+    monkeypatch.setattr("app.core.config.settings.SIMILARITY_MIN_SUPPORT", MIN_SUPPORT)
+    monkeypatch.setattr("app.core.config.settings.SIMILARITY_MAX_USER_ITEMS", 1000)
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/feedback.db")
+    Feedback.__table__.create(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def add_feedback(db: Session, rows: list[tuple[str, str, str, str]]) -> None:
+    now = datetime.utcnow()
+    db.execute(Feedback.__table__.insert(), [
+        {"user_id": u, "item_id": i, "city": city, "category": "hotel", "action": action,
+         "created_at": now, "updated_at": now}
+        for u, i, city, action in rows
+    ])
+    db.commit()
+
+
+def brute_force(rows: list[tuple[str, str, str, str]], city: str) -> dict[str, list[tuple[float, str]]]:
+    """Top-k voisins attendus : cosinus sur les notes like=+1 / dislike=-1 uniquement."""
+    vectors: dict[str, dict[str, int]] = {}
+    for user, item, c, action in rows:
+        if c == city and action in ("like", "dislike"):
+            vectors.setdefault(item, {})[user] = 1 if action == "like" else -1
+    expected = {}
+    for i, vi in vectors.items():
+        sims = []
+        for j, vj in vectors.items():
+            common = vi.keys() & vj.keys()
+            if j == i or len(common) < MIN_SUPPORT:
+                continue
+            sim = sum(vi[u] * vj[u] for u in common) / (len(vi) * len(vj)) ** 0.5
+            if sim > 0:
+                sims.append((sim, j))
+        if sims:
+            expected[i] = sorted(sims, key=lambda t: -t[0])[:TOP_K]
+    return expected
+
+
+def test_matches_brute_force_cosine(db, tmp_path):
+    rng = random.Random(7)
+    rows = []
+    for city in ("paris", "rome"):
+        for u in range(60):
+            for it in rng.sample(range(25), rng.randint(1, 12)):
+                action = rng.choice(("like", "like", "dislike", "clicked"))
+                rows.append((f"u{u}", f"hotel_{city}_{it:02d}", city, action))
+    add_feedback(db, rows)
+
+    result = build_index(db, tmp_path / "items.simx")
+    index = SimilarityIndex(tmp_path / "items.simx")
+
+    assert result.cities == 2
+    for city in ("paris", "rome"):
+        expected = brute_force(rows, city)
+        neighbors = index.city_neighbors(city)
+        got = {}
+        for row, item in enumerate(neighbors.ids):
+            span = range(neighbors.indptr[row], neighbors.indptr[row + 1])
+            got[item.decode()] = [
+                (float(neighbors.sim[p]), neighbors.ids[neighbors.nbr[p]].decode()) for p in span
+            ]
+        assert got.keys() == expected.keys()
+        for item, sims in expected.items():
+            assert np.allclose([s for s, _ in got[item]], [s for s, _ in sims], atol=1e-6)
+
+
+def test_clicked_is_not_a_dislike(db, tmp_path):
+    # trois likes communs ; les clics ne doivent ni réduire ni diluer le cosinus
+    rows = [(f"u{u}", item, "paris", "like") for u in range(3) for item in ("hotel_a", "hotel_c")]
+    rows += [("u3", "hotel_a", "paris", "clicked"), ("u4", "hotel_c", "paris", "clicked")]
+    rows += [("u0", "hotel_b", "paris", "clicked"), ("u1", "hotel_b", "paris", "clicked")]
+    add_feedback(db, rows)
+
+    build_index(db, tmp_path / "items.simx")
+    similar = SimilarityIndex(tmp_path / "items.simx").similar_to(["hotel_a"])
+
+    assert similar == pytest.approx({"hotel_c": 1.0})
+
+
+def test_clicks_do_not_trigger_rebuild(db, tmp_path):
+    add_feedback(db, [(f"u{u}", i, "paris", "like") for u in range(3) for i in ("hotel_a", "hotel_b")])
+    build_index(db, tmp_path / "items.simx")
+
+    add_feedback(db, [("u9", "hotel_a", "paris", "clicked")])
+    result = build_index(db, tmp_path / "items.simx")
+
+    assert result.rebuilt == [] and result.reused == 1
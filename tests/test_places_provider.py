@@ -0,0 +1,120 @@
+"""PlacesDestinationProvider contre un serveur Places simulé (httpx.MockTransport)."""
+import asyncio
+
+import httpx
+import pytest
+
+from app.providers.base import ProviderUnavailable
+from app.providers.places_provider import CircuitBreaker, PlacesDestinationProvider
+
+PLACES = {
+    "places": [
+        {
+            "id": "p1",
+            "displayName": {"text": "Hotel A"},
+            "rating": 4.5,
+            "priceLevel": "PRICE_LEVEL_MODERATE",
+            "location": {"latitude": 33.59, "longitude": -7.61},
+        }
+    ]
+}
+
+
+def make_provider(handler, **kwargs) -> PlacesDestinationProvider:
+    client = httpx.AsyncClient(base_url="http://places.test", transport=httpx.MockTransport(handler))
+    return PlacesDestinationProvider(api_key="test", client=client, backoff_base=0.0, **kwargs)
+
+
+def statuses(*codes: int):
+    """Handler qui répond successivement `codes`, puis 200."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        code = codes[len(calls)] if len(calls) < len(codes) else 200
+        calls.append(code)
+        return httpx.Response(code, json=PLACES if code == 200 else {})
+
+    return handler, calls
+
+
+def test_retries_transient_errors():
+    handler, calls = statuses(503, 429)
+    provider = make_provider(handler, max_retries=2)
+
+    items = asyncio.run(provider.search("Casablanca", "hotel"))
+
+    assert [x.name for x in items] == ["Hotel A"]
+    assert items[0].price_level == "€€"
+    assert calls == [503, 429, 200]
+    assert provider.breaker.state == "closed"
+
+
+def test_client_error_is_not_retried():
+    handler, calls = statuses(403)
+    provider = make_provider(handler, max_retries=2)
+
+    with pytest.raises(ProviderUnavailable):
+        asyncio.run(provider.search("Casablanca", "hotel"))
+    assert calls == [403]
+
+
+def test_breaker_opens_then_half_open_trial(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.providers.places_provider.time.monotonic", lambda: now[0])
+    handler, calls = statuses(500, 500)
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30.0)
+    provider = make_provider(handler, max_retries=0, breaker=breaker)
+
+    for _ in range(2):
+        with pytest.raises(ProviderUnavailable):
+            asyncio.run(provider.search("Casablanca", "hotel"))
+    assert breaker.state == "open"
+
+    # circuit ouvert : échec immédiat, sans appel upstream
+    with pytest.raises(ProviderUnavailable, match="circuit open"):
+        asyncio.run(provider.search("Casablanca", "hotel"))
+    assert len(calls) == 2
+
+    # après reset_timeout : un seul essai, qui referme le circuit
+    now[0] += 30.0
+    assert breaker.state == "half_open"
+    items = asyncio.run(provider.search("Casablanca", "hotel"))
+    assert items and breaker.state == "closed"
+
+
+def test_half_open_failure_reopens(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.providers.places_provider.time.monotonic", lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30.0)
+    breaker.record_failure()
+    now[0] += 30.0
+    assert breaker.allow()
+    assert not breaker.allow()  # un seul essai à la fois
+
+    breaker.record_failure()
+
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_semaphore_bounds_concurrency():
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json=PLACES)
+
+    provider = make_provider(handler, max_concurrency=3)
+
+    async def run():
+        return await asyncio.gather(*(provider.search("Casablanca", "hotel") for _ in range(20)))
+
+    results = asyncio.run(run())
+
+    assert len(results) == 20 and all(results)
+    assert peak == 3
@@ -0,0 +1,72 @@
+"""Billet PDF rendu par gabarit : relu avec pypdf, les champs imprimés doivent y figurer."""
+import io
+from datetime import date
+
+import pytest
+
+from app.services.ticket_template import render_ticket, write_ticket
+
+pypdf = pytest.importorskip("pypdf")
+
+FIELDS = {
+    "booking_id": "3f2a9c1e-7b4d-4e8a-9c2f-1d5e6a7b8c9d",
+    "origin": "CMN",
+    "destination": "CDG",
+    "trip_type": "roundtrip",
+    "cabin": "economy",
+    "depart_date": date(2026, 11, 3),
+    "return_date": date(2026, 11, 17),
+    "first_name": "Amina",
+    "last_name": "El (Idrissi)",
+    "email": "amina@example.com",
+    "birth_date": date(1990, 5, 21),
+    "generated_at": "18/10/2026 à 09:30",
+}
+
+
+def read(pdf: bytes) -> tuple[pypdf.PdfReader, str]:
+    reader = pypdf.PdfReader(io.BytesIO(pdf), strict=True)  # xref / offsets exacts
+    return reader, reader.pages[0].extract_text()
+
+
+def test_printed_fields():
+    reader, text = read(render_ticket(**FIELDS))
+
+    assert len(reader.pages) == 1
+    for expected in (
+        "Royal Air Maroc",
+        "E-Ticket / Billet Électronique",
+        "Nom / Name: EL (IDRISSI) Amina",
+        "Email: amina@example.com",
+        "Date de naissance / Birth date: 21/05/1990",
+        "Référence: 3F2A9C1E",
+        "Trajet: CMN → CDG",  # flèche en police Symbol
+        "Date de départ: 03/11/2026",
+        "Date de retour: 17/11/2026",
+        "Classe: ECONOMY",
+        "Type: Aller-Retour",
+        "Document généré le 18/10/2026 à 09:30",
+        "Please present this document at boarding",
+    ):
+        assert expected in text
+
+
+def test_optional_fields_omitted():
+    fields = {**FIELDS, "trip_type": "oneway", "return_date": None, "email": None, "birth_date": None}
+
+    _, text = read(render_ticket(**fields))
+
+    assert "Type: Aller Simple" in text
+    assert "Date de retour" not in text
+    assert "Email" not in text
+    assert "Date de naissance" not in text
+
+
+def test_write_ticket(tmp_path):
+    path = tmp_path / "ticket.pdf"
+
+    write_ticket(str(path), **FIELDS)
+
+    _, text = read(path.read_bytes())
+    assert "Référence: 3F2A9C1E" in text
+    assert not list(tmp_path.glob("*.tmp"))